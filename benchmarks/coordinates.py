@@ -0,0 +1,66 @@
+"""
+    Cost of one equatorial/horizontal conversion, as done before (location, time
+    and frames built from the config at every call), by CoordinatesTransformer
+    and by the AnalyticTransformer usable at every poll.
+
+        python -m benchmarks.coordinates [repetitions]
+"""
+import sys
+import timeit
+from astropy import units as u
+from astropy.coordinates import AltAz, EarthLocation, SkyCoord
+from astropy.time import Time
+from crac_protobuf.telescope_pb2 import AltazimutalCoords, EquatorialCoords  # type: ignore
+from crac_server.component.telescope.analytic import AnalyticTransformer
+from crac_server.component.telescope.coordinates import CoordinatesTransformer
+from crac_server.config import Config
+from datetime import datetime
+
+
+def radec2altaz_per_call(eq_coords: EquatorialCoords, obstime: datetime) -> AltazimutalCoords:
+    observing_time = Time(obstime.strftime(format="%Y-%m-%d %H:%M:%S"))
+    lat = Config.getValue("lat", "geography")
+    lon = Config.getValue("lon", "geography")
+    height = Config.getInt("height", "geography")
+    observing_location = EarthLocation(lat=lat, lon=lon, height=height * u.m)
+    aa = AltAz(location=observing_location, obstime=observing_time)
+    equinox = Config.getValue("equinox", "geography")
+    coord = SkyCoord(ra=str(eq_coords.ra) + "h", dec=str(eq_coords.dec) + "d", equinox=equinox, frame="fk5")
+    altaz_coords = coord.transform_to(aa)
+    return AltazimutalCoords(alt=float(altaz_coords.alt / u.deg), az=float(altaz_coords.az / u.deg))
+
+
+def altaz2radec_per_call(aa_coords: AltazimutalCoords, obstime: datetime) -> EquatorialCoords:
+    time = Time(obstime.strftime(format="%Y-%m-%d %H:%M:%S"))
+    lat = Config.getValue("lat", "geography")
+    lon = Config.getValue("lon", "geography")
+    height = Config.getInt("height", "geography")
+    equinox = Config.getValue("equinox", "geography")
+    observing_location = EarthLocation(lat=lat, lon=lon, height=height * u.m)
+    aa = AltAz(location=observing_location, obstime=time)
+    alt_az = SkyCoord(alt=aa_coords.alt * u.deg, az=aa_coords.az * u.deg, frame=aa, equinox=equinox)
+    ra_dec = alt_az.transform_to("fk5")
+    return EquatorialCoords(ra=float((ra_dec.ra / 15) / u.deg), dec=float(ra_dec.dec / u.deg))
+
+
+def main(repetitions: int = 50):
+    transformer = CoordinatesTransformer(Config.settings().geography)
+    analytic = AnalyticTransformer(Config.settings().geography)
+    eq_coords = EquatorialCoords(ra=5.5, dec=22.0)
+    aa_coords = AltazimutalCoords(alt=45.0, az=120.0)
+    obstime = datetime.utcnow()
+    cases = {
+        "radec2altaz per call": lambda: radec2altaz_per_call(eq_coords, obstime),
+        "radec2altaz cached": lambda: transformer.radec2altaz(eq_coords, obstime),
+        "radec2altaz analytic": lambda: analytic.radec2altaz(eq_coords, obstime),
+        "altaz2radec per call": lambda: altaz2radec_per_call(aa_coords, obstime),
+        "altaz2radec cached": lambda: transformer.altaz2radec(aa_coords, obstime),
+    }
+    for name, case in cases.items():
+        case()  # warm up astropy caches
+        best = min(timeit.repeat(case, number=repetitions, repeat=3)) / repetitions
+        print(f"{name:<22} {best * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,93 @@
+"""
+    Polls per second of the indi driver, and time of a goto waiting for its
+    answer, against the INDI simulator on a clean, a slow and a fragmenting
+    network; a poll reads the mirror of the subscribed properties. Then cost of parsing the synthetic INDI
+    sessions of the tests: element by element as the reader does, one whole read with
+    ElementTree.fromstring as done before (it only parses the reads holding a
+    single complete element), and with the elements of another device skipped.
+
+        python -m benchmarks.indi_polling [seconds]
+"""
+import json
+import os
+import sys
+import time
+import timeit
+import xml.etree.ElementTree as ET
+from crac_server.component.telescope.indi.stream import XmlStreamDecoder
+from crac_server.component.telescope.indi.telescope import Telescope
+from tests.component.telescope.indi.simulator import default_simulator
+from tests.component.telescope.simulation import SimulatorThread
+
+
+SESSIONS = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "component", "telescope", "indi", "sessions")
+
+NETWORKS = {
+    "clean": {},
+    "latency 5 ms": {"latency": 0.005},
+    "fragments 16 B": {"fragment": 16},
+}
+
+
+def polls_per_second(telescope: Telescope, seconds: float) -> float:
+    polls = 0
+    started_at = time.perf_counter()
+    while time.perf_counter() - started_at < seconds:
+        telescope._poll_once()
+        polls += 1
+    return polls / (time.perf_counter() - started_at)
+
+
+def command_round_trip(telescope: Telescope, commands: int = 20) -> float:
+    started_at = time.perf_counter()
+    for _ in range(commands):
+        telescope.queue_flat()
+        telescope._poll_once()
+    return (time.perf_counter() - started_at) / commands
+
+
+def parse_per_read(reads: list) -> int:
+    parsed = 0
+    for read in reads:
+        try:
+            ET.fromstring(read)
+            parsed += 1
+        except ET.ParseError:
+            pass
+    return parsed
+
+
+def parse_stream(reads: list, device=None) -> int:
+    decoder = XmlStreamDecoder(device)
+    return sum(len(decoder.feed(read)) for read in reads)
+
+
+def main(seconds: float = 2):
+    for name, network in NETWORKS.items():
+        simulator = default_simulator(push_interval=0.1, **network)
+        with SimulatorThread(simulator) as server:
+            telescope = Telescope(hostname="127.0.0.1", port=server.port)
+            telescope._name = simulator.device
+            telescope._mirror._device = simulator.device
+            telescope._polling = True
+            polls = polls_per_second(telescope, seconds)
+            command = command_round_trip(telescope)
+            telescope._connection.close()
+        print(f"{name:<16} {polls:9.0f} polls/s {command * 1e3:9.2f} ms/command")
+    for session in sorted(name for name in os.listdir(SESSIONS) if name.endswith(".jsonl")):
+        with open(os.path.join(SESSIONS, session)) as lines:
+            reads = [json.loads(line)["data"].encode("utf-8") for line in lines if line.strip()]
+        elements = parse_stream(reads)
+        cases = {
+            "whole reads": lambda: parse_per_read(reads),
+            "stream": lambda: parse_stream(reads),
+            "other device": lambda: parse_stream(reads, "CCD Simulator"),
+        }
+        print(f"{session}: {len(reads)} reads, {elements} elements, {parse_per_read(reads)} parsed whole")
+        for case_name, case in cases.items():
+            best = min(timeit.repeat(case, number=200, repeat=3)) / 200
+            print(f"    {case_name:<14} {best / elements * 1e6:9.1f} us/element")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,53 @@
+"""
+    Polls per second of the indigo driver, and time of a command round trip,
+    against the INDIGO simulator on a clean, a slow and a fragmenting network.
+    A poll reads the mirror, a command waits for the answer of the server.
+
+        python -m benchmarks.indigo_polling [seconds]
+"""
+import sys
+import time
+from crac_server.component.telescope.indigo.telescope import Telescope
+from tests.component.telescope.indigo.simulator import default_simulator
+from tests.component.telescope.simulation import SimulatorThread
+
+
+NETWORKS = {
+    "clean": {},
+    "latency 5 ms": {"latency": 0.005},
+    "fragments 16 B": {"fragment": 16},
+}
+
+
+def polls_per_second(telescope: Telescope, seconds: float) -> float:
+    polls = 0
+    started_at = time.perf_counter()
+    while time.perf_counter() - started_at < seconds:
+        telescope._poll_once()
+        polls += 1
+    return polls / (time.perf_counter() - started_at)
+
+
+def command_round_trip(telescope: Telescope, commands: int = 20) -> float:
+    started_at = time.perf_counter()
+    for _ in range(commands):
+        telescope.queue_set_speed(telescope.speed)
+        telescope._poll_once()
+    return (time.perf_counter() - started_at) / commands
+
+
+def main(seconds: float = 2):
+    for name, network in NETWORKS.items():
+        simulator = default_simulator(push_interval=0.1, **network)
+        simulator.mount.unpark()
+        with SimulatorThread(simulator) as server:
+            telescope = Telescope(hostname="127.0.0.1", port=server.port)
+            telescope._polling = True
+            polls = polls_per_second(telescope, seconds)
+            command = command_round_trip(telescope)
+            telescope._connection.close()
+        print(f"{name:<16} {polls:9.0f} polls/s {command * 1e3:9.2f} ms/command")
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,135 @@
+"""
+    Cost of reading coordinates, speed and park state from a full INDIGO mount
+    property dump: scanned once per value as done before, indexed once per
+    poll, and read from the mirror of the pushed updates.
+    The dump has the vectors of the INDIGO mount agent, items included.
+
+        python -m benchmarks.indigo_properties [repetitions]
+"""
+import sys
+import timeit
+from crac_server.component.telescope.indigo.mirror import PropertyMirror
+from crac_server.component.telescope.indigo.properties import PropertyIndex
+from crac_server.component.telescope.indigo.telescope import POLLED_PROPERTIES
+
+
+DEVICE = "Mount Simulator"
+
+
+def vector(kind: str, name: str, state: str = "Ok", **items) -> dict:
+    return {kind: {"device": DEVICE, "name": name, "state": state, "items": [{"name": key, "value": value} for key, value in items.items()]}}
+
+
+def full_dump() -> list:
+    """ Every vector of a mount device, as sent for a getProperties """
+
+    dump = [
+        vector("defSwitchVector", "CONNECTION", CONNECTED=True, DISCONNECTED=False),
+        vector("defTextVector", "INFO", DEVICE_NAME=DEVICE, DEVICE_VERSION="2.0", DEVICE_INTERFACE="5", FRAMEWORK_NAME="INDIGO", FRAMEWORK_VERSION="2.0-300"),
+        vector("defSwitchVector", "SIMULATION", ENABLED=False, DISABLED=True),
+        vector("defSwitchVector", "CONFIG", LOAD=False, SAVE=False, REMOVE=False),
+        vector("defTextVector", "DEVICE_PORT", PORT="/dev/ttyUSB0"),
+        vector("defSwitchVector", "DEVICE_BAUDRATE", **{f"B{rate}": rate == 9600 for rate in (4800, 9600, 19200, 38400, 57600, 115200)}),
+        vector("defTextVector", "MOUNT_INFO", MODEL="LX200", VENDOR="Meade", FIRMWARE_VERSION="4.2"),
+        vector("defNumberVector", "MOUNT_LST_TIME", TIME=12.345),
+        vector("defSwitchVector", "MOUNT_PARK", PARKED=False, UNPARKED=True),
+        vector("defSwitchVector", "MOUNT_PARK_SET", DEFAULT=False, CURRENT=False),
+        vector("defNumberVector", "MOUNT_PARK_POSITION", HA=0, DEC=90),
+        vector("defSwitchVector", "MOUNT_HOME", HOME=False),
+        vector("defSwitchVector", "MOUNT_ON_COORDINATES_SET", TRACK=True, SYNC=False, SLEW=False),
+        vector("defSwitchVector", "MOUNT_SLEW_RATE", GUIDE=False, CENTERING=True, FIND=False, MAX=False),
+        vector("defSwitchVector", "MOUNT_MOTION_DEC", NORTH=False, SOUTH=False),
+        vector("defSwitchVector", "MOUNT_MOTION_RA", WEST=False, EAST=False),
+        vector("defSwitchVector", "MOUNT_TRACK_RATE", SIDEREAL=True, SOLAR=False, LUNAR=False, KING=False, CUSTOM=False),
+        vector("defNumberVector", "MOUNT_CUSTOM_TRACKING_RATE", RATE=15.041),
+        vector("defSwitchVector", "MOUNT_TRACKING", ON=True, OFF=False),
+        vector("defNumberVector", "MOUNT_GUIDE_RATE", RA=50, DEC=50),
+        vector("defNumberVector", "MOUNT_EQUATORIAL_COORDINATES", RA=5.58, DEC=22.01),
+        vector("defNumberVector", "MOUNT_HORIZONTAL_COORDINATES", ALT=45.12, AZ=120.34),
+        vector("defSwitchVector", "MOUNT_ABORT_MOTION", ABORT_MOTION=False),
+        vector("defSwitchVector", "MOUNT_ALIGNMENT_MODE", CONTROLLER=True, SINGLE_POINT=False, NEAREST_POINT=False, MULTI_POINT=False),
+        vector("defNumberVector", "MOUNT_GEOGRAPHIC_COORDINATES", LATITUDE=42.08, LONGITUDE=12.77, ELEVATION=384),
+        vector("defTextVector", "MOUNT_UTC_TIME", UTC="2024-03-20T21:30:15", OFFSET="1"),
+        vector("defSwitchVector", "MOUNT_SET_HOST_TIME", SET=False),
+        vector("defSwitchVector", "MOUNT_SIDE_OF_PIER", EAST=False, WEST=True),
+        vector("defNumberVector", "MOUNT_RAW_COORDINATES", RA=5.58, DEC=22.01),
+        vector("defSwitchVector", "MOUNT_EPOCH", J2000=True, JNOW=False),
+        vector("defNumberVector", "MOUNT_TARGET_INFO", RISE=5.2, TRANSIT=12.1, SET=19.3),
+        vector("defSwitchVector", "MOUNT_SNOOP_DEVICES", GPS=False, JOYSTICK=False, DOME=False),
+        vector("defTextVector", "MOUNT_ALIGNMENT_SELECT_POINTS", **{f"POINT_{index}": "" for index in range(10)}),
+        vector("defNumberVector", "MOUNT_ALIGNMENT_DELETE_POINTS", **{f"POINT_{index}": 0 for index in range(10)}),
+    ]
+    # the same vectors of a second device on the same server
+    for message in list(dump):
+        (kind, body), = message.items()
+        dump.append({kind: {**body, "device": "Guider"}})
+    return dump
+
+
+def scan_per_value(root: list) -> tuple:
+    """ The extractors as they were: one walk of the whole answer for each value, with a seen set """
+
+    def scan(kind: str, name: str) -> dict:
+        seen = set()
+        items = {}
+        for message in root:
+            if kind in message:
+                vector = message[kind]
+                if vector["name"] == name and vector["device"] == DEVICE:
+                    for item in vector["items"]:
+                        key = (vector["name"], vector["state"], item["name"], item["value"])
+                        if key not in seen:
+                            seen.add(key)
+                            items[item["name"]] = item["value"]
+                            items["state"] = vector["state"]
+        return items
+
+    eq_coords = scan("defNumberVector", "MOUNT_EQUATORIAL_COORDINATES")
+    aa_coords = scan("defNumberVector", "MOUNT_HORIZONTAL_COORDINATES")
+    speed = (scan("defNumberVector", "MOUNT_EQUATORIAL_COORDINATES")["state"], scan("defSwitchVector", "MOUNT_TRACKING")["ON"])
+    parked = scan("defSwitchVector", "MOUNT_PARK")["PARKED"]
+    return eq_coords["RA"], eq_coords["DEC"], aa_coords["ALT"], aa_coords["AZ"], speed, parked
+
+
+def index_messages(messages: list, device: str) -> PropertyIndex:
+    """ One pass over the whole answer indexing the def*Vector messages of device """
+
+    bodies = {}
+    for message in messages:
+        for kind, body in message.items():
+            if kind[:3] == "def" and isinstance(body, dict) and body.get("device") == device:
+                bodies[(kind[3:-6], body.get("name"))] = (kind, body)
+    return PropertyIndex(device, bodies)
+
+
+def lookup(properties: PropertyIndex) -> tuple:
+    return (
+        properties.item("Number", "MOUNT_EQUATORIAL_COORDINATES", "RA"),
+        properties.item("Number", "MOUNT_EQUATORIAL_COORDINATES", "DEC"),
+        properties.item("Number", "MOUNT_HORIZONTAL_COORDINATES", "ALT"),
+        properties.item("Number", "MOUNT_HORIZONTAL_COORDINATES", "AZ"),
+        (properties.state("Number", "MOUNT_EQUATORIAL_COORDINATES"), properties.get("Switch", "MOUNT_TRACKING", "ON")),
+        properties.get("Switch", "MOUNT_PARK", "PARKED", False),
+    )
+
+
+def main(repetitions: int = 2000):
+    dump = full_dump()
+    mirror = PropertyMirror(DEVICE)
+    for message in dump:
+        mirror.update(message)
+    cases = {
+        "scan per value": lambda: scan_per_value(dump),
+        "index once": lambda: lookup(index_messages(dump, DEVICE)),
+        "mirror index": lambda: lookup(mirror.index(POLLED_PROPERTIES)),
+    }
+    expected = scan_per_value(dump)
+    print(f"{len(dump)} vectors, {sum(len(next(iter(message.values()))['items']) for message in dump)} items")
+    for name, case in cases.items():
+        assert case() == expected, name
+        best = min(timeit.repeat(case, number=repetitions, repeat=3)) / repetitions
+        print(f"{name:<16} {best * 1e6:9.1f} us")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -24,9 +24,14 @@ from crac_server.service.ups_service import UpsService
 from crac_server.service.weather_service import WeatherService
 from crac_server.service.geographic_service import GeographicServicer
 from crac_server.service.image_config_service import ImageConfigServicer
+from crac_server.service.telescope_diagnostics_service import (
+    TelescopeDiagnosticsService,
+    add_TelescopeDiagnosticsServicer_to_server,
+)
 from crac_server.config import Config
 import asyncio
 import grpc
+import signal
 
 
 logger = logging.getLogger('crac_server.app')
@@ -58,11 +63,26 @@ async def serve():
     add_ImageConfigServiceServicer_to_server(
         ImageConfigServicer(), server
     )
+    add_TelescopeDiagnosticsServicer_to_server(
+        TelescopeDiagnosticsService(), server
+    )
     server.add_insecure_port(
         f'{Config.getValue("loopback_ip", "server")}:{Config.getValue("port", "server")}')
     logger.info(f'Server loaded on port {Config.getValue("port", "server")}')
     await server.start()
-    await server.wait_for_termination()
+    loop = asyncio.get_running_loop()
+    # the reload reads the file and notifies the subscribers: keep it off the loop
+    loop.add_signal_handler(signal.SIGHUP, loop.run_in_executor, None, Config.reload)
+    watcher = None
+    watch_interval = Config.getFloat("config_watch_interval", "server")
+    if watch_interval > 0:
+        watcher = asyncio.create_task(Config.watch(watch_interval))
+    try:
+        await server.wait_for_termination()
+    finally:
+        loop.remove_signal_handler(signal.SIGHUP)
+        if watcher:
+            watcher.cancel()
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ import threading
 from typing import Union
 from gpiozero import RotaryEncoder, DigitalInputDevice, Motor
 from crac_server.config import Config
+from crac_server.settings import EncoderStepSettings
 from crac_protobuf.curtains_pb2 import CurtainStatus
 
 
@@ -23,13 +24,27 @@ class Curtain:
         self._orientation = orientation
 
     def __base__(self):
-        self.__sub_min_step__ = Config.getInt("n_step_sub_min", "encoder_step")
+        encoder_step = Config.settings().encoder_step
+        self.__sub_min_step__ = encoder_step.n_step_sub_min
         self.__min_step__ = 0
-        self.__max_step__ = Config.getInt("n_step_corsa", "encoder_step")
-        self.__security_step__ = Config.getInt("n_step_sicurezza", "encoder_step")
-        self.__tolerance_steps__ = Config.getInt("tolerance_steps", "encoder_step")
+        self.__max_step__ = encoder_step.n_step_corsa
+        self.__security_step__ = encoder_step.n_step_sicurezza
+        self.__tolerance_steps__ = encoder_step.tolerance_steps
         self.target : Union[None, int] = None
 
+    def reconfigure(self, encoder_step: EncoderStepSettings):
+
+        """
+            Apply the reloaded encoder steps while the curtain is not checking them.
+            The max_steps of the rotary encoder stays the one used at start up
+        """
+
+        with self.lock_rotation:
+            self.__sub_min_step__ = encoder_step.n_step_sub_min
+            self.__max_step__ = encoder_step.n_step_corsa
+            self.__security_step__ = encoder_step.n_step_sicurezza
+            self.__tolerance_steps__ = encoder_step.tolerance_steps
+
     def __event_detect__(self):
         self.curtain_closed.when_activated = self.__reset_steps__
         self.curtain_open.when_activated = self.__reset_steps__
@@ -82,7 +82,7 @@ class FactoryCurtain:
         builder_curtain.rotary_encoder = {
             "a": a,
             "b": b,
-            "max_steps": Config.getInt("n_step_sicurezza", "encoder_step")
+            "max_steps": Config.settings().encoder_step.n_step_sicurezza
         }
         builder_curtain.verify_open = {
             "pin": pin_open,
@@ -126,4 +126,12 @@ class FactoryCurtain:
 
 
 CURTAIN_EAST = FactoryCurtain.curtain(orientation=CurtainOrientation.CURTAIN_EAST, mock=Config.getBoolean("gpio_mock", "server"))
-CURTAIN_WEST = FactoryCurtain.curtain(orientation=CurtainOrientation.CURTAIN_WEST, mock=Config.getBoolean("gpio_mock", "server"))
\ No newline at end of file
+CURTAIN_WEST = FactoryCurtain.curtain(orientation=CurtainOrientation.CURTAIN_WEST, mock=Config.getBoolean("gpio_mock", "server"))
+
+
+def _reconfigure(snapshot):
+    CURTAIN_EAST.reconfigure(snapshot.settings.encoder_step)
+    CURTAIN_WEST.reconfigure(snapshot.settings.encoder_step)
+
+
+Config.subscribe(_reconfigure)
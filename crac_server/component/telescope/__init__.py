@@ -1,6 +1,10 @@
 import importlib
+from crac_server.component.telescope import earth_orientation
 from crac_server.component.telescope.telescope import Telescope
 from crac_server.config import Config
 
 
+earth_orientation.configure(Config.settings().iers)
 TELESCOPE: Telescope = importlib.import_module(f"crac_server.component.telescope.{Config.getValue('driver', 'telescope')}.telescope").Telescope()
+TELESCOPE.warm_up()
+Config.subscribe(lambda snapshot: TELESCOPE.reconfigure(snapshot.settings))
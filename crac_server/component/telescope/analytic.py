@@ -0,0 +1,147 @@
+import calendar
+import math
+import numpy as np
+from astropy.coordinates import Latitude, Longitude
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,  # type: ignore
+    EquatorialCoords,  # type: ignore
+)
+from crac_server.settings import GeographySettings
+from datetime import datetime
+from typing import Tuple
+
+
+J2000 = 2451545.0
+UNIX_EPOCH = 2440587.5
+
+
+def julian_date(obstime: datetime) -> float:
+    """ obstime is a naive UTC datetime, as everywhere in the telescope drivers """
+
+    seconds = calendar.timegm(obstime.timetuple()) + obstime.microsecond / 1e6
+    return UNIX_EPOCH + seconds / 86400
+
+
+def sidereal_time(jd: float, lon: float) -> float:
+    """ Local mean sidereal time in radians (Meeus 12.4, UT1 = UTC) """
+
+    d = jd - J2000
+    t = d / 36525
+    gmst = 280.46061837 + 360.98564736629 * d + 0.000387933 * t * t - t * t * t / 38710000
+    return math.radians(gmst % 360) + lon
+
+
+def precession_angles(jd: float) -> Tuple[float, float, float]:
+    """ zeta, z, theta in radians from J2000 to the date (IAU 1976, Meeus 21.3) """
+
+    t = (jd - J2000) / 36525
+    zeta = (2306.2181 + (0.30188 + 0.017998 * t) * t) * t
+    z = (2306.2181 + (1.09468 + 0.018203 * t) * t) * t
+    theta = (2004.3109 - (0.42665 + 0.041833 * t) * t) * t
+    arcsec = math.pi / 648000
+    return zeta * arcsec, z * arcsec, theta * arcsec
+
+
+def refraction(alt: float) -> float:
+    """ Bennett's refraction in radians for the true altitude alt, standard atmosphere """
+
+    h = math.degrees(alt)
+    if h < -1:
+        return 0
+    return math.radians(1.02 / math.tan(math.radians(h + 10.3 / (h + 5.11))) / 60)
+
+
+class AnalyticTransformer:
+
+    """
+        Equatorial (FK5 J2000) to horizontal conversion with closed formulas:
+        precession to the date, mean sidereal time and spherical trigonometry.
+        Nutation, aberration and polar motion are left out, so it stays within
+        0.02 degrees of astropy from 2000 to 2050 (see tests), far below the
+        2 degrees used to detect the park and flat positions.
+        Astropy has no atmosphere by default, so refraction is off unless asked
+    """
+
+    def __init__(self, geography: GeographySettings, refraction: bool = False) -> None:
+        self._geography = geography
+        self._lat = float(Latitude(geography.lat).radian)
+        self._lon = float(Longitude(geography.lon).radian)
+        self._refraction = refraction
+
+    @property
+    def geography(self) -> GeographySettings:
+        return self._geography
+
+    def radec2altaz(self, eq_coords: EquatorialCoords, obstime: datetime, decimal_places: int = 0) -> AltazimutalCoords:
+        jd = julian_date(obstime)
+        ra, dec = self.__precess(math.radians(eq_coords.ra * 15), math.radians(eq_coords.dec), jd)
+        hour_angle = sidereal_time(jd, self._lon) - ra
+        sin_lat, cos_lat = math.sin(self._lat), math.cos(self._lat)
+        alt = math.asin(sin_lat * math.sin(dec) + cos_lat * math.cos(dec) * math.cos(hour_angle))
+        az = math.atan2(
+            -math.cos(dec) * math.sin(hour_angle),
+            math.sin(dec) * cos_lat - math.cos(dec) * math.cos(hour_angle) * sin_lat
+        )
+        if self._refraction:
+            alt += refraction(alt)
+        alt_deg = math.degrees(alt)
+        az_deg = math.degrees(az) % 360
+        if decimal_places > 0:
+            alt_deg = round(alt_deg, decimal_places)
+            az_deg = round(az_deg, decimal_places)
+        return AltazimutalCoords(alt=alt_deg, az=az_deg)
+
+    def altaz2radec(self, aa_coords: AltazimutalCoords, obstime: datetime, decimal_places: int = 0) -> EquatorialCoords:
+        jd = julian_date(obstime)
+        alt, az = math.radians(aa_coords.alt), math.radians(aa_coords.az)
+        if self._refraction:
+            alt -= refraction(alt)
+        sin_lat, cos_lat = math.sin(self._lat), math.cos(self._lat)
+        dec = math.asin(sin_lat * math.sin(alt) + cos_lat * math.cos(alt) * math.cos(az))
+        hour_angle = math.atan2(
+            -math.cos(alt) * math.sin(az),
+            math.sin(alt) * cos_lat - math.cos(alt) * math.cos(az) * sin_lat
+        )
+        ra0, dec0 = self.__unprecess(sidereal_time(jd, self._lon) - hour_angle, dec, jd)
+        ra_hours = math.degrees(ra0) % 360 / 15
+        dec_deg = math.degrees(dec0)
+        if decimal_places > 0:
+            ra_hours = round(ra_hours, decimal_places)
+            dec_deg = round(dec_deg, decimal_places)
+        return EquatorialCoords(ra=ra_hours, dec=dec_deg)
+
+    def radec2altaz_array(self, ra: np.ndarray, dec: np.ndarray, obstime: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """ Vectorized radec2altaz: ra in hours and dec in degrees, alt and az returned in degrees """
+
+        jd = julian_date(obstime)
+        zeta, z, theta = precession_angles(jd)
+        ra0, dec0 = np.radians(np.asarray(ra, dtype=float) * 15), np.radians(np.asarray(dec, dtype=float))
+        a = np.cos(dec0) * np.sin(ra0 + zeta)
+        b = math.cos(theta) * np.cos(dec0) * np.cos(ra0 + zeta) - math.sin(theta) * np.sin(dec0)
+        c = math.sin(theta) * np.cos(dec0) * np.cos(ra0 + zeta) + math.cos(theta) * np.sin(dec0)
+        ra_date, dec_date = np.arctan2(a, b) + z, np.arcsin(np.clip(c, -1, 1))
+        hour_angle = sidereal_time(jd, self._lon) - ra_date
+        sin_lat, cos_lat = math.sin(self._lat), math.cos(self._lat)
+        alt = np.arcsin(sin_lat * np.sin(dec_date) + cos_lat * np.cos(dec_date) * np.cos(hour_angle))
+        az = np.arctan2(
+            -np.cos(dec_date) * np.sin(hour_angle),
+            np.sin(dec_date) * cos_lat - np.cos(dec_date) * np.cos(hour_angle) * sin_lat
+        )
+        if self._refraction:
+            h = np.degrees(alt)
+            alt = alt + np.where(h < -1, 0, np.radians(1.02 / np.tan(np.radians(h + 10.3 / (h + 5.11))) / 60))
+        return np.degrees(alt), np.degrees(az) % 360
+
+    def __precess(self, ra: float, dec: float, jd: float) -> Tuple[float, float]:
+        zeta, z, theta = precession_angles(jd)
+        a = math.cos(dec) * math.sin(ra + zeta)
+        b = math.cos(theta) * math.cos(dec) * math.cos(ra + zeta) - math.sin(theta) * math.sin(dec)
+        c = math.sin(theta) * math.cos(dec) * math.cos(ra + zeta) + math.cos(theta) * math.sin(dec)
+        return math.atan2(a, b) + z, math.asin(max(-1.0, min(1.0, c)))
+
+    def __unprecess(self, ra: float, dec: float, jd: float) -> Tuple[float, float]:
+        zeta, z, theta = precession_angles(jd)
+        a = math.cos(dec) * math.sin(ra - z)
+        b = math.cos(theta) * math.cos(dec) * math.cos(ra - z) + math.sin(theta) * math.sin(dec)
+        c = -math.sin(theta) * math.cos(dec) * math.cos(ra - z) + math.cos(theta) * math.sin(dec)
+        return math.atan2(a, b) - zeta, math.asin(max(-1.0, min(1.0, c)))
@@ -1,4 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import count
 import logging
 from typing import Any
 from crac_server.component.telescope.telescope import Telescope as TelescopeBase
@@ -9,11 +11,16 @@ from crac_protobuf.telescope_pb2 import (
     TelescopeSpeed,
 )
 import requests
+from requests.adapters import HTTPAdapter
 
 
 logger = logging.getLogger(__name__)
 
 
+# the properties read at every poll, all at once
+POLLED_PROPERTIES = ("altitude", "azimuth", "declination", "rightascension", "tracking", "slewing")
+
+
 class Telescope(TelescopeBase):
 
     # default port 11111
@@ -21,6 +28,11 @@ class Telescope(TelescopeBase):
         super().__init__(hostname="http://" + hostname, port=port)
         self._base_path = "/api/v1/telescope/" + config.Config.getValue("device_number", "ascom_hub") + "/"
         self.client_transaction_id = 0
+        self._transaction_ids = count(1)
+        # keep-alive connections, one for each property read at the same time
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=len(POLLED_PROPERTIES)))
+        self._readers = ThreadPoolExecutor(max_workers=len(POLLED_PROPERTIES), thread_name_prefix="alpaca")
     
     def sync(self, started_at: datetime):
         self._unpark_and_track()
@@ -45,9 +57,10 @@ class Telescope(TelescopeBase):
         self._put_response("tracking", {"Tracking": False})
 
     def retrieve(self):
-        aa_coords = self._retrieve_aa_coords()
-        eq_coords = self._retrieve_eq_coords()
-        speed = self._retrieve_speed()
+        values = self._get_values(*POLLED_PROPERTIES)
+        aa_coords = self._retrieve_aa_coords(values)
+        eq_coords = self._retrieve_eq_coords(values)
+        speed = self._retrieve_speed(values)
         status = self._retrieve_status(aa_coords)
         indicators = (eq_coords, aa_coords, speed, status)
         logger.debug("those are the indicators")
@@ -62,19 +75,15 @@ class Telescope(TelescopeBase):
         self._put_response("park")
         self.set_speed(TelescopeSpeed.SPEED_NOT_TRACKING)
 
-    def _retrieve_aa_coords(self):
-        altitude_response = self._get_response("altitude")
-        azimuth_response = self._get_response("azimuth")
-        return AltazimutalCoords(alt=float(altitude_response.json()["Value"]), az=float(azimuth_response.json()["Value"]))
+    def _retrieve_aa_coords(self, values: dict[str, Any]):
+        return AltazimutalCoords(alt=float(values["altitude"]), az=float(values["azimuth"]))
 
-    def _retrieve_eq_coords(self):
-        declination_response = self._get_response("declination")
-        right_ascension_response = self._get_response("rightascension")
-        return EquatorialCoords(dec=float(declination_response.json()["Value"]), ra=float(right_ascension_response.json()["Value"]))
+    def _retrieve_eq_coords(self, values: dict[str, Any]):
+        return EquatorialCoords(dec=float(values["declination"]), ra=float(values["rightascension"]))
 
-    def _retrieve_speed(self):
-        is_tracking = bool(self._get_response("tracking").json()["Value"])
-        is_slewing = bool(self._get_response("slewing").json()["Value"])
+    def _retrieve_speed(self, values: dict[str, Any]):
+        is_tracking = bool(values["tracking"])
+        is_slewing = bool(values["slewing"])
         logger.debug(f"tracking value: {is_tracking}")
         logger.debug(f"slewing value: {is_slewing}")
         if is_tracking and is_slewing:
@@ -86,11 +95,22 @@ class Telescope(TelescopeBase):
         else:
             return TelescopeSpeed.SPEED_NOT_TRACKING  # type: ignore
 
+    def _get_values(self, *names: str) -> dict[str, Any]:
+
+        """
+            The Value of the properties of names, requested all at the same
+            time: a poll waits for the slowest answer instead of their sum.
+            The first error, a timeout too, is raised
+        """
+
+        futures = {name: self._readers.submit(self._get_response, name) for name in names}
+        return {name: future.result().json()["Value"] for name, future in futures.items()}
+
     def _get_response(self, what):
         url = self._hostname + ":" + str(self._port) + self._base_path + what
         logger.debug(f"get request sent to {url}: {what}")
         params = self._merge_client_information()
-        response = requests.get(url, params=params)
+        response = self._session.get(url, params=params, timeout=self._settings.ascom_hub.timeout)
         logger.debug(f"get response received from {url}: {response}")
         return response
 
@@ -98,16 +118,17 @@ class Telescope(TelescopeBase):
         url = self._hostname + ":" + str(self._port) + self._base_path + what
         logger.debug(f"put request sent to {url}: {what}")
         data = self._merge_client_information(data)
-        response = requests.put(self._hostname + ":" + str(self._port) + self._base_path + what, data=data)
+        response = self._session.put(url, data=data, timeout=self._settings.ascom_hub.timeout)
         logger.debug(f"put response received from {url}: {response}")
         return response
     
     def _merge_client_information(self, data: dict[str, Any] = {}):
-        self.client_transaction_id = self.client_transaction_id + 1
-        return data | {"ClientId": 154, "ClientTransactionID": self.client_transaction_id}
+        # called from the readers at the same time: each request takes its own id
+        transaction_id = next(self._transaction_ids)
+        self.client_transaction_id = transaction_id
+        return data | {"ClientId": 154, "ClientTransactionID": transaction_id}
 
-    def __open_connection(self):
-        return True
+    def _build_connection(self):
+        """ Alpaca is spoken over HTTP, there is no socket to keep open """
 
-    def __disconnect(self):
-        pass
+        return None
@@ -0,0 +1,98 @@
+import logging
+import socket
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class TelescopeConnection:
+
+    """
+        Long lived TCP connection to the mount server, reused across the polls.
+        It is opened again only when the peer closed it or an error broke it
+    """
+
+    def __init__(self, hostname: str, port: int, timeout: float = 2, drain: bool = True, probe: bool = True) -> None:
+        self._hostname = hostname
+        self._port = port
+        self._timeout = timeout
+        self._drain = drain
+        # a driver reading the socket in its own thread finds out itself that it is closed
+        self._probe = probe
+        self._socket: Optional[socket.socket] = None
+        self._connections = 0
+
+    @property
+    def sock(self) -> Optional[socket.socket]:
+        return self._socket
+
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None
+
+    @property
+    def connections(self) -> int:
+
+        """ Number of sockets opened since the start """
+
+        return self._connections
+
+    def ensure(self) -> socket.socket:
+
+        """ Return the open socket, connecting again if it is closed or half-open """
+
+        if self._socket is not None and (not self._probe or self.__is_alive(self._socket)):
+            return self._socket
+        self.close()
+        self._socket = self.__connect()
+        self._connections += 1
+        return self._socket
+
+    def close(self):
+        if self._socket is not None:
+            try:
+                # wakes up a thread blocked reading it
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            try:
+                self._socket.close()
+            except OSError:
+                logger.debug("Error closing the telescope socket", exc_info=1)
+            self._socket = None
+
+    def __connect(self) -> socket.socket:
+        sock = socket.create_connection((self._hostname, self._port), timeout=self._timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        logger.info(f"Connected to the telescope at {self._hostname}:{self._port}")
+        return sock
+
+    def __is_alive(self, sock: socket.socket) -> bool:
+
+        """
+            Peek the socket without blocking: an empty read means the peer closed it.
+            The bytes of a previous answer left unread are dropped, so the next
+            request does not read them as its own answer
+        """
+
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            while True:
+                data = sock.recv(65536, socket.MSG_PEEK)
+                if not data:
+                    logger.warning("Telescope connection closed by the peer")
+                    return False
+                if not self._drain:
+                    return True
+                logger.debug(f"Dropping {len(data)} stale bytes from the telescope connection")
+                sock.recv(len(data))
+        except BlockingIOError:
+            return True
+        except OSError:
+            logger.warning("Telescope connection broken", exc_info=1)
+            return False
+        finally:
+            sock.settimeout(timeout)
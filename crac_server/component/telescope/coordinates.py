@@ -0,0 +1,71 @@
+import logging
+from astropy import units as u
+from astropy.coordinates import (
+    EarthLocation,
+    AltAz,
+    FK5,
+    SkyCoord
+)
+from astropy.time import Time
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,  # type: ignore
+    EquatorialCoords,  # type: ignore
+)
+from crac_server.settings import GeographySettings
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class CoordinatesTransformer:
+
+    """
+        Conversions between equatorial and horizontal coordinates for the observatory.
+        The location and the equatorial frame are built once, the horizontal
+        frame is reused for all the conversions within the same second
+    """
+
+    def __init__(self, geography: GeographySettings) -> None:
+        self._geography = geography
+        self._location = EarthLocation(lat=geography.lat, lon=geography.lon, height=geography.height * u.m)  # type: ignore
+        self._equatorial_frame = FK5(equinox=Time(geography.equinox))
+        self._horizontal_frame: Optional[Tuple[datetime, AltAz]] = None
+
+    @property
+    def geography(self) -> GeographySettings:
+        return self._geography
+
+    @property
+    def location(self) -> EarthLocation:
+        return self._location
+
+    def horizontal_frame(self, obstime: datetime) -> AltAz:
+        obstime = obstime.replace(microsecond=0)
+        cached = self._horizontal_frame
+        if cached is not None and cached[0] == obstime:
+            return cached[1]
+        frame = AltAz(location=self._location, obstime=Time(obstime, scale="utc"))
+        self._horizontal_frame = (obstime, frame)
+        return frame
+
+    def radec2altaz(self, eq_coords: EquatorialCoords, obstime: datetime, decimal_places: int = 0) -> AltazimutalCoords:
+        coord = SkyCoord(ra=eq_coords.ra * u.hourangle, dec=eq_coords.dec * u.deg, frame=self._equatorial_frame)  # type: ignore
+        altaz_coords = coord.transform_to(self.horizontal_frame(obstime))
+        alt = float(altaz_coords.alt / u.deg)  # type: ignore
+        az = float(altaz_coords.az / u.deg)  # type: ignore
+        if decimal_places > 0:
+            alt = round(alt, decimal_places)
+            az = round(az, decimal_places)
+        return AltazimutalCoords(alt=alt, az=az)
+
+    def altaz2radec(self, aa_coords: AltazimutalCoords, obstime: datetime, decimal_places: int = 0) -> EquatorialCoords:
+        alt_az = SkyCoord(alt=aa_coords.alt * u.deg, az=aa_coords.az * u.deg, frame=self.horizontal_frame(obstime))  # type: ignore
+        ra_dec = alt_az.transform_to(self._equatorial_frame)
+        ra = float(ra_dec.ra / u.hourangle)  # type: ignore
+        dec = float(ra_dec.dec / u.deg)  # type: ignore
+        if decimal_places > 0:
+            ra = round(ra, decimal_places)
+            dec = round(dec, decimal_places)
+        return EquatorialCoords(ra=ra, dec=dec)
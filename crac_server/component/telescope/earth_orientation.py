@@ -0,0 +1,60 @@
+import logging
+from astropy.time import Time
+from astropy.utils import iers
+from crac_server.settings import IersSettings
+from typing import Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+_last_measured: Optional[Tuple[int, float]] = None
+_leap_seconds_expire: Optional[str] = None
+
+
+def configure(settings: IersSettings):
+
+    """
+        Set up the IERS tables before the first transform.
+        Offline astropy never tries to download them: it uses the pinned table
+        if any, otherwise the IERS-B bundled with astropy, and it only warns for
+        the times after the end of the table (UT1-UTC is taken as 0 there)
+    """
+
+    if settings.offline:
+        iers.conf.auto_download = False
+        iers.conf.auto_max_age = None
+        if hasattr(iers.conf, "iers_degraded_accuracy"):
+            iers.conf.iers_degraded_accuracy = "warn"
+    if settings.table:
+        iers.earth_orientation_table.set(iers.IERS_A.open(settings.table))
+        logger.info(f"IERS table pinned to {settings.table}")
+    logger.info(f"IERS table age: {table_age():.0f} days")
+
+
+def table_age() -> float:
+
+    """ Days since the last measured (not predicted) value of the table in use """
+
+    global _last_measured
+    table = iers.earth_orientation_table.get()
+    if _last_measured is None or _last_measured[0] != id(table):
+        mjd = table["MJD"]
+        if "UT1Flag" in table.colnames:
+            mjd = mjd[table["UT1Flag"] == "I"]
+        _last_measured = (id(table), float(mjd.max().value))
+    return Time.now().mjd - _last_measured[1]
+
+
+def leap_seconds_expire() -> str:
+    global _leap_seconds_expire
+    if _leap_seconds_expire is None:
+        _leap_seconds_expire = iers.LeapSeconds.auto_open().expires.strftime("%Y-%m-%d")
+    return _leap_seconds_expire
+
+
+def status() -> dict[str, str]:
+    return {
+        "iers_table_age_days": f"{table_age():.1f}",
+        "leap_seconds_expire": leap_seconds_expire(),
+    }
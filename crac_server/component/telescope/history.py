@@ -0,0 +1,115 @@
+import numpy as np
+from crac_server.component.telescope.state import TelescopeState
+from threading import Lock
+from typing import NamedTuple, Optional
+
+
+FIELDS = ("time", "alt", "az", "ra", "dec", "speed", "status")
+TIME, ALT, AZ, RA, DEC, SPEED, STATUS = range(len(FIELDS))
+
+
+class Rates(NamedTuple):
+    """ Degrees per second (velocity) or per second squared (acceleration) """
+
+    alt: float
+    az: float
+
+
+class PoseHistory:
+
+    """
+        The last polled positions in a fixed size ring buffer, one row per
+        field of FIELDS and one column per sample.
+        Only the polling loop appends, readers get copies in time order.
+        Missing coordinates are stored as NaN
+    """
+
+    def __init__(self, size: int) -> None:
+        self._lock = Lock()
+        self._allocate(size)
+
+    def _allocate(self, size: int):
+        self._data = np.full((len(FIELDS), size), np.nan)
+        self._next = 0
+        self._count = 0
+
+    @property
+    def size(self) -> int:
+        return self._data.shape[1]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, state: TelescopeState):
+        aa_coords, eq_coords = state.aa_coords, state.eq_coords
+        with self._lock:
+            column = self._data[:, self._next]
+            column[TIME] = state.sampled_at.timestamp()
+            column[ALT], column[AZ] = (aa_coords.alt, aa_coords.az) if aa_coords else (np.nan, np.nan)
+            column[RA], column[DEC] = (eq_coords.ra, eq_coords.dec) if eq_coords else (np.nan, np.nan)
+            column[SPEED] = state.speed
+            column[STATUS] = state.status
+            self._next = (self._next + 1) % self.size
+            self._count = min(self._count + 1, self.size)
+
+    def clear(self):
+        with self._lock:
+            self._data.fill(np.nan)
+            self._next = 0
+            self._count = 0
+
+    def resize(self, size: int):
+        """ Keep the newest samples that fit in the new size """
+
+        if size == self.size:
+            return
+        with self._lock:
+            samples = self.__ordered(min(self._count, size))
+            self._allocate(size)
+            count = samples.shape[1]
+            self._data[:, :count] = samples
+            self._next = count % size
+            self._count = count
+
+    def samples(self, last: Optional[int] = None) -> np.ndarray:
+        """ A copy of the last samples, oldest first, shaped (len(FIELDS), n) """
+
+        with self._lock:
+            return self.__ordered(self._count if last is None else min(last, self._count))
+
+    def velocity(self, window: int = 5) -> Optional[Rates]:
+        """ alt/az velocity at the last sample, None without 3 valid samples in the window """
+
+        kinematics = self.kinematics(window)
+        return Rates(*kinematics[0][:, -1]) if kinematics else None
+
+    def acceleration(self, window: int = 5) -> Optional[Rates]:
+        kinematics = self.kinematics(window)
+        return Rates(*kinematics[1][:, -1]) if kinematics else None
+
+    def kinematics(self, window: int = 5) -> Optional[tuple]:
+        """
+            alt/az velocity and acceleration at each of the last window samples
+            polled at the speed of the last one, both shaped (2, n)
+        """
+
+        samples = self.samples(window)
+        # only the last motion: a slew just stopped must not push a tracking telescope
+        changes = np.flatnonzero(samples[SPEED] != samples[SPEED, -1]) if samples.shape[1] else ()
+        if len(changes):
+            samples = samples[:, changes[-1] + 1:]
+        samples = samples[:, np.isfinite(samples[ALT])]
+        # two samples of the same poll would divide by zero
+        samples = samples[:, np.diff(samples[TIME], prepend=-np.inf) > 0]
+        if samples.shape[1] < 3:
+            return None
+        time = samples[TIME]
+        # across north the azimuth goes on beyond 360 instead of jumping back to 0
+        position = np.vstack((samples[ALT], np.degrees(np.unwrap(np.radians(samples[AZ])))))
+        velocity = np.gradient(position, time, axis=1)
+        acceleration = np.gradient(velocity, time, axis=1)
+        return velocity, acceleration
+
+    def __ordered(self, count: int) -> np.ndarray:
+        # fancy indexing copies
+        return self._data[:, (self._next - count + np.arange(count)) % self.size]
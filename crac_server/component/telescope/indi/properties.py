@@ -0,0 +1,54 @@
+import logging
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+_SEXAGESIMAL = re.compile(r"[:\s]+")
+
+
+def number(text: str) -> float:
+    """ An INDI number, decimal or sexagesimal as 5:30:00 or -22 30 """
+
+    text = text.strip()
+    parts = _SEXAGESIMAL.split(text)
+    value = sum(abs(float(part)) / 60 ** index for index, part in enumerate(parts))
+    return -value if text.startswith("-") else value
+
+
+def item_value(vector_type: str, text: Optional[str]) -> Any:
+    text = (text or "").strip()
+    if vector_type == "Number":
+        return number(text)
+    if vector_type == "Switch":
+        return text == "On"
+    return text
+
+
+def element_message(element: ET.Element) -> Optional[dict]:
+
+    """
+        An INDI def*Vector, set*Vector or delProperty element as the INDIGO
+        JSON message telling the same, so the PropertyMirror keeps the INDI
+        properties too. None for the other elements and the malformed ones
+    """
+
+    tag = element.tag
+    body: dict = {key: value for key, value in element.attrib.items()}
+    if tag == "delProperty":
+        return {"deleteProperty": body}
+    if not (tag.startswith(("def", "set")) and tag.endswith("Vector")):
+        return None
+    vector_type = tag[3:-6]
+    try:
+        body["items"] = [
+            {"name": child.get("name"), "value": item_value(vector_type, child.text)}
+            for child in element if child.get("name")
+        ]
+    except ValueError as e:
+        logger.error(f"Invalid value in {tag} {element.get('name')}: {e}")
+        return None
+    return {tag: body}
@@ -0,0 +1,129 @@
+import logging
+import re
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# the opening tag of a top level element, its attributes and whether it closes itself
+_START_TAG = re.compile(rb"<(\w+)((?:\s+[\w:]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*)\s*(/?)>")
+# what the opening tag may still be, when the chunk ends in it
+_PARTIAL_START_TAG = re.compile(rb"<\w*(?:\s+[\w:]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*\s*(?:[\w:]+\s*(?:=\s*(?:\"[^\"]*|'[^']*)?)?)?/?\Z")
+_DEVICE = re.compile(rb"\sdevice\s*=\s*(?:\"([^\"]*)\"|'([^']*)')")
+
+# bytes of an element kept until it is complete, a bigger one is skipped as a BLOB
+MAX_ELEMENT_SIZE = 1 << 20
+
+
+class XmlStreamDecoder:
+
+    """
+        Split the INDI XML stream, fed in chunks as they are read from the
+        socket, into its top level elements.
+        The elements are framed on the bytes, from their opening tag to their
+        closing one: those of another device than device, the BLOBs and the
+        ones bigger than MAX_ELEMENT_SIZE are skipped as they stream by and
+        never parsed. The others are fed whole to a pull parser, under an
+        opening tag of its own since the stream has no root, and detached from
+        its tree once read.
+        Malformed XML is logged and dropped, up to the next opening tag
+    """
+
+    def __init__(self, device: Optional[str] = None) -> None:
+        self._device = device.encode("utf-8") if device is not None else None
+        self._buffer = b""
+        self._closing: Optional[bytes] = None
+        self._skipping = False
+        self.skipped = 0
+        self.__reset()
+
+    def feed(self, data: bytes) -> list:
+        buffer = self._buffer + data
+        elements: list = []
+        position = 0
+        while position < len(buffer):
+            if self._closing is not None:
+                end = buffer.find(self._closing, position)
+                if end < 0:
+                    if self._skipping or len(buffer) - position > MAX_ELEMENT_SIZE:
+                        self.__skip_to_closing()
+                        # keep only what may be the start of the closing tag
+                        position = max(position, len(buffer) - len(self._closing) + 1)
+                    break
+                end += len(self._closing)
+                if end - position > MAX_ELEMENT_SIZE:
+                    self.__skip_to_closing()
+                if not self._skipping:
+                    self.__parse(buffer[position:end], elements)
+                else:
+                    self.skipped += 1
+                self._closing = None
+                self._skipping = False
+                position = end
+                continue
+            start = buffer.find(b"<", position)
+            if start < 0:
+                position = len(buffer)
+                break
+            tag = _START_TAG.match(buffer, start)
+            if tag is None:
+                if _PARTIAL_START_TAG.match(buffer, start) and len(buffer) - start <= MAX_ELEMENT_SIZE:
+                    # the opening tag is not complete yet
+                    position = start
+                    break
+                # a closing tag or a declaration out of place, or not XML
+                logger.error(f"Malformed XML from the INDI server: {buffer[start:start + 80]!r}")
+                position = start + 1
+                continue
+            name, attributes, closed = tag.groups()
+            accepted = self.__accepts(name, attributes)
+            if closed:
+                if accepted:
+                    self.__parse(buffer[start:tag.end()], elements)
+                else:
+                    self.skipped += 1
+                position = tag.end()
+                continue
+            self._closing = b"</" + name + b">"
+            self._skipping = not accepted
+            position = start if accepted else tag.end()
+        self._buffer = buffer[position:]
+        return elements
+
+    def __accepts(self, name: bytes, attributes: bytes) -> bool:
+        if name.endswith(b"BLOBVector"):
+            return False
+        if self._device is None:
+            return True
+        device = _DEVICE.search(attributes)
+        return device is None or (device.group(1) or device.group(2)) == self._device
+
+    def __skip_to_closing(self):
+        if not self._skipping:
+            logger.warning(f"INDI element bigger than {MAX_ELEMENT_SIZE} bytes skipped")
+            self._skipping = True
+
+    def __parse(self, element: bytes, elements: list):
+        try:
+            self._parser.feed(element)
+            for event, parsed in self._parser.read_events():
+                if event == "start":
+                    if self._root is None:
+                        self._root = parsed
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 1:
+                        self._root.remove(parsed)  # type: ignore
+                        elements.append(parsed)
+        except ET.ParseError as e:
+            logger.error(f"Malformed XML from the INDI server: {e}")
+            self.__reset()
+
+    def __reset(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self._depth = 0
+        self._parser.feed(b"<indi>")
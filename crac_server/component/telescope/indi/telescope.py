@@ -3,27 +3,67 @@ from crac_protobuf.telescope_pb2 import (
     EquatorialCoords,
     AltazimutalCoords,
     TelescopeSpeed,
+    TelescopeStatus,  # type: ignore
 )
 from crac_server import config
 from crac_server.component.telescope.telescope import Telescope as TelescopeBase
+from crac_server.component.telescope.connection import TelescopeConnection
+from crac_server.component.telescope.indi.properties import element_message
+from crac_server.component.telescope.indi.stream import XmlStreamDecoder
+from crac_server.component.telescope.indigo.mirror import PropertyMirror
+from crac_server.component.telescope.indigo.properties import PropertyIndex
+from threading import Thread
+from typing import Optional
 import logging
+import socket
+import time
 import xml.etree.ElementTree as ET
 
 
 logger = logging.getLogger(__name__)
 
 
+# seconds to wait for the answer to a command
+REPLY_TIMEOUT = 2
+
+# seconds to wait, on a new connection, for the properties the mount may not have
+SUBSCRIPTION_TIMEOUT = 1
+
+# the properties subscribed, only the equatorial coordinates are needed to poll
+SUBSCRIBED_PROPERTIES = (
+    "EQUATORIAL_EOD_COORD",
+    "HORIZONTAL_COORD",
+    "TELESCOPE_TRACK_STATE",
+    "TELESCOPE_PARK",
+)
+
+
 class Telescope(TelescopeBase):
 
     # default port 7624
     def __init__(self, hostname=config.Config.getValue("hostname", "telescope"), port=config.Config.getInt("port", "telescope")) -> None:
         super().__init__(hostname=hostname, port=port)
         self._name = config.Config.getValue("name", "indi")
+        self._mirror = PropertyMirror(self._name)
+        self._reader: Optional[Thread] = None
+        self._reader_connection = 0
+        self._refreshed_at = 0.0
+
+    def _build_connection(self):
+        """ The reader thread owns the stream: nothing is drained and it tells when the socket is closed """
+
+        if not self._hostname or not self._port:
+            return None
+        return TelescopeConnection(self._hostname, self._port, drain=False, probe=False)
+
+    @property
+    def mirror(self) -> PropertyMirror:
+        return self._mirror
 
     def sync(self, started_at: datetime):
         self.__call(
             f"""
-                <setSwitchVector device="{self._name}" name="ON_COORD_SET">
+                <newSwitchVector device="{self._name}" name="ON_COORD_SET">
                     <oneSwitch name="SLEW">
                         Off
                     </oneSwitch>
@@ -33,7 +73,7 @@ class Telescope(TelescopeBase):
                     <oneSwitch name="SYNC">
                         On
                     </oneSwitch>
-                </setSwitchVector>
+                </newSwitchVector>
             """
         )
         eq_coords = self._calculate_eq_coords_of_park_position(started_at)
@@ -51,7 +91,7 @@ class Telescope(TelescopeBase):
         )
         self.__call(
             f"""
-                <setSwitchVector device="{self._name}" name="ON_COORD_SET">
+                <newSwitchVector device="{self._name}" name="ON_COORD_SET">
                     <oneSwitch name="SLEW">
                         Off
                     </oneSwitch>
@@ -61,7 +101,7 @@ class Telescope(TelescopeBase):
                     <oneSwitch name="SYNC">
                         Off
                     </oneSwitch>
-                </setSwitchVector>
+                </newSwitchVector>
             """
         )
 
@@ -69,26 +109,26 @@ class Telescope(TelescopeBase):
         if speed is TelescopeSpeed.SPEED_NOT_TRACKING:
             self.__call(
                 f"""
-                    <setSwitchVector device="{self._name}" name="TELESCOPE_TRACK_STATE">
+                    <newSwitchVector device="{self._name}" name="TELESCOPE_TRACK_STATE">
                         <oneSwitch name="TRACK_OFF">
                             On
                         </oneSwitch>
-                    </setSwitchVector>
+                    </newSwitchVector>
                 """
             )
         else:
             self.__call(
                 f"""
-                    <setSwitchVector device="{self._name}" name="TELESCOPE_TRACK_STATE">
+                    <newSwitchVector device="{self._name}" name="TELESCOPE_TRACK_STATE">
                         <oneSwitch name="TRACK_ON">
                             On
                         </oneSwitch>
-                    </setSwitchVector>
+                    </newSwitchVector>
                 """
             )
             self.__call(
                 f"""
-                    <setSwitchVector device="{self._name}" name="ON_COORD_SET">
+                    <newSwitchVector device="{self._name}" name="ON_COORD_SET">
                         <oneSwitch name="SLEW">
                             {"On" if speed == TelescopeSpeed.SPEED_SLEWING else "Off"}
                         </oneSwitch>
@@ -98,69 +138,68 @@ class Telescope(TelescopeBase):
                         <oneSwitch name="SYNC">
                             Off
                         </oneSwitch>
-                    </setSwitchVector>
+                    </newSwitchVector>
                 """
             )
 
     def park(self, speed: TelescopeSpeed):
         self.__move(
-            aa_coords=AltazimutalCoords(
-                alt=config.Config.getFloat("park_alt", "telescope"),
-                az=config.Config.getFloat("park_az", "telescope")
-            ),
+            aa_coords=self._park_coordinate(),
             speed=speed
         )
         if speed is TelescopeSpeed.SPEED_NOT_TRACKING:
             self.__call(
                 f"""
-                <setSwitchVector device="{self._name}" name="TELESCOPE_TRACK_STATE">
+                <newSwitchVector device="{self._name}" name="TELESCOPE_TRACK_STATE">
                     <oneSwitch name="TRACK_OFF">
                         On
                     </oneSwitch>
-                </setSwitchVector>
+                </newSwitchVector>
                 """
             )
 
     def flat(self, speed: TelescopeSpeed):
         self.__move(
-            aa_coords=AltazimutalCoords(
-                alt=config.Config.getFloat("flat_alt", "telescope"),
-                az=config.Config.getFloat("flat_az", "telescope")
-            ),
+            aa_coords=self._flat_coordinate,
             speed=speed
         )
         if speed is TelescopeSpeed.SPEED_NOT_TRACKING:
             self.__call(
                 f"""
-                <setSwitchVector device="{self._name}" name="TELESCOPE_TRACK_STATE">
+                <newSwitchVector device="{self._name}" name="TELESCOPE_TRACK_STATE">
                     <oneSwitch name="TRACK_OFF">
                         On
                     </oneSwitch>
-                </setSwitchVector>
+                </newSwitchVector>
                 """
             )
 
     def retrieve(self) -> tuple:
-        root = self.__call(
-            f"""
-            <getProperties device="{self._name}" version="1.7" name="EQUATORIAL_EOD_COORD"/>
-            """
-        )
-        eq_coords = self.__retrieve_eq_coords(root)
-        speed = self.__retrieve_speed(root)
-        aa_coords = self._retrieve_aa_coords(eq_coords)
-        status = self._retrieve_status(aa_coords)
+        self.__ensure_reader()
+        if not self._mirror.wait_for(("EQUATORIAL_EOD_COORD",), REPLY_TIMEOUT):
+            raise TimeoutError("INDI server did not send EQUATORIAL_EOD_COORD")
+        max_property_age = self._settings.indi.max_property_age
+        stale = self._mirror.stale(("EQUATORIAL_EOD_COORD",), max_property_age)
+        if stale and time.monotonic() - self._refreshed_at > max_property_age:
+            # a still mount pushes nothing: ask again, the answer arrives for the next polls
+            logger.debug(f"INDI properties not updated for {max_property_age} seconds")
+            self.__subscribe()
+        properties = self._mirror.index(SUBSCRIBED_PROPERTIES)
+        eq_coords = self.__retrieve_eq_coords(properties)
+        speed = self.__retrieve_speed(properties)
+        aa_coords = self.__retrieve_horizontal_coords(properties) or self._retrieve_aa_coords(eq_coords)
+        status = self.__retrieve_status(aa_coords, properties)
 
         return (eq_coords, aa_coords, speed, status)
 
     def __move(self, aa_coords: AltazimutalCoords, speed=TelescopeSpeed.SPEED_TRACKING):
         self.__call(
             f"""
-                <setSwitchVector device="{self._name}" name="TELESCOPE_PARK">
+                <newSwitchVector device="{self._name}" name="TELESCOPE_PARK">
                     <oneSwitch name="UNPARK">
                         On
                     </oneSwitch>
-                </setSwitchVector>
+                </newSwitchVector>
             """
         )
         eq_coords = self._altaz2radec(aa_coords, decimal_places=2, obstime=datetime.utcnow()) if isinstance(aa_coords, (AltazimutalCoords)) else aa_coords
@@ -177,47 +216,133 @@ class Telescope(TelescopeBase):
                       {eq_coords.ra}
                     </oneNumber>
                 </newNumberVector>
-            """
+            """,
+            reply="EQUATORIAL_EOD_COORD"
         )
 
-    def __retrieve_speed(self, root):
-        state = root.attrib["state"].strip() if root else None
-        if state == "Ok":
+    def __retrieve_speed(self, properties: PropertyIndex) -> TelescopeSpeed:
+        state = properties.state("Number", "EQUATORIAL_EOD_COORD")
+        tracking = properties.get("Switch", "TELESCOPE_TRACK_STATE", "TRACK_ON")
+        if state == "Busy":
+            return TelescopeSpeed.SPEED_SLEWING
+        elif state == "Alert":
+            return TelescopeSpeed.SPEED_ERROR
+        elif tracking is not None:
+            # the mount tells its track state, the state of the coordinates may not follow it
+            return TelescopeSpeed.SPEED_TRACKING if tracking else TelescopeSpeed.SPEED_NOT_TRACKING
+        elif state == "Ok":
             return TelescopeSpeed.SPEED_TRACKING
         elif state == "Idle":
             return TelescopeSpeed.SPEED_NOT_TRACKING
-        elif state == "Busy":
-            return TelescopeSpeed.SPEED_SLEWING
         else:
             return TelescopeSpeed.SPEED_ERROR
-        # match state:
-        #     case "Ok":
-        #         return TelescopeSpeed.SPEED_TRACKING
-        #     case "Idle":
-        #         return TelescopeSpeed.SPEED_NOT_TRACKING
-        #     case "Busy":
-        #         return TelescopeSpeed.SPEED_SLEWING
-        #     case _:
-        #         return TelescopeSpeed.SPEED_ERROR
-
-    def __retrieve_eq_coords(self, root):
-        ra, dec = None, None
-        for coords in root.findall("defNumber"):
-            if coords.attrib["name"] == "RA":
-                ra = round(float(coords.text), 2)
-            elif coords.attrib["name"] == "DEC":
-                dec = round(float(coords.text), 2)
-        if ra and dec:
-            return EquatorialCoords(ra=ra, dec=dec)
+
+    def __retrieve_eq_coords(self, properties: PropertyIndex) -> EquatorialCoords:
+        ra = properties.get("Number", "EQUATORIAL_EOD_COORD", "RA")
+        dec = properties.get("Number", "EQUATORIAL_EOD_COORD", "DEC")
+        if ra is not None and dec is not None:
+            return EquatorialCoords(ra=round(ra, 2), dec=round(dec, 2))
         else:
             raise Exception(f"RA or Dec not present. RA: {ra}, DEC: {dec}")
 
-    def __call(self, script: str):
+    def __retrieve_horizontal_coords(self, properties: PropertyIndex) -> Optional[AltazimutalCoords]:
+        """ The mount own alt/az, when its driver has them """
+
+        alt = properties.get("Number", "HORIZONTAL_COORD", "ALT")
+        az = properties.get("Number", "HORIZONTAL_COORD", "AZ")
+        if alt is None or az is None:
+            return None
+        return AltazimutalCoords(alt=round(alt, 5), az=round(az, 5))
+
+    def __retrieve_status(self, aa_coords: AltazimutalCoords, properties: PropertyIndex) -> TelescopeStatus:
+        if not self._polling:
+            return TelescopeStatus.DISCONNECTED
+        # parking here is a slew to the park position: the mount park only adds to it
+        parked = properties.get("Switch", "TELESCOPE_PARK", "PARK") or None
+        return self._classifier.classify(aa_coords, parked=parked)
+
+    def __call(self, script: str, reply: Optional[str] = None):
+
+        """
+            Send script once. If it has a reply, wait until the reader brings
+            the update of the property named reply into the mirror
+        """
+
+        self.__ensure_reader()
+        sent_at = time.monotonic()
         self.s.sendall(script.encode('utf-8'))
-        data = self.s.recv(30000).decode("utf-8")
-        logger.debug(f"data received from xml: {data}")
+        if reply and not self._mirror.wait_for((reply,), REPLY_TIMEOUT, since=sent_at):
+            raise TimeoutError(f"INDI server did not answer with {reply}")
+
+    def __subscribe(self):
+
+        """
+            Ask the properties polled: the server sends them, then their changes.
+            Asking them by device and name keeps the other devices of the INDI
+            server off this connection, and the mount sends no BLOB
+        """
+
+        self._refreshed_at = time.monotonic()
+        self.s.sendall("".join(
+            [f'<enableBLOB device="{self._name}">Never</enableBLOB>\n'] +
+            [f'<getProperties version="1.7" device="{self._name}" name="{name}"/>\n' for name in SUBSCRIBED_PROPERTIES]
+        ).encode("utf-8"))
+
+    def __ensure_reader(self):
+        if self._connection.connections == self._reader_connection:
+            if self._reader.is_alive():  # type: ignore
+                return
+            raise ConnectionError("INDI server closed the connection")
+        # a new socket: the mirror starts again from the properties sent on it
+        self._mirror.clear()
+        self._reader = Thread(target=self.__read_stream, args=(self.s,), name="indi-reader", daemon=True)
+        self._reader_connection = self._connection.connections
+        self._reader.start()
+        self.__subscribe()
+        self.__wait_subscription()
+
+    def __wait_subscription(self):
+
+        """
+            Wait for the answers to the subscription, so that the first polls
+            already read HORIZONTAL_COORD and TELESCOPE_PARK instead of the
+            local conversion and the park position. INDI does not answer for
+            a property the mount does not define: those are waited for
+            SUBSCRIPTION_TIMEOUT seconds, once per connection
+        """
+
+        if not self._mirror.wait_for(("EQUATORIAL_EOD_COORD",), REPLY_TIMEOUT):
+            raise TimeoutError("INDI server did not send EQUATORIAL_EOD_COORD")
+        if not self._mirror.wait_for(SUBSCRIBED_PROPERTIES, SUBSCRIPTION_TIMEOUT):
+            missing = [name for name in SUBSCRIBED_PROPERTIES if self._mirror.get(name) is None]
+            logger.info(f"INDI device {self._name} does not define {', '.join(missing)}")
+
+    def __read_stream(self, sock: socket.socket):
+
+        """
+            Reader thread, the only one reading the socket, until it is closed.
+            The decoder drops what is not of the mount before parsing it
+        """
+
+        decoder = XmlStreamDecoder(self._name)
         try:
-            return ET.fromstring(data)
-        except ET.ParseError as err:
-            logger.error(f"Xml Malformed {err}")
-            raise err
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+                for element in decoder.feed(data):
+                    self.__dispatch(element)
+        except OSError as e:
+            logger.debug(f"INDI reader stopped: {e}")
+        logger.info("INDI stream closed")
+
+    def __dispatch(self, element: ET.Element):
+        if element.tag == "message":
+            logger.debug(f"INDI message from {element.get('device')}: {element.get('message')}")
+            return
+        message = element_message(element)
+        if message:
+            self._mirror.update(message)
@@ -0,0 +1,104 @@
+import time
+from crac_server.component.telescope.indigo.properties import PropertyIndex, PropertyVector
+from threading import Condition
+from typing import Any, Iterable, Optional
+
+
+class PropertyMirror:
+
+    """
+        The properties of one INDIGO device as last told by the server, by
+        vector name and item name.
+        def*Vector messages replace a vector, set*Vector messages update the
+        items they carry, deleteProperty drops it. A vector is never changed in
+        place: readers get a consistent copy without locking.
+        Times are time.monotonic()
+    """
+
+    def __init__(self, device: str) -> None:
+        self._device = device
+        self._vectors: dict[str, PropertyVector] = {}
+        self._changed = Condition()
+
+    def update(self, message: Any) -> Optional[str]:
+        """ Apply a message of the device, return the name of the vector it changed """
+
+        if not isinstance(message, dict) or len(message) != 1:
+            return None
+        kind, vector = next(iter(message.items()))
+        if not isinstance(vector, dict) or vector.get("device") != self._device:
+            return None
+        name = vector.get("name")
+        with self._changed:
+            if kind == "deleteProperty":
+                if name:
+                    self._vectors.pop(name, None)
+                else:
+                    self._vectors.clear()
+            elif kind.startswith(("def", "set")) and name:
+                items = {item["name"]: item.get("value") for item in vector.get("items", ()) if "name" in item}
+                current = self._vectors.get(name)
+                state = vector.get("state")
+                now = time.monotonic()
+                set_at = current.set_at if current else 0.0
+                if kind.startswith("set"):
+                    set_at = now
+                    if current:
+                        items = {**current.items, **items}
+                        state = state or current.state
+                self._vectors[name] = PropertyVector("def" + kind[3:], state or "Idle", items, now, set_at)
+            else:
+                return None
+            self._changed.notify_all()
+        return name
+
+    def get(self, name: str) -> Optional[PropertyVector]:
+        return self._vectors.get(name)
+
+    def age(self, name: str) -> Optional[float]:
+        """ Seconds since the last update of the vector, None if it is unknown """
+
+        vector = self._vectors.get(name)
+        return None if vector is None else time.monotonic() - vector.updated_at
+
+    def stale(self, names: Iterable[str], max_age: float) -> list:
+        """ The vectors of names unknown or not updated for more than max_age seconds """
+
+        stale = []
+        for name in names:
+            age = self.age(name)
+            if age is None or age > max_age:
+                stale.append(name)
+        return stale
+
+    def wait_for(self, names: Iterable[str], timeout: float, since: Optional[float] = None) -> bool:
+        """
+            Wait until all the vectors of names are known and, if since is given,
+            changed by a set*Vector after it: the server answers a new*Vector
+            with a set*Vector, while a def*Vector answers a getProperties
+        """
+
+        names = tuple(names)
+
+        def updated() -> bool:
+            for name in names:
+                vector = self._vectors.get(name)
+                if vector is None or (since is not None and vector.set_at < since):
+                    return False
+            return True
+
+        with self._changed:
+            return self._changed.wait_for(updated, timeout)
+
+    def clear(self):
+        with self._changed:
+            self._vectors.clear()
+            self._changed.notify_all()
+
+    def index(self, names: Optional[Iterable[str]] = None) -> PropertyIndex:
+        """ The vectors of names, all by default, as they are now """
+
+        vectors = self._vectors.copy() if names is None else {name: self._vectors.get(name) for name in names}
+        return PropertyIndex(self._device, {
+            (vector.vector_type, name): vector for name, vector in vectors.items() if vector is not None
+        })
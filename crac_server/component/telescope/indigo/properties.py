@@ -0,0 +1,64 @@
+from typing import Any, NamedTuple, Optional
+
+
+class PropertyVector(NamedTuple):
+    kind: str
+    state: str
+    items: dict
+    updated_at: float
+    # the last update by a set*Vector, 0 if none
+    set_at: float
+
+    @property
+    def vector_type(self) -> str:
+        """ Number, Switch, Text, Light or BLOB """
+
+        return self.kind[3:-6]
+
+
+class MissingProperty(LookupError):
+    pass
+
+
+class PropertyIndex:
+
+    """
+        The vectors of a device by (vector type, name) and their items by name,
+        built once per poll and shared by all the extractors
+    """
+
+    def __init__(self, device: str, vectors: dict) -> None:
+        """ vectors values are PropertyVector, or (kind, body) of a def*Vector message read on first use """
+
+        self._device = device
+        self._vectors: dict[tuple, Any] = vectors
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._vectors
+
+    def vector(self, vector_type: str, name: str) -> PropertyVector:
+        vector = self.__vector((vector_type, name))
+        if vector is None:
+            raise MissingProperty(f"{self._device} has no {vector_type} vector {name}")
+        return vector
+
+    def state(self, vector_type: str, name: str) -> str:
+        return self.vector(vector_type, name).state
+
+    def item(self, vector_type: str, name: str, item: str) -> Any:
+        items = self.vector(vector_type, name).items
+        if item not in items:
+            raise MissingProperty(f"{self._device} {name} has no item {item}")
+        return items[item]
+
+    def get(self, vector_type: str, name: str, item: str, default: Any = None) -> Any:
+        vector = self.__vector((vector_type, name))
+        return default if vector is None else vector.items.get(item, default)
+
+    def __vector(self, key: tuple) -> Optional[PropertyVector]:
+        vector = self._vectors.get(key)
+        if isinstance(vector, tuple) and not isinstance(vector, PropertyVector):
+            kind, body = vector
+            items = {item["name"]: item.get("value") for item in body.get("items", ()) if "name" in item}
+            vector = self._vectors[key] = PropertyVector(kind, body.get("state", "Idle"), items, 0.0, 0.0)
+        return vector
@@ -0,0 +1,80 @@
+import codecs
+import json
+import logging
+import re
+
+
+logger = logging.getLogger(__name__)
+
+
+# the characters that can change the nesting, or a string, of a JSON stream
+_TOKENS = re.compile(r'[{}"\\]')
+
+
+class JsonStreamDecoder:
+
+    """
+        Split the INDIGO JSON stream, fed in chunks as they are read from the
+        socket, into its top level objects.
+        The scan jumps from a brace or a quote to the next one and never goes
+        back, so a chunk is looked at once even when an object spans many
+        reads. Text outside the objects (newlines) is skipped, an object that
+        is not valid JSON is logged and dropped
+    """
+
+    def __init__(self) -> None:
+        self._utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, data: bytes) -> list:
+        buffer = self._buffer + self._utf8.decode(data)
+        position = self._position
+        start = 0
+        messages = []
+        while position < len(buffer):
+            if self._escape:
+                # the character after a backslash
+                self._escape = False
+                position += 1
+                continue
+            match = _TOKENS.search(buffer, position)
+            if not match:
+                position = len(buffer)
+                break
+            token = match.group()
+            position = match.end()
+            if self._in_string:
+                if token == '"':
+                    self._in_string = False
+                elif token == "\\":
+                    self._escape = True
+            elif self._depth == 0:
+                if token == "{":
+                    self._depth = 1
+                    start = match.start()
+            elif token == '"':
+                self._in_string = True
+            elif token == "{":
+                self._depth += 1
+            elif token == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.__decode(buffer[start:position], messages)
+        if self._depth:
+            # keep the object still open, from its first brace
+            self._buffer = buffer[start:]
+            self._position = position - start
+        else:
+            self._buffer = ""
+            self._position = 0
+        return messages
+
+    def __decode(self, text: str, messages: list):
+        try:
+            messages.append(json.loads(text))
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid message from the INDIGO server: {e}")
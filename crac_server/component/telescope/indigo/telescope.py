@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 from crac_protobuf.telescope_pb2 import (
     EquatorialCoords,
     AltazimutalCoords,
@@ -8,68 +8,89 @@ from crac_protobuf.telescope_pb2 import (
 )
 from crac_server import config
 from crac_server.component.telescope.telescope import Telescope as TelescopeBase
+from crac_server.component.telescope.connection import TelescopeConnection
+from crac_server.component.telescope.indigo.mirror import PropertyMirror
+from crac_server.component.telescope.indigo.properties import PropertyIndex
+from crac_server.component.telescope.indigo.stream import JsonStreamDecoder
+from threading import Thread
 import logging
 import json
-import re
-import os
 import time
 import socket
-import sys, errno
-import xml.etree.ElementTree as ET
 logger = logging.getLogger(__name__)
 
 
+# seconds to wait for the answer to a command
+REPLY_TIMEOUT = 2
+
+# the properties read at every poll
+POLLED_PROPERTIES = (
+    "MOUNT_EQUATORIAL_COORDINATES",
+    "MOUNT_HORIZONTAL_COORDINATES",
+    "MOUNT_TRACKING",
+    "MOUNT_PARK",
+)
+
+
 class Telescope(TelescopeBase):
 
     # default port 7624
     def __init__(self, hostname=config.Config.getValue("hostname", "telescope"), port=config.Config.getInt("port", "telescope")) -> None:
         super().__init__(hostname=hostname, port=port)
         self._name = config.Config.getValue("name", "indigo")
+        self._mirror = PropertyMirror(self._name)
+        self._reader: Optional[Thread] = None
+        self._reader_connection = 0
+        self._refreshed_at = 0.0
+
+    def _build_connection(self):
+        """ The reader thread owns the stream: nothing is drained and it tells when the socket is closed """
+
+        if not self._hostname or not self._port:
+            return None
+        return TelescopeConnection(self._hostname, self._port, drain=False, probe=False)
+
+    @property
+    def mirror(self) -> PropertyMirror:
+        return self._mirror
     
     def sync(self, started_at: datetime):
         self.__call(
-            f"""
-                <setNumberVector device="{self._name}" name="MOUNT_ON_COORDINATES_SET">
-                    <oneNumber name="SLEW">
-                        Off
-                    </oneNumeber>
-                    <oneNumber name="TRACK">
-                        Off
-                    </oneNumber>
-                    <oneNumber name="SYNC">
-                        On
-                    </oneNumber>
-                </oneNumberVector>
-            """
-        )
+                    {"newSwitchVector": 
+                        { 
+                            "device": self._name, "name": "MOUNT_ON_COORDINATES_SET", "state": "Ok", "items": 
+                            [
+                                { "name": "SLEW", "value": False},
+                                { "name": "TRACK", "value": False},
+                                { "name": "SYNC", "value": True}
+                            ] 
+                        } 
+                    }
+                    )
         eq_coords = self._calculate_eq_coords_of_park_position(started_at)
         self.__call(
-            f"""
-                <defNumberVector device="{self._name}" name="MOUNT_EQUATORIAL_COORDINATES">
-                    <oneNumber name="DEC">
-                      {eq_coords.dec}
-                    </oneNumber>
-                    <oneNumber name="RA">
-                      {eq_coords.ra}
-                    </oneNumber>
-                </defNumberVector>
-            """
-        )
+                    {"newNumberVector": 
+                        { 
+                            "device": self._name, "name": "MOUNT_EQUATORIAL_COORDINATES", "state": "Ok", "items": 
+                            [
+                                { "name": "DEC", "value": eq_coords.dec}, 
+                                { "name": "RA", "value": eq_coords.ra} 
+                            ] 
+                        } 
+                    }
+                    )
         self.__call(
-            f"""
-                <oneNumberVector device="{self._name}" name="MOUNT_ON_COORDINATES_SET">
-                    <oneNumber name="SLEW">
-                        Off
-                    </oneNumber>
-                    <oneNumber name="TRACK">
-                        On
-                    </oneNumber>
-                    <oneNumber name="SYNC">
-                        Off
-                    </oneNumber>
-                </oneNumberVector>
-            """
-        )
+                    {"newSwitchVector": 
+                        { 
+                            "device": self._name, "name": "MOUNT_ON_COORDINATES_SET", "state": "Ok", "items": 
+                            [
+                                { "name": "SLEW", "value": False},
+                                { "name": "TRACK", "value": True},
+                                { "name": "SYNC", "value": False}
+                            ] 
+                        } 
+                    }
+                    )
 
     def set_speed(self, speed: TelescopeSpeed):
         if speed is TelescopeSpeed.SPEED_NOT_TRACKING:
@@ -99,7 +120,7 @@ class Telescope(TelescopeBase):
             
             if speed == TelescopeSpeed.SPEED_TRACKING:
                 self.__call(
-                            {"newNumberVector": 
+                            {"newSwitchVector": 
                                 { 
                                     "device": self._name, "name": "MOUNT_ON_COORDINATES_SET", "state": "Ok", "items": 
                                     [
@@ -111,7 +132,7 @@ class Telescope(TelescopeBase):
                         )
             else:
                 self.__call(
-                            {"newNumberVector": 
+                            {"newSwitchVector": 
                                 { 
                                     "device": self._name, "name": "MOUNT_ON_COORDINATES_SET", "state": "Ok", "items": 
                                     [
@@ -138,28 +159,15 @@ class Telescope(TelescopeBase):
                         }
                     )
                     
-    def __retrieve_status_park(self, root):
-        seen = set()
-        
-        for item in root:
-            if "defSwitchVector" in item:
-                vector = item["defSwitchVector"]
-                if vector["name"] == "MOUNT_PARK":
-                    for park in vector["items"]:
-                        key = (vector["name"], vector['state'], park["name"], park["value"])
-                        if key not in seen:
-                            seen.add(key)
-                            if park['name'] == "PARKED":
-                                return park["value"] 
-
-        return False
+    def __retrieve_status_park(self, properties: PropertyIndex) -> bool:
+        return properties.get("Switch", "MOUNT_PARK", "PARKED", False)
                            
     def flat(self, speed: TelescopeSpeed):
         speed=speed        
         self.__move(
                     aa_coords=AltazimutalCoords(
-                        alt=config.Config.getFloat("flat_alt", "telescope"),
-                        az=config.Config.getFloat("flat_az", "telescope")
+                        alt=self._settings.telescope.flat_alt,
+                        az=self._settings.telescope.flat_az
                     ),
                 speed=speed
                 )
@@ -178,47 +186,32 @@ class Telescope(TelescopeBase):
                         )
 
     def retrieve(self) -> tuple:
-        root = self.__call(
-                            {"getProperties": 
-                                {
-                                    "version": 512,
-                                    "device": self._name
-                                }
-                            }
-                        )           
-        eq_coords = self.__retrieve_eq_coords(root)   
+        self.__ensure_reader()
+        if not self._mirror.wait_for(POLLED_PROPERTIES, REPLY_TIMEOUT):
+            missing = [name for name in POLLED_PROPERTIES if self._mirror.get(name) is None]
+            raise TimeoutError(f"INDIGO server did not send {', '.join(missing)}")
+        max_property_age = self._settings.indigo.max_property_age
+        stale = self._mirror.stale(POLLED_PROPERTIES, max_property_age)
+        if stale and time.monotonic() - self._refreshed_at > max_property_age:
+            # a still mount pushes nothing: ask everything again, the answer arrives for the next polls
+            logger.debug(f"INDIGO properties not updated for {max_property_age} seconds: {stale}")
+            self.__get_properties()
+        properties = self._mirror.index(POLLED_PROPERTIES)
+        eq_coords = self.__retrieve_eq_coords(properties)   
         logger.debug(f"data received from json: {eq_coords}")  
-        speed = self.__retrieve_speed(root)
+        speed = self.__retrieve_speed(properties)
         logger.debug(f"data received from json: {speed}")
-        aa_coords = self.__retrieve_aa_coords(root)
+        aa_coords = self.__retrieve_aa_coords(properties)
         logger.debug(f"data received from json: {aa_coords}")
-        status = self._retrieve_status(aa_coords, root)
+        status = self._retrieve_status(aa_coords, properties)
         logger.debug(f"data received from json: {status}")
 
         return (eq_coords, aa_coords, speed, status)
     
-    def _retrieve_status(self, aa_coords: AltazimutalCoords, root: Any) -> TelescopeStatus:
+    def _retrieve_status(self, aa_coords: AltazimutalCoords, properties: PropertyIndex) -> TelescopeStatus:
         if not self._polling:
             return TelescopeStatus.DISCONNECTED
-        elif self.__retrieve_status_park(root):
-            return TelescopeStatus.PARKED
-        elif self.__within_flat_alt_range(aa_coords.alt) and self.__within_flat_az_range(aa_coords.az):
-            return TelescopeStatus.FLATTER
-        elif aa_coords.alt <= config.Config.getFloat("max_secure_alt", "telescope"):
-            return TelescopeStatus.SECURE
-        else:
-            if config.Config.getInt("azNE", "azimut") > aa_coords.az:
-                return TelescopeStatus.NORTHEAST
-            elif aa_coords.az > config.Config.getInt("azNW", "azimut"):
-                return TelescopeStatus.NORTHWEST
-            elif config.Config.getInt("azSW", "azimut") > aa_coords.az > 180:
-                return TelescopeStatus.SOUTHWEST
-            elif 180 >= aa_coords.az > config.Config.getInt("azSE", "azimut"):
-                return TelescopeStatus.SOUTHEAST
-            elif config.Config.getInt("azSW", "azimut") < aa_coords.az <= config.Config.getInt("azNW", "azimut"):
-                return TelescopeStatus.WEST
-            elif config.Config.getInt("azNE", "azimut") <= aa_coords.az <= config.Config.getInt("azSE", "azimut"):
-                return TelescopeStatus.EAST
+        return self._classifier.classify(aa_coords, parked=self.__retrieve_status_park(properties))
 
     def __move(self, aa_coords: AltazimutalCoords, speed=TelescopeSpeed.SPEED_TRACKING):
 
@@ -237,134 +230,82 @@ class Telescope(TelescopeBase):
                         } 
                     }
                     )  
-    def __retrieve_speed(self, root):
-        seen = set()    
-        #status_mount_speed=[]    
-        #status_mount_track=[]
-        for item in root:
-            if "defSwitchVector" in item:
-                vector = item["defSwitchVector"]
-                if vector["name"] == "MOUNT_TRACKING":
-                    for track in vector["items"]:
-                        key = (vector["name"], vector['state'], track["name"], track["value"])
-                        if key not in seen:
-                            seen.add(key)
-                            if track['name'] == "ON":
-                                if track["value"] == True:
-                                    status_mount_track = 'ON'
-                                else:
-                                    status_mount_track = 'OFF'    
-                                
-            if "defNumberVector" in item:
-                vector = item["defNumberVector"]
-                if vector["name"] == "MOUNT_EQUATORIAL_COORDINATES":
-                    for coord in vector["items"]:
-                        key = (vector["name"], vector['state'], coord["name"], coord["value"])
-                        if key not in seen:
-                            seen.add(key)
-                            status_mount_speed= vector['state']
-                                                        
-        if status_mount_speed == "Ok" and status_mount_track == 'ON':
+    def __retrieve_speed(self, properties: PropertyIndex) -> TelescopeSpeed:
+        tracking = properties.get("Switch", "MOUNT_TRACKING", "ON")
+        state = properties.state("Number", "MOUNT_EQUATORIAL_COORDINATES")
+        if state == "Ok" and tracking is True:
             return TelescopeSpeed.SPEED_TRACKING
-        if status_mount_speed == "Idle" and status_mount_track == 'OFF':
+        if state == "Idle" and tracking is False:
             return TelescopeSpeed.SPEED_NOT_TRACKING
-        if status_mount_speed == "Busy":
+        if state == "Busy":
             return TelescopeSpeed.SPEED_SLEWING
         else:
             return TelescopeSpeed.SPEED_ERROR
 
-                           
-    def __retrieve_eq_coords(self, root):
-        ra, dec = None, None
-        seen = set()
-        for item in root:            
-            if "defNumberVector" in item:
-                vector = item["defNumberVector"]
-                if vector["name"] == "MOUNT_EQUATORIAL_COORDINATES":
-                    for coord in vector["items"]:
-                        key = (vector["name"], vector['state'], coord["name"], coord["value"])
-                        if key not in seen:
-                            seen.add(key)
-                            if coord["name"] == "RA":
-                                ra = round(float(coord['value']),5)
-                            elif coord["name"] == "DEC":
-                                dec = round(float(coord['value']),5)
-                            
-        if ra is not None and dec is not None:
-            return EquatorialCoords(ra=ra, dec=dec)
-        else:
-            raise Exception(f"RA or Dec not present. RA: {ra}, DEC: {dec}")
+    def __retrieve_eq_coords(self, properties: PropertyIndex) -> EquatorialCoords:
+        ra = properties.item("Number", "MOUNT_EQUATORIAL_COORDINATES", "RA")
+        dec = properties.item("Number", "MOUNT_EQUATORIAL_COORDINATES", "DEC")
+        return EquatorialCoords(ra=round(float(ra), 5), dec=round(float(dec), 5))
 
-    def __retrieve_aa_coords(self, root):
-        ra, dec = None, None
-        seen = set()
-        for item in root:            
-            if "defNumberVector" in item:
-                vector = item["defNumberVector"]
-                if vector["name"] == "MOUNT_HORIZONTAL_COORDINATES":
-                    for coord in vector["items"]:
-                        key = (vector["name"], vector['state'], coord["name"], coord["value"])
-                        if key not in seen:
-                            seen.add(key)
-                            if coord["name"] == "ALT":
-                                alt = round(float(coord['value']),5)
-                            elif coord["name"] == "AZ":
-                                az = round(float(coord['value']),5)
-                                
-        if alt is not None and az is not None:
-            return AltazimutalCoords(alt=alt, az=az)
-        else:
-            raise Exception(f"ALT or AZ not present. ALT: {alt}, AZ: {az}")
+    def __retrieve_aa_coords(self, properties: PropertyIndex) -> AltazimutalCoords:
+        alt = properties.item("Number", "MOUNT_HORIZONTAL_COORDINATES", "ALT")
+        az = properties.item("Number", "MOUNT_HORIZONTAL_COORDINATES", "AZ")
+        return AltazimutalCoords(alt=round(float(alt), 5), az=round(float(az), 5))
  
-    def __call(self, script):
-        request_json = json.dumps(script)
-        self.s.settimeout(1)  # Set a timeout for the socket  
-        responses=[]
+    def __call(self, script: Any):
 
-        def send_and_receive(request):
-            response=b""              
-            try:
-                self.s.sendall(request)
-                time.sleep(0.4)
-                while True:
-                    try:
-                        part = self.s.recv(2500000)
-                        if not part:
-                            break
-                        response +=part
+        """
+            Send script once. The answer to a new*Vector script is the update
+            of its property: wait until the reader brings it into the mirror
+        """
 
-                    except socket.timeout:
-                        print("Socket timeout, stopping reception.")
-                        break
+        self.__ensure_reader()
+        waiting = self.__replied_by(script)
+        sent_at = time.monotonic()
+        self.s.sendall(json.dumps(script).encode("utf-8") + b"\n")
+        if waiting and not self._mirror.wait_for(waiting, REPLY_TIMEOUT, since=sent_at):
+            raise TimeoutError(f"INDIGO server did not answer to {', '.join(sorted(waiting))}")
 
-                    return response        
-            except Exception as e:
-                if isinstance(e, socket.error) and e.errno == errno.EPIPE:
-                    print(f"Si è verificato un errore: {e}")
-            
-        response_with_newline = send_and_receive(request_json.encode('utf-8') + b'\n')
-        if response_with_newline:
-            responses.append(response_with_newline.decode('utf-8'))
+    def __get_properties(self):
+        """ Subscribe to the device: the server sends all its properties, then their changes """
+
+        self._refreshed_at = time.monotonic()
+        self.s.sendall(json.dumps({"getProperties": {"version": 512, "device": self._name}}).encode("utf-8") + b"\n")
 
+    def __ensure_reader(self):
+        if self._connection.connections == self._reader_connection:
+            if self._reader.is_alive():  # type: ignore
+                return
+            raise ConnectionError("INDIGO server closed the connection")
+        # a new socket: the mirror starts again from the properties sent on it
+        self._mirror.clear()
+        self._reader = Thread(target=self.__read_stream, args=(self.s,), name="indigo-reader", daemon=True)
+        self._reader_connection = self._connection.connections
+        self._reader.start()
+        self.__get_properties()
 
-        # Send request without newline
-        response_without_newline = send_and_receive(request_json.encode('utf-8'))
-        if response_without_newline:
-            responses.append(response_without_newline.decode('utf-8'))
+    def __read_stream(self, sock: socket.socket):
 
-        # Combine responses and process them
-        combined_response = "\n".join(responses)  
+        """ Reader thread, the only one reading the socket, until it is closed """
 
-        # Use a regex to find and separate all complete JSON objects in the combined response
-        json_strings = re.findall(r'\{.*?\}(?=\{|\Z)', combined_response)
+        decoder = JsonStreamDecoder()
+        try:
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+                for message in decoder.feed(data):
+                    self._mirror.update(message)
+        except OSError as e:
+            logger.debug(f"INDIGO reader stopped: {e}")
+        logger.info("INDIGO stream closed")
 
-        # Convert each JSON string to a Python object
-        response_objects = []
-        for json_str in json_strings:
-            try:
-                json_obj = json.loads(json_str)
-                response_objects.append(json_obj)
-            except json.JSONDecodeError as e:
-                print(f"Errore nella decodifica del JSON: {e}")
-       
-        return response_objects
\ No newline at end of file
+    def __replied_by(self, script: Any) -> set:
+        if isinstance(script, dict) and len(script) == 1:
+            kind, vector = next(iter(script.items()))
+            if kind.startswith("new"):
+                return {vector["name"]}
+        return set()
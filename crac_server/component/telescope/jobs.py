@@ -0,0 +1,107 @@
+import heapq
+import logging
+from concurrent.futures import Future
+from enum import IntEnum
+from itertools import count
+from threading import Lock
+from typing import Callable, Iterable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobPriority(IntEnum):
+    SAFETY = 0
+    SYNC = 1
+    MOVE = 2
+    SPEED = 3
+
+
+class Job:
+
+    __slots__ = ("action", "kwargs", "priority", "key", "future", "sequence")
+
+    def __init__(self, action: Callable, kwargs: dict, priority: JobPriority, key: str, sequence: int) -> None:
+        self.action = action
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.future: Future = Future()
+        self.sequence = sequence
+
+    def __lt__(self, other: "Job") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+    def __repr__(self) -> str:
+        return f"Job({self.key}, {self.kwargs}, {self.priority.name})"
+
+
+class JobQueue:
+
+    """
+        Priority queue of the telescope commands.
+        A command with the same key of a pending one replaces its arguments and
+        shares its future, so repeated requests do not pile up and the queue
+        holds at most one job per command; a safety command cancels the pending
+        commands it makes pointless
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[Job] = []
+        self._pending: dict[str, Job] = {}
+        self._sequence = count()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, key: str, action: Callable, priority: JobPriority, supersedes: Iterable[str] = (), **kwargs) -> Future:
+        with self._lock:
+            for superseded in supersedes:
+                self.__cancel(superseded)
+            job = self._pending.get(key)
+            if job:
+                logger.debug(f"{key} job already pending, arguments updated to {kwargs}")
+                job.kwargs = kwargs
+                return job.future
+            job = Job(action, kwargs, priority, key, next(self._sequence))
+            self._pending[key] = job
+            heapq.heappush(self._heap, job)
+            return job.future
+
+    def get(self) -> Optional[Job]:
+        """ The pending job with the highest priority, the oldest first """
+
+        with self._lock:
+            while self._heap:
+                job = heapq.heappop(self._heap)
+                if self._pending.get(job.key) is job:
+                    del self._pending[job.key]
+                    return job
+            return None
+
+    def cancel_all(self):
+        """ Cancel every pending job, their futures end with CancelledError """
+
+        with self._lock:
+            for key in list(self._pending):
+                self.__cancel(key)
+            self._heap.clear()
+
+    def fail_all(self, error: BaseException):
+        """ End every pending job with error, without running it """
+
+        with self._lock:
+            jobs = list(self._pending.values())
+            self._pending.clear()
+            self._heap.clear()
+        for job in jobs:
+            logger.debug(f"{job} failed: {error}")
+            if job.future.set_running_or_notify_cancel():
+                job.future.set_exception(error)
+
+    def __cancel(self, key: str):
+        job = self._pending.pop(key, None)
+        if job:
+            logger.debug(f"{job} cancelled")
+            job.future.cancel()
@@ -0,0 +1,122 @@
+import logging
+import math
+import requests
+import socket
+from itertools import accumulate
+from time import monotonic
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+TIMEOUTS = (TimeoutError, socket.timeout, requests.Timeout)
+
+
+class LatencyHistogram:
+
+    """
+        HDR-style histogram of durations in seconds: logarithmic buckets, each
+        PRECISION wider than the previous one, so every percentile is within
+        PRECISION of the true value from LOWEST to HIGHEST seconds.
+        Recording is an index computation and an increment
+    """
+
+    LOWEST = 1e-6
+    HIGHEST = 120
+    PRECISION = 0.01
+
+    def __init__(self) -> None:
+        self._growth = math.log1p(self.PRECISION)
+        self._counts = [0] * (self.__index(self.HIGHEST) + 2)
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self._counts[min(self.__index(seconds), len(self._counts) - 1)] += 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """ The upper bound of the bucket holding the percentile, None while empty """
+
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        for index, total in enumerate(accumulate(self._counts[:-1])):
+            if total >= rank:
+                return min(self.LOWEST * (1 + self.PRECISION) ** index, self.max)
+        # beyond HIGHEST
+        return self.max
+
+    def __index(self, seconds: float) -> int:
+        if seconds <= self.LOWEST:
+            return 0
+        return int(math.log(seconds / self.LOWEST) / self._growth) + 1
+
+
+class CallMetrics:
+
+    __slots__ = ("histogram", "errors", "timeouts")
+
+    def __init__(self) -> None:
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.timeouts = 0
+
+    def summary(self) -> dict:
+        """ Percentiles in milliseconds """
+
+        def ms(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        return {
+            "count": self.histogram.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "p50": ms(self.histogram.percentile(50)),
+            "p95": ms(self.histogram.percentile(95)),
+            "p99": ms(self.histogram.percentile(99)),
+            "max": ms(self.histogram.max if self.histogram.count else None),
+        }
+
+
+class DriverMetrics:
+
+    """
+        Durations of the calls to the telescope driver, by call name.
+        They are recorded by the polling loop only, so there is no lock: a
+        reader may see a sample counted in one field and not yet in another
+    """
+
+    def __init__(self, driver: str) -> None:
+        self._driver = driver
+        self._calls: dict[str, CallMetrics] = {}
+        self._logged_at = monotonic()
+
+    def record(self, name: str, seconds: float, error: Optional[BaseException] = None):
+        call = self._calls.get(name)
+        if call is None:
+            call = self._calls[name] = CallMetrics()
+        call.histogram.record(seconds)
+        if error is not None:
+            call.errors += 1
+            if isinstance(error, TIMEOUTS):
+                call.timeouts += 1
+
+    def summary(self) -> dict[str, dict]:
+        return {name: call.summary() for name, call in list(self._calls.items())}
+
+    def log_summary(self, interval: float):
+        """ Log the summary at most once every interval seconds, never with 0 """
+
+        if interval <= 0 or monotonic() - self._logged_at < interval:
+            return
+        self._logged_at = monotonic()
+        for name, summary in self.summary().items():
+            logger.info(
+                f"{self._driver} {name}: {summary['count']} calls, {summary['errors']} errors, "
+                f"{summary['timeouts']} timeouts, p50 {summary['p50']} ms, p95 {summary['p95']} ms, "
+                f"p99 {summary['p99']} ms, max {summary['max']} ms"
+            )
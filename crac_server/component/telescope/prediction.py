@@ -0,0 +1,38 @@
+from crac_protobuf.telescope_pb2 import AltazimutalCoords  # type: ignore
+from crac_server.component.telescope.history import Rates
+from crac_server.component.telescope.sectors import POSITION_TOLERANCE, angular_distance
+from typing import Optional
+
+
+def _toward(position: float, shift: float, distance: Optional[float]) -> float:
+    """ position moved by shift, stopping at distance if it goes that way """
+
+    if distance is not None and shift * distance > 0 and abs(shift) > abs(distance):
+        return position + distance
+    return position + shift
+
+
+def project(aa_coords: AltazimutalCoords, velocity: Optional[Rates], horizon: float, target: Optional[AltazimutalCoords] = None) -> AltazimutalCoords:
+
+    """
+        Where the telescope will be in horizon seconds going on at velocity.
+        A known slew target stops the projection, so it never goes past the
+        end of a park or a flat.
+        Without a velocity the telescope is taken as still
+    """
+
+    if velocity is None or horizon <= 0:
+        return aa_coords
+    alt_distance = az_distance = None
+    if target is not None:
+        alt_distance = target.alt - aa_coords.alt
+        # the short way around, in -180..180
+        az_distance = (target.az - aa_coords.az + 180) % 360 - 180
+    return AltazimutalCoords(
+        alt=max(-90.0, min(90.0, _toward(aa_coords.alt, velocity.alt * horizon, alt_distance))),
+        az=_toward(aa_coords.az, velocity.az * horizon, az_distance) % 360,
+    )
+
+
+def reached(aa_coords: AltazimutalCoords, target: AltazimutalCoords) -> bool:
+    return abs(aa_coords.alt - target.alt) <= POSITION_TOLERANCE and angular_distance(aa_coords.az, target.az) <= POSITION_TOLERANCE
@@ -0,0 +1,110 @@
+import logging
+import random
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ReconnectPolicy:
+
+    """
+        When to try to connect again to the mount server.
+        The failed attempts are spaced by an exponential backoff with jitter,
+        after failure_threshold failures in a row the circuit opens and no attempt
+        is made for open_timeout seconds, then a single probe decides whether
+        to close it again or to keep it open
+    """
+
+    def __init__(
+        self,
+        min_delay: float,
+        max_delay: float,
+        failure_threshold: int,
+        open_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        self.reconfigure(min_delay, max_delay, failure_threshold, open_timeout)
+        self._clock = clock
+        self._jitter = jitter
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._retry_at = 0.0
+        self._consecutive_failures = 0
+        self._failures = 0
+        self._recoveries = 0
+        self._circuit_opened = 0
+        self._last_error: Optional[str] = None
+
+    def reconfigure(self, min_delay: float, max_delay: float, failure_threshold: int, open_timeout: float):
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._failure_threshold = failure_threshold
+        self._open_timeout = open_timeout
+
+    @property
+    def state(self) -> BreakerState:
+        return self._state
+
+    def wait_time(self) -> float:
+
+        """ Seconds to wait before the next attempt, 0 if it can be done now """
+
+        if self._state is BreakerState.OPEN:
+            remaining = self._opened_at + self._open_timeout - self._clock()
+            if remaining > 0:
+                return remaining
+            logger.info("Telescope circuit half open, probing the connection")
+            self._state = BreakerState.HALF_OPEN
+            return 0
+        # a poll woken early by a command still waits for the backoff
+        return max(0.0, self._retry_at - self._clock())
+
+    def success(self):
+
+        """ Register a successful attempt, closing the circuit if it follows failures """
+
+        if self._state is BreakerState.CLOSED and not self._consecutive_failures:
+            return
+        logger.info(f"Telescope connection restored after {self._consecutive_failures} failures")
+        self._state = BreakerState.CLOSED
+        self._consecutive_failures = 0
+        self._recoveries += 1
+
+    def failure(self, error: Optional[str] = None) -> float:
+
+        """ Register a failed attempt and return the seconds to wait before the next one """
+
+        self._consecutive_failures += 1
+        self._failures += 1
+        self._last_error = error
+        if self._state is BreakerState.HALF_OPEN or self._consecutive_failures >= self._failure_threshold:
+            if self._state is not BreakerState.OPEN:
+                logger.warning(f"Telescope circuit open for {self._open_timeout} seconds")
+                self._circuit_opened += 1
+            self._state = BreakerState.OPEN
+            self._opened_at = self._clock()
+            return self._open_timeout
+        ceiling = min(self._max_delay, self._min_delay * 2 ** (self._consecutive_failures - 1))
+        delay = self._jitter(ceiling / 2, ceiling)
+        self._retry_at = self._clock() + delay
+        return delay
+
+    def health(self) -> dict[str, str]:
+        return {
+            "state": self._state.value,
+            "consecutive_failures": str(self._consecutive_failures),
+            "failures": str(self._failures),
+            "recoveries": str(self._recoveries),
+            "circuit_opened": str(self._circuit_opened),
+            "last_error": self._last_error or "",
+        }
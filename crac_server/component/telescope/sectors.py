@@ -0,0 +1,102 @@
+from bisect import bisect_right
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,  # type: ignore
+    TelescopeStatus,  # type: ignore
+)
+from crac_server.settings import Settings
+from typing import Optional
+
+
+POSITION_TOLERANCE = 2
+
+
+def angular_distance(a: float, b: float) -> float:
+    """ Distance between two azimuths, across 0/360 too """
+
+    distance = abs(a - b) % 360
+    return min(distance, 360 - distance)
+
+
+def _in_arc(angle: float, start: float, end: float) -> bool:
+    """ angle within the clockwise arc [start, end) """
+
+    return (angle - start) % 360 < (end - start) % 360
+
+
+def _split(start: float, end: float, point: float) -> float:
+    """
+        Where the clockwise arc [start, end) changes status: at point if it is
+        inside, otherwise the whole arc takes the status of the side of point
+        it lies on
+    """
+
+    if _in_arc(point, start, end):
+        return point
+    middle = start + (end - start) % 360 / 2
+    return start if _in_arc(middle, point, point + 180) else end
+
+
+class AzimuthSectors:
+
+    """
+        The azimuth sectors of config.ini [azimut] compiled into a sorted table of
+        sector starts, so a status is found with one bisect.
+        azNE, azSE, azSW and azNW go clockwise and may cross 0/360: north splits
+        the arc azNW -> azNE, south the arc azSE -> azSW.
+        Every sector includes its start and excludes its end
+    """
+
+    def __init__(self, az_ne: float, az_se: float, az_sw: float, az_nw: float) -> None:
+        sectors = [
+            (_split(az_nw, az_ne, 0), TelescopeStatus.NORTHEAST),
+            (az_ne, TelescopeStatus.EAST),
+            (az_se, TelescopeStatus.SOUTHEAST),
+            (_split(az_se, az_sw, 180), TelescopeStatus.SOUTHWEST),
+            (az_sw, TelescopeStatus.WEST),
+            (az_nw, TelescopeStatus.NORTHWEST),
+        ]
+        table = {}
+        for index, (start, status) in enumerate(sectors):
+            end = sectors[(index + 1) % len(sectors)][0]
+            if start % 360 != end % 360:
+                table[start % 360] = status
+        self._starts = sorted(table)
+        self._statuses = [table[start] for start in self._starts]
+
+    def status(self, az: float) -> TelescopeStatus:
+        # before the first start the last sector continues across 360
+        return self._statuses[bisect_right(self._starts, az % 360) - 1]
+
+
+class StatusClassifier:
+
+    """ TelescopeStatus of a position, compiled once for every configuration """
+
+    def __init__(self, settings: Settings) -> None:
+        telescope = settings.telescope
+        azimut = settings.azimut
+        self._park = (telescope.park_alt, telescope.park_az)
+        self._flat = (telescope.flat_alt, telescope.flat_az)
+        self._max_secure_alt = telescope.max_secure_alt
+        self._sectors = AzimuthSectors(azimut.az_ne, azimut.az_se, azimut.az_sw, azimut.az_nw)
+
+    def is_parked(self, aa_coords: AltazimutalCoords) -> bool:
+        return self.__near(aa_coords, self._park)
+
+    def is_flat(self, aa_coords: AltazimutalCoords) -> bool:
+        return self.__near(aa_coords, self._flat)
+
+    def classify(self, aa_coords: AltazimutalCoords, parked: Optional[bool] = None) -> TelescopeStatus:
+        """ parked is the park state told by the mount, if it has one """
+
+        if self.is_parked(aa_coords) if parked is None else parked:
+            return TelescopeStatus.PARKED
+        elif self.is_flat(aa_coords):
+            return TelescopeStatus.FLATTER
+        elif aa_coords.alt <= self._max_secure_alt:
+            return TelescopeStatus.SECURE
+        return self._sectors.status(aa_coords.az)
+
+    def __near(self, aa_coords: AltazimutalCoords, position: tuple) -> bool:
+        alt, az = position
+        return abs(aa_coords.alt - alt) <= POSITION_TOLERANCE and angular_distance(aa_coords.az, az) <= POSITION_TOLERANCE
@@ -3,9 +3,7 @@ from crac_protobuf.telescope_pb2 import (
     AltazimutalCoords,
     TelescopeSpeed,
 )
-from crac_server import config
 from crac_server.component.telescope.telescope import Telescope as TelescopeBase
-from crac_server.config import Config
 from datetime import datetime
 import logging
 import os
@@ -19,10 +17,7 @@ class Telescope(TelescopeBase):
         super().__init__()
     
     def sync(self, started_at: datetime):
-        aa_coords = AltazimutalCoords(
-            alt=Config.getFloat("park_alt", "telescope"),
-            az=Config.getFloat("park_az", "telescope")
-        )
+        aa_coords = self._park_coordinate()
         eq_coords = self._calculate_telescope_position(
             aa_coords=aa_coords, 
             started_at=started_at, 
@@ -58,19 +53,13 @@ class Telescope(TelescopeBase):
 
     def park(self, speed: TelescopeSpeed):
         self._move(
-            aa_coords=AltazimutalCoords(
-                alt=config.Config.getFloat("park_alt", "telescope"),
-                az=config.Config.getFloat("park_az", "telescope")
-            ),
+            aa_coords=self._park_coordinate(),
             speed=speed
         )
 
     def flat(self, speed: TelescopeSpeed):
         self._move(
-            aa_coords=AltazimutalCoords(
-                alt=config.Config.getFloat("flat_alt", "telescope"),
-                az=config.Config.getFloat("flat_az", "telescope")
-            ),
+            aa_coords=self._flat_coordinate,
             speed=speed
         )
 
@@ -0,0 +1,25 @@
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,  # type: ignore
+    EquatorialCoords,  # type: ignore
+    TelescopeSpeed,  # type: ignore
+    TelescopeStatus,  # type: ignore
+)
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+class TelescopeState(NamedTuple):
+
+    """
+        One poll of the telescope. The polling loop publishes a new state with a
+        single reference swap, so a reader taking TELESCOPE.state once sees
+        polling, status, coordinates and speed of the same sample without any lock
+    """
+
+    status: TelescopeStatus
+    eq_coords: Optional[EquatorialCoords]
+    aa_coords: Optional[AltazimutalCoords]
+    speed: TelescopeSpeed
+    sampled_at: datetime  # timezone aware, UTC
+    sequence: int
+    polling: bool
@@ -1,14 +1,9 @@
+import asyncio
+import functools
 import logging
 import socket
 from abc import ABC, abstractmethod
-from astropy import units as u
-from astropy.coordinates import (
-    EarthLocation,
-    AltAz,
-    SkyCoord
-)
-from astropy.time import Time
-from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from crac_protobuf.telescope_pb2 import (
     TelescopeStatus,  # type: ignore
     AltazimutalCoords,  # type: ignore
@@ -16,24 +11,93 @@ from crac_protobuf.telescope_pb2 import (
     TelescopeSpeed,  # type: ignore
 )
 from crac_server import config
-from datetime import datetime
-from threading import Thread
-from time import sleep
+from crac_server.component.telescope.analytic import AnalyticTransformer
+from crac_server.component.telescope.connection import TelescopeConnection
+from crac_server.component.telescope.history import PoseHistory
+from crac_server.component.telescope.jobs import Job, JobPriority, JobQueue
+from crac_server.component.telescope.latency import DriverMetrics
+from crac_server.component.telescope.coordinates import CoordinatesTransformer
+from crac_server.component.telescope.prediction import project, reached
+from crac_server.component.telescope.reconnect import BreakerState, ReconnectPolicy
+from crac_server.component.telescope.sectors import StatusClassifier
+from crac_server.component.telescope.state import TelescopeState
+from crac_server.settings import GeographySettings, Settings
+from datetime import datetime, timezone
+from itertools import count
+from threading import Event, Thread, local
+from time import perf_counter
+from typing import Optional
 
 
 logger = logging.getLogger(__name__)
 
 
+# degrees per second: the sidereal rate is at most 0.0042 far from the zenith
+STEADY_RATE = 0.01
+
+# driver calls timed in every driver
+TIMED_CALLS = ("retrieve", "sync", "park", "flat", "set_speed")
+
+
+# timed calls running in each thread: a call made by another one, as park calling set_speed, is not timed again
+_timing = local()
+
+
+def _timed(name: str, method):
+    @functools.wraps(method)
+    def timed(self, *args, **kwargs):
+        if getattr(_timing, "active", False):
+            return method(self, *args, **kwargs)
+        _timing.active = True
+        error = None
+        start = perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _timing.active = False
+            self._metrics.record(name, perf_counter() - start, error)
+    return timed
+
+
 class Telescope(ABC):
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in TIMED_CALLS:
+            if name in cls.__dict__:
+                setattr(cls, name, _timed(name, cls.__dict__[name]))
+
     def __init__(self, hostname: str = None, port: int = None) -> None:  # type: ignore
         self._hostname = hostname
         self._port = port
         self._polling = False
-        self._jobs = deque()
-        self._has_tracking_off_capability = config.Config.getBoolean("tracking_off", "telescope")
-        self._connection_retry = 0
-        self._flat_coordinate = AltazimutalCoords(alt=config.Config.getFloat("flat_alt", "telescope"), az=config.Config.getFloat("flat_az", "telescope"))
+        self._wake = Event()
+        self._wake_task: Optional[asyncio.Event] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telescope")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._jobs = JobQueue()
+        self._settings = config.Config.settings()
+        self._metrics = DriverMetrics(self._settings.telescope.driver)
+        self._has_tracking_off_capability = self._settings.telescope.tracking_off
+        self._reconnect = ReconnectPolicy(
+            min_delay=self._settings.telescope.reconnect_min_delay,
+            max_delay=self._settings.telescope.reconnect_max_delay,
+            failure_threshold=self._settings.telescope.circuit_breaker_failures,
+            open_timeout=self._settings.telescope.circuit_breaker_timeout,
+        )
+        self._flat_coordinate = AltazimutalCoords(alt=self._settings.telescope.flat_alt, az=self._settings.telescope.flat_az)
+        self._coordinates = CoordinatesTransformer(self._settings.geography)
+        self._poll_coordinates = self.__poll_transformer(self._settings)
+        self._classifier = StatusClassifier(self._settings)
+        self._poll_interval = self._settings.telescope.polling_interval
+        self._connection = self._build_connection()
+        self._sequence = count()
+        self._history = PoseHistory(self._settings.telescope.history_size)
+        self._generation = 0
         self._reset()
 
     @abstractmethod
@@ -62,30 +126,103 @@ class Telescope(ABC):
     def polling_start(self):
         if not self._polling:
             self._polling = True
-            self.t = Thread(target=self.__read)
+            self._publish()
+            self._wake.clear()
+            # the shutdown of a previous polling, still queued, must not touch this one
+            generation = self._generation = self._generation + 1
+            if self._settings.telescope.polling_mode == "asyncio":
+                try:
+                    self._loop = asyncio.get_running_loop()
+                    self._wake_task = asyncio.Event()
+                    self._task = self._loop.create_task(self.__poll(generation))
+                    return
+                except RuntimeError:
+                    logger.warning("No event loop running, polling the telescope in a thread")
+            self.t = Thread(target=self.__read, args=(generation,))
             self.t.start()
     
     def polling_end(self):
         if self._polling:
             self._polling = False
-            self.t.join()
+            self._publish()
+            self._wake.set()
+            if self._task:
+                # the loop task ends without waiting here, the status is reset at once
+                self._loop.call_soon_threadsafe(self._task.cancel)  # type: ignore
+                self._task = None
+                self._reset()
+                # the shutdown may be skipped by a new polling: no command left for it
+                self._jobs.cancel_all()
+            else:
+                self.t.join()
     
-    def queue_sync(self, started_at: datetime):
-        self._jobs.append({"action": self.sync, "started_at": started_at})
+    # The queue_* futures are done when the job is worked, await them with asyncio.wrap_future
+
+    def queue_sync(self, started_at: datetime) -> Future:
+        return self.__enqueue("sync", self.sync, JobPriority.SYNC, started_at=started_at)
     
-    def queue_set_speed(self, speed: TelescopeSpeed):
+    def queue_set_speed(self, speed: TelescopeSpeed) -> Future:
         if speed is TelescopeSpeed.SPEED_NOT_TRACKING and not self.has_tracking_off_capability:
             speed = TelescopeSpeed.SPEED_TRACKING
-        self._jobs.append({"action": self.set_speed, "speed": speed})
+        return self.__enqueue("set_speed", self.set_speed, JobPriority.SPEED, speed=speed)
     
-    def queue_park(self):
+    def queue_park(self) -> Future:
         speed = TelescopeSpeed.SPEED_NOT_TRACKING if self.has_tracking_off_capability else TelescopeSpeed.SPEED_TRACKING
-        self._jobs.append({"action": self.park, "speed": speed})
+        return self.__enqueue("park", self.park, JobPriority.SAFETY, supersedes=("flat", "set_speed"), speed=speed)
 
-    def queue_flat(self):
+    def queue_flat(self) -> Future:
         speed = TelescopeSpeed.SPEED_NOT_TRACKING if self.has_tracking_off_capability else TelescopeSpeed.SPEED_TRACKING
-        self._jobs.append({"action": self.flat, "speed": speed})
+        return self.__enqueue("flat", self.flat, JobPriority.MOVE, speed=speed)
+
+    def __enqueue(self, key: str, action, priority: JobPriority, supersedes: tuple = (), **kwargs) -> Future:
+        future = self._jobs.put(key, action, priority, supersedes, **kwargs)
+        # a slow polling interval must not delay the command
+        self._wake.set()
+        if self._task:
+            self._loop.call_soon_threadsafe(self._wake_task.set)  # type: ignore
+        return future
     
+    def warm_up(self):
+        """ The first transforms load the astropy tables: do them before polling """
+
+        now = datetime.utcnow()
+        aa_coords = self._coordinates.radec2altaz(EquatorialCoords(ra=0, dec=0), now)
+        self._coordinates.altaz2radec(aa_coords, now)
+        self._poll_coordinates.radec2altaz(EquatorialCoords(ra=0, dec=0), now)
+
+    def reconfigure(self, settings: Settings):
+
+        """ Swap the settings used by the polling loop with the reloaded ones """
+
+        telescope = settings.telescope
+        current = self._settings.telescope
+        if (telescope.driver, telescope.hostname, telescope.port) != (current.driver, current.hostname, current.port):
+            logger.warning("Telescope driver, hostname or port changed: restart the server to apply them")
+        self._flat_coordinate = AltazimutalCoords(alt=telescope.flat_alt, az=telescope.flat_az)
+        self._has_tracking_off_capability = telescope.tracking_off
+        if not self.__same_geography(settings.geography, self._coordinates.geography):
+            self._coordinates = CoordinatesTransformer(settings.geography)
+        self._poll_coordinates = self.__poll_transformer(settings)
+        self._classifier = StatusClassifier(settings)
+        self._reconnect.reconfigure(
+            min_delay=telescope.reconnect_min_delay,
+            max_delay=telescope.reconnect_max_delay,
+            failure_threshold=telescope.circuit_breaker_failures,
+            open_timeout=telescope.circuit_breaker_timeout,
+        )
+        self._history.resize(telescope.history_size)
+        self._settings = settings
+
+    def __poll_transformer(self, settings: Settings):
+        """ The conversion used at every poll, sync and goto always use astropy """
+
+        if settings.telescope.poll_transform == "analytic":
+            return AnalyticTransformer(settings.geography)
+        return self._coordinates
+
+    def __same_geography(self, geography: GeographySettings, other: GeographySettings) -> bool:
+        return all(getattr(geography, key) == getattr(other, key) for key in GeographySettings.__slots__)
+
     @property
     def has_tracking_off_capability(self):
         return self._has_tracking_off_capability
@@ -94,127 +231,295 @@ class Telescope(ABC):
     def polling(self):
         return self._polling
 
+    @property
+    def state(self) -> TelescopeState:
+        """ The last published sample, take it once per request """
+
+        return self._state
+
+    @property
+    def history(self) -> PoseHistory:
+        """ The polled positions of the current connection """
+
+        return self._history
+
+    @property
+    def status(self) -> TelescopeStatus:
+        return self._state.status
+
+    @property
+    def eq_coords(self) -> Optional[EquatorialCoords]:
+        return self._state.eq_coords
+
+    @property
+    def aa_coords(self) -> Optional[AltazimutalCoords]:
+        return self._state.aa_coords
+
+    @property
+    def speed(self) -> TelescopeSpeed:
+        return self._state.speed
+
+    @property
+    def poll_interval(self) -> float:
+        """ Seconds waited after the last poll """
+
+        return self._poll_interval
+
+    @property
+    def metrics(self) -> DriverMetrics:
+        """ Durations of the driver calls, transform is the equatorial to horizontal conversion of a poll """
+
+        return self._metrics
+
+    @property
+    def connection_health(self) -> dict[str, str]:
+        """ Counters of the connection to the mount server """
+
+        health = self._reconnect.health()
+        health["connections"] = str(self._connection.connections if self._connection else 0)
+        return health
+
+    def predict(self, state: TelescopeState, horizon: float) -> Optional[TelescopeState]:
+
+        """
+            state moved to where the telescope is expected in horizon seconds,
+            from the velocity of the last polls and the target of the running
+            park or flat. The states without a position are returned as they are.
+            None for a slew going nobody knows where: no velocity and no target
+            yet, or no prediction asked
+        """
+
+        if state.aa_coords is None or state.status in (
+            TelescopeStatus.PARKED,
+            TelescopeStatus.LOST,
+            TelescopeStatus.ERROR,
+            TelescopeStatus.DISCONNECTED,
+        ):
+            return state
+        velocity = self._history.velocity()
+        target = self._slew_target
+        if state.speed == TelescopeSpeed.SPEED_SLEWING:
+            if horizon <= 0 or (velocity is None and target is None):
+                return None
+            if velocity is None:
+                # the first polls of a park or flat: aim at its end
+                return state._replace(aa_coords=target, status=self._classifier.classify(target))
+        aa_coords = project(state.aa_coords, velocity, horizon, target)
+        return state._replace(aa_coords=aa_coords, status=self._classifier.classify(aa_coords))
+
     def is_below_curtains_area(self, alt: float) -> bool:
-        return alt <= config.Config.getFloat("max_secure_alt", "telescope")
+        return alt <= self._settings.telescope.max_secure_alt
 
     def is_above_curtains_area(self, alt: float, max_est: int, max_west: int) -> bool:
         return alt >= max_est and alt >= max_west
 
-    def is_within_curtains_area(self) -> bool:
-        return self.status in (
+    def is_within_curtains_area(self, status: Optional[TelescopeStatus] = None) -> bool:
+        status = self.status if status is None else status
+        return status in (
             TelescopeStatus.EAST,
             TelescopeStatus.WEST
         )
 
-    def __open_connection(self) -> bool:
-        """ Connect the server to the Telescope """
+    def _build_connection(self) -> Optional[TelescopeConnection]:
+        """ The socket to the mount server, None for the drivers not speaking raw TCP """
 
         if not self._hostname or not self._port:
-            return True 
+            return None
+        return TelescopeConnection(self._hostname, self._port)
+
+    @property
+    def s(self) -> socket.socket:
+        return self._connection.sock  # type: ignore
+
+    def __open_connection(self) -> bool:
+        """ Connect the server to the Telescope, reusing the socket of the previous poll """
+
+        if not self._connection:
+            return True
         try:
-            #self.s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.s = socket.create_connection((self._hostname, self._port), timeout=2)
+            self._connection.ensure()
             return True
         except (ConnectionRefusedError, socket.error, socket.herror, TimeoutError) as e: 
-            logger.error(f"Connection error: {e}", exc_info=1)
+            logger.error(f"Connection error: {e}")
+            self._connection_error = str(e)
             return False
-        except:
+        except Exception as e:
             logger.error("Generic connection error", exc_info=1)
+            self._connection_error = repr(e)
             return False
 
     def __disconnect(self):
         """ Disconnect the server from the Telescope"""
-        if not self._hostname or not self._port:
+        if not self._connection:
             return
 
-        if self.status is not TelescopeStatus.LOST:  # type: ignore
-            self.s.close()
+        self._connection.close()
+
+    def __read(self, generation: int):
+        """ Polling thread, the default driver loop """
+
+        while self._polling:
+            self._poll_interval = self._poll_once()
+            self._wake.wait(self._poll_interval)
+            self._wake.clear()
+        else:
+            self.__shutdown(generation)
+
+    async def __poll(self, generation: int):
+        """
+            Driver loop running as a task of the gRPC event loop.
+            The driver calls still block, so they run one at a time on the
+            telescope executor while the loop only awaits them
+        """
 
-    def __read(self):
+        loop = asyncio.get_running_loop()
+        try:
+            # wait_for may swallow the cancel of polling_end: a new polling is not this loop's
+            while self._polling and generation == self._generation:
+                self._poll_interval = await loop.run_in_executor(self._executor, self._poll_once)
+                try:
+                    await asyncio.wait_for(self._wake_task.wait(), self._poll_interval)  # type: ignore
+                except asyncio.TimeoutError:
+                    pass
+                self._wake_task.clear()  # type: ignore
+        except asyncio.CancelledError:
+            raise
+        except BaseException:
+            logger.error("Telescope polling loop stopped", exc_info=1)
+            raise
+        finally:
+            if generation == self._generation:
+                # crashed, or cancelled by polling_end: polling_start can start it again
+                self._polling = False
+                self._task = None
+            # queued after the poll still running, if any
+            self._executor.submit(self.__shutdown, generation)
+
+    def _poll_once(self) -> float:
         """ 
             Polling the Telescope for coordinate and speed
             If there are some actions to do like move it or sync it
-            then they will be dequeued and worked here
+            then they will be dequeued and worked here.
+            Return the seconds to wait before the next poll
         """
 
-        while self._polling:
-            if not self.__open_connection():
-                self.status = TelescopeStatus.LOST
-                continue
-
-            try:
-                if len(self._jobs) > 0:
-                    logger.debug(f"there are {len(self._jobs)} jobs: {self._jobs}")
-                    job = self._jobs.popleft()
-                    args = {key: val for key ,val in job.items() if key != "action"}
-                    job['action'](**args)
-
-                self.eq_coords, self.aa_coords, self.speed, self.status = self.retrieve()
-            except:
-                logger.error("Error in completing job", exc_info=1)
-                self.status = TelescopeStatus.ERROR
-                continue
-            finally:
-                self.__disconnect()
-                sleep(config.Config.getFloat("polling_interval", "telescope"))
-        else:
-            self._reset()
+        wait_time = self._reconnect.wait_time()
+        if wait_time > 0:
+            if self._reconnect.state is BreakerState.OPEN:
+                # no attempt for wait_time seconds: the callers must not wait that long
+                self._jobs.fail_all(ConnectionError(f"Telescope unreachable, next attempt in {wait_time:.0f} seconds"))
+            return wait_time
+        if not self.__open_connection():
+            self._publish(status=TelescopeStatus.LOST)
+            return self._reconnect.failure(self._connection_error)
+        self._reconnect.success()
+
+        try:
+            for _ in range(self._settings.telescope.jobs_per_poll):
+                job = self._jobs.get()
+                if job is None:
+                    break
+                logger.debug(f"working {job}, {len(self._jobs)} jobs left")
+                self.__work(job)
+                self._slew_target = self.__target_of(job.key) or self._slew_target
+                if job.priority < JobPriority.SPEED:
+                    # the mount is moving: read where it is before the next command
+                    break
+
+            eq_coords, aa_coords, speed, status = self.retrieve()
+            self._publish(status=status, eq_coords=eq_coords, aa_coords=aa_coords, speed=speed)
+            self._history.append(self._state)
+            if self._slew_target and aa_coords and reached(aa_coords, self._slew_target):
+                self._slew_target = None
+        except:
+            logger.error("Error in completing job", exc_info=1)
+            self._publish(status=TelescopeStatus.ERROR)
+            # the stream may be left in the middle of an answer
             self.__disconnect()
+        self._metrics.log_summary(self._settings.telescope.metrics_log_interval)
+        return self._adapted_interval(self._state)
+
+    def _adapted_interval(self, state: TelescopeState) -> float:
+
+        """
+            Poll fast while the mount moves or commands wait, slow while it is
+            parked, in error or tracking steadily, polling_interval otherwise.
+            A lost connection waits for the reconnect policy instead
+        """
+
+        telescope = self._settings.telescope
+        if len(self._jobs) or self._slew_target or state.speed == TelescopeSpeed.SPEED_SLEWING:
+            return telescope.polling_interval_min
+        if state.status in (TelescopeStatus.PARKED, TelescopeStatus.ERROR):
+            return telescope.polling_interval_max
+        if state.speed in (TelescopeSpeed.SPEED_TRACKING, TelescopeSpeed.SPEED_NOT_TRACKING):
+            velocity = self._history.velocity()
+            if velocity and max(abs(velocity.alt), abs(velocity.az)) <= STEADY_RATE:
+                return telescope.polling_interval_max
+        return telescope.polling_interval
+
+    def __target_of(self, key: str) -> Optional[AltazimutalCoords]:
+        if key == "park":
+            return self._park_coordinate()
+        if key == "flat":
+            return self._flat_coordinate
+        return None
+
+    def __work(self, job: Job):
+        future = job.future
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(job.action(**job.kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+
+    def __shutdown(self, generation: int):
+        if generation != self._generation:
+            logger.debug("Telescope polling started again, previous shutdown skipped")
+            return
+        self._reset()
+        self._history.clear()
+        # no one works them any more, and a stale park or flat must not run at the next connection
+        self._jobs.cancel_all()
+        self.__disconnect()
 
     def _reset(self):
-        self.status = TelescopeStatus.DISCONNECTED
-        self.eq_coords: EquatorialCoords = None
-        self.aa_coords: AltazimutalCoords = None
-        self.speed: TelescopeSpeed = TelescopeSpeed.SPEED_ERROR
+        self._slew_target: Optional[AltazimutalCoords] = None
+        self._state = TelescopeState(
+            status=TelescopeStatus.DISCONNECTED,
+            eq_coords=None,
+            aa_coords=None,
+            speed=TelescopeSpeed.SPEED_ERROR,
+            sampled_at=datetime.now(timezone.utc),
+            sequence=next(self._sequence),
+            polling=self._polling,
+        )
+
+    def _publish(self, **changes):
+        """ Copy the current state with changes and swap it in, written by the polling loop and by polling_start and polling_end """
+
+        self._state = self._state._replace(sampled_at=datetime.now(timezone.utc), sequence=next(self._sequence), polling=self._polling, **changes)
 
     def _retrieve_aa_coords(self, eq_coords):
         if eq_coords:
-            aa_coords = self._radec2altaz(eq_coords, obstime=datetime.utcnow()) if eq_coords else None
+            start = perf_counter()
+            aa_coords = self._poll_coordinates.radec2altaz(eq_coords, obstime=datetime.utcnow())
+            self._metrics.record("transform", perf_counter() - start)
             return aa_coords
 
     def _retrieve_status(self, aa_coords: AltazimutalCoords) -> TelescopeStatus:
         if not self._polling:
             return TelescopeStatus.DISCONNECTED
-        elif self.__within_park_alt_range(aa_coords.alt) and self.__within_park_az_range(aa_coords.az):
-            return TelescopeStatus.PARKED
-        elif self.__within_flat_alt_range(aa_coords.alt) and self.__within_flat_az_range(aa_coords.az):
-            return TelescopeStatus.FLATTER
-        elif aa_coords.alt <= config.Config.getFloat("max_secure_alt", "telescope"):
-            return TelescopeStatus.SECURE
-        else:
-            if config.Config.getInt("azNE", "azimut") > aa_coords.az:
-                return TelescopeStatus.NORTHEAST
-            elif aa_coords.az > config.Config.getInt("azNW", "azimut"):
-                return TelescopeStatus.NORTHWEST
-            elif config.Config.getInt("azSW", "azimut") > aa_coords.az > 180:
-                return TelescopeStatus.SOUTHWEST
-            elif 180 >= aa_coords.az > config.Config.getInt("azSE", "azimut"):
-                return TelescopeStatus.SOUTHEAST
-            elif config.Config.getInt("azSW", "azimut") < aa_coords.az <= config.Config.getInt("azNW", "azimut"):
-                return TelescopeStatus.WEST
-            elif config.Config.getInt("azNE", "azimut") <= aa_coords.az <= config.Config.getInt("azSE", "azimut"):
-                return TelescopeStatus.EAST
-
-    def __within_flat_alt_range(self, alt: float):
-        return self.__within_range(alt, config.Config.getFloat("flat_alt", "telescope"))
-
-    def __within_park_alt_range(self, alt: float):
-        return self.__within_range(alt, config.Config.getFloat("park_alt", "telescope"))
-
-    def __within_flat_az_range(self, az: float):
-        return self.__within_range(az, config.Config.getFloat("flat_az", "telescope"))
-
-    def __within_park_az_range(self, az: float):
-        return self.__within_range(az, config.Config.getFloat("park_az", "telescope"))
-
-    def __within_range(self, coord: float, check: float):
-        return coord - 2 <= check <= coord + 2
-    
+        return self._classifier.classify(aa_coords)
+
+    def _park_coordinate(self) -> AltazimutalCoords:
+        telescope = self._settings.telescope
+        return AltazimutalCoords(alt=telescope.park_alt, az=telescope.park_az)
+
     def _calculate_eq_coords_of_park_position(self, started_at: datetime) -> EquatorialCoords:
-        aa_coords = AltazimutalCoords(
-            alt=config.Config.getFloat("park_alt", "telescope"), 
-            az=config.Config.getFloat("park_az", "telescope")
-        )
+        aa_coords = self._park_coordinate()
         logger.debug(f"This is the aa coordinate for park position: {aa_coords}")
         return self._calculate_telescope_position(
             aa_coords=aa_coords, 
@@ -242,37 +547,7 @@ class Telescope(ABC):
         return synced_eq_coords
 
     def _radec2altaz(self, eq_coords: EquatorialCoords, obstime: datetime, decimal_places: int = 0):
-        timestring = obstime.strftime(format="%Y-%m-%d %H:%M:%S")
-        observing_time = Time(timestring)
-        lat = config.Config.getValue("lat", "geography")
-        lon = config.Config.getValue("lon", "geography")
-        height = config.Config.getInt("height", "geography")
-        observing_location = EarthLocation(lat=lat, lon=lon, height=height*u.m)
-        aa = AltAz(location=observing_location, obstime=observing_time)
-        equinox = config.Config.getValue("equinox", "geography")
-        coord = SkyCoord(ra=str(eq_coords.ra)+"h", dec=str(eq_coords.dec)+"d", equinox=equinox, frame="fk5")
-        altaz_coords = coord.transform_to(aa)
-        alt = float(altaz_coords.alt / u.deg)
-        az = float(altaz_coords.az / u.deg)
-        if decimal_places > 0:
-            alt = round(alt, decimal_places)
-            az = round(az, decimal_places)
-        return AltazimutalCoords(alt=alt, az=az)
+        return self._coordinates.radec2altaz(eq_coords, obstime, decimal_places)
 
     def _altaz2radec(self, aa_coords: AltazimutalCoords, obstime: datetime, decimal_places: int = 0):
-        timestring = obstime.strftime(format="%Y-%m-%d %H:%M:%S")
-        time = Time(timestring)
-        lat = config.Config.getValue("lat", "geography")
-        lon = config.Config.getValue("lon", "geography")
-        height = config.Config.getInt("height", "geography")
-        equinox = config.Config.getValue("equinox", "geography")
-        observing_location = EarthLocation(lat=lat, lon=lon, height=height * u.m)  # type: ignore
-        aa = AltAz(location=observing_location, obstime=time)
-        alt_az = SkyCoord(alt=aa_coords.alt * u.deg, az=aa_coords.az * u.deg, frame=aa, equinox=equinox)  # type: ignore
-        ra_dec = alt_az.transform_to('fk5')
-        ra = float((ra_dec.ra / 15) / u.deg)  # type: ignore
-        dec = float(ra_dec.dec / u.deg)  # type: ignore
-        if decimal_places > 0:
-            ra = round(ra, decimal_places)
-            dec = round(dec, decimal_places)
-        return EquatorialCoords(ra=ra, dec=dec)
+        return self._coordinates.altaz2radec(aa_coords, obstime, decimal_places)
@@ -37,16 +37,16 @@ class Telescope(TelescopeBase):
         tr = ""
         if self.has_tracking_off_capability:
             tr = "1" if speed is TelescopeSpeed.SPEED_NOT_TRACKING else "0"
-        alt_deg = config.Config.getFloat("park_alt", "telescope")
-        az_deg = config.Config.getFloat("park_az", "telescope")
+        alt_deg = self._settings.telescope.park_alt
+        az_deg = self._settings.telescope.park_az
         self.__call(script=self.script_move_track, tr=tr, alt=alt_deg, az=az_deg)
 
     def flat(self, speed: TelescopeSpeed):
         tr = ""
         if self.has_tracking_off_capability:
             tr = "1" if speed is TelescopeSpeed.SPEED_NOT_TRACKING else "0"
-        alt_deg = config.Config.getFloat("flat_alt", "telescope")
-        az_deg = config.Config.getFloat("flat_az", "telescope")
+        alt_deg = self._settings.telescope.flat_alt
+        az_deg = self._settings.telescope.flat_az
         self.__call(script=self.script_move_track, tr=tr, alt=alt_deg, az=az_deg)
 
     def retrieve(self) -> tuple:
@@ -3,4 +3,13 @@ from crac_server.component.ups.ups import Ups
 from crac_server.config import Config
 
 
-UPS: Ups = importlib.import_module(f"crac_server.component.ups.{Config.getValue('driver', 'ups')}.ups").Ups(host=Config.getValue("hostname", "ups"), login=Config.getValue("login", "ups"), password=Config.getValue("password", "ups"), time_expired=Config.getInt("time_expired", "ups"))
+ups_settings = Config.settings().ups
+UPS: Ups = importlib.import_module(f"crac_server.component.ups.{ups_settings.driver}.ups").Ups(host=ups_settings.hostname, login=ups_settings.login, password=ups_settings.password, time_expired=ups_settings.time_expired)
+
+
+def _reconfigure(snapshot):
+    ups_settings = snapshot.settings.ups
+    UPS.reconfigure(host=ups_settings.hostname, login=ups_settings.login, password=ups_settings.password, time_expired=ups_settings.time_expired)
+
+
+Config.subscribe(_reconfigure)
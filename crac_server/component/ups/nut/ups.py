@@ -4,19 +4,16 @@ from nut2 import PyNUTClient
 class Ups(UpsBase):
     def __init__(self, host: str, login: str, password: str, time_expired: int) -> None:
         super().__init__(host, login, password, time_expired)
-        self.hostname = host  # Usa il nome corretto
-        self.login = login
-        self.password = password
-        self.time_expired = time_expired
 
     def _get_client(self):
         """Metodo helper per creare e autenticare un client fresco."""
+        parameters = self._parameters
         try:
             client = PyNUTClient(
-                self.hostname, # <-- Ora usa l'attributo che hai salvato!
-                login=self.login,
-                password=self.password,
-                timeout=self.time_expired
+                parameters.host,
+                login=parameters.login,
+                password=parameters.password,
+                timeout=parameters.time_expired
             )
             # Forza l'autenticazione/connessione
             client.list_ups() 
@@ -1,9 +1,27 @@
 from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+
+class UpsParameters(NamedTuple):
+    host: str
+    login: str
+    password: str
+    time_expired: int
 
 
 class Ups(ABC):
     def __init__(self, host: str, login: str, password: str, time_expired: int) -> None:
-        self.time_expired = time_expired
+        self._parameters = UpsParameters(host, login, password, time_expired)
+
+    def reconfigure(self, host: str, login: str, password: str, time_expired: int):
+
+        """ Replace all the connection parameters at once """
+
+        self._parameters = UpsParameters(host, login, password, time_expired)
+
+    @property
+    def time_expired(self) -> int:
+        return self._parameters.time_expired
 
     @abstractmethod
     def status_for(self, device: str) -> dict[str,str]:
@@ -2,12 +2,28 @@ from crac_server.component.weather.weather import Weather
 from crac_server.config import Config
 
 
+weather_settings = Config.settings().weather
 WEATHER = Weather(
-    url=Config.getValue("url", "weather"),
-    fallback_url=Config.getValue("fallback_url", "weather"),
-    time_format=Config.getValue("time_format", "weather"),
-    time_expired=Config.getInt("time_expired", "weather"),
-    retry_interval=Config.getInt("retry_interval", "weather"),
+    url=weather_settings.url,
+    fallback_url=weather_settings.fallback_url,
+    time_format=weather_settings.time_format,
+    time_expired=weather_settings.time_expired,
+    retry_interval=weather_settings.retry_interval,
 )
 
+
+
+def _reconfigure(snapshot):
+    weather_settings = snapshot.settings.weather
+    WEATHER.reconfigure(
+        url=weather_settings.url,
+        fallback_url=weather_settings.fallback_url,
+        time_format=weather_settings.time_format,
+        time_expired=weather_settings.time_expired,
+        retry_interval=weather_settings.retry_interval,
+    )
+
+
+Config.subscribe(_reconfigure)
+
 #WEATHER.temperature # for warm up at start
@@ -3,7 +3,7 @@ import html
 import logging
 from threading import (Thread, Lock)
 from time import sleep
-from typing import Union
+from typing import NamedTuple, Union
 from urllib.error import HTTPError, URLError
 import urllib.request
 import json
@@ -12,24 +12,34 @@ import json
 logger = logging.getLogger(__name__)
 
 
+class WeatherParameters(NamedTuple):
+    url: str
+    fallback_url: str
+    time_format: str
+    time_expired: int
+    retry_interval: int
+
+
 class Weather:
     def __init__(self, url: str, fallback_url: str, time_format: str, time_expired: int, retry_interval: int):
-        self._url = url
-        self._fallback_url = fallback_url
+        self._parameters = WeatherParameters(url, fallback_url, time_format, time_expired, retry_interval)
         self._json = {}
         self._updated_at : Union[datetime, None] = None
         self._last_attempt_at : Union[datetime, None] = None
-        self._time_format = time_format
-        self._time_expired = time_expired
-        self._retry_interval = retry_interval
+
+    def reconfigure(self, url: str, fallback_url: str, time_format: str, time_expired: int, retry_interval: int):
+
+        """ Replace all the parameters at once, the readers see either the old or the new ones """
+
+        self._parameters = WeatherParameters(url, fallback_url, time_format, time_expired, retry_interval)
 
     @property
     def url(self):
-        return self._url
+        return self._parameters.url
 
     @property
     def fallback_url(self):
-        return self._fallback_url
+        return self._parameters.fallback_url
 
     @property
     def updated_at(self):
@@ -37,7 +47,7 @@ class Weather:
 
     @updated_at.setter
     def updated_at(self, value: str):
-        self._updated_at = datetime.strptime(value, self._time_format)
+        self._updated_at = datetime.strptime(value, self._parameters.time_format)
 
     @property
     def last_attempt_at(self):
@@ -85,17 +95,17 @@ class Weather:
     
     @property
     def time_expired(self) -> int:
-        return self._time_expired
+        return self._parameters.time_expired
 
     def is_expired(self) -> bool:
-        return not self.updated_at or (datetime.now() - self.updated_at).seconds >= self._time_expired
+        return not self.updated_at or (datetime.now() - self.updated_at).seconds >= self._parameters.time_expired
     
     def is_retriable(self) -> bool:
-        return not self.last_attempt_at or (datetime.now() - self.last_attempt_at).seconds >= self._retry_interval
+        return not self.last_attempt_at or (datetime.now() - self.last_attempt_at).seconds >= self._parameters.retry_interval
     
     @property
     def is_unavailable(self) -> bool:
-        return self.updated_at != None and (datetime.now() - self.updated_at).seconds >= self._time_expired * 3
+        return self.updated_at != None and (datetime.now() - self.updated_at).seconds >= self._parameters.time_expired * 3
     
     def _retrieve_async(self):
         while True:
@@ -132,7 +142,7 @@ class Weather:
             except (HTTPError, URLError, TimeoutError) as error:
                 logger.error("url in error")
                 self.json, self.updated_at = self._retrieve_fallback_data()
-            if (datetime.now() - self.updated_at).seconds >= self._time_expired * 3:
+            if (datetime.now() - self.updated_at).seconds >= self._parameters.time_expired * 3:
                     self.last_attempt_at = datetime.now()
         
         sensor = self.json[name]
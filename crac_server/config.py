@@ -1,67 +1,198 @@
+import asyncio
 import configparser
+import logging
+import threading
 from distutils.util import strtobool
+from crac_server.settings import Settings
 from dotenv import load_dotenv
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
 import os
 
 
 load_dotenv()
 
 
+logger = logging.getLogger(__name__)
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.ini')
+
+
+class ConfigSnapshot:
+
+    """
+        Immutable in-memory view of config.ini
+
+        The file is read and interpolated once, the environment overrides
+        (SECTION_KEY) are resolved while loading, so the lookups never touch
+        the disk or the parser again.
+        The typed settings are validated here too: a bad value fails the load
+    """
+
+    __slots__ = ("_sections", "_version", "_path", "_settings")
+
+    def __init__(self, sections: Mapping[str, Mapping[str, str]], version: int, path: str):
+        self._sections = MappingProxyType({name: MappingProxyType(dict(values)) for name, values in sections.items()})
+        self._version = version
+        self._path = path
+        self._settings = Settings(self._sections)
+
+    @staticmethod
+    def load(path: str = CONFIG_PATH, version: int = 1) -> "ConfigSnapshot":
+        parser = configparser.ConfigParser()
+        if not parser.read(path):
+            raise FileNotFoundError(f"Configuration file not found: {path}")
+        sections = {}
+        for section_name in parser.sections():
+            values = {}
+            for key, value in parser[section_name].items():
+                env_value = ConfigSnapshot.environ_value(key, section_name)
+                values[key] = env_value if env_value else value
+            sections[section_name] = values
+        return ConfigSnapshot(sections, version, path)
+
+    @staticmethod
+    def environ_value(key: str, section: str) -> Optional[str]:
+        return os.environ.get(section.upper() + '_' + key.upper())
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def settings(self) -> Settings:
+        return self._settings
+
+    @property
+    def sections(self) -> Mapping[str, Mapping[str, str]]:
+        return self._sections
+
+    def section(self, name: str) -> Mapping[str, str]:
+        return self._sections[name]
+
+    def get(self, key: str, section: str) -> str:
+        try:
+            return self._sections[section][key.lower()]
+        except KeyError:
+            # keys not declared in config.ini can still be provided by the environment
+            env_value = ConfigSnapshot.environ_value(key, section)
+            if env_value is None:
+                raise
+            return env_value
+
+
+_snapshot = ConfigSnapshot.load()
+_listeners: list[Callable[[ConfigSnapshot], None]] = []
+_reload_lock = threading.Lock()
+
+
 class Config:
 
-    def __init__(self):
-        self.configparser = configparser.ConfigParser()
-        configpath = os.path.join(os.path.dirname(__file__), 'config.ini')
-        self.configparser.read(configpath)
+    @staticmethod
+    def snapshot() -> ConfigSnapshot:
+        return _snapshot
+
+    @staticmethod
+    def subscribe(listener: Callable[[ConfigSnapshot], None]):
+
+        """ Register a callback invoked with the new snapshot after every reload """
+
+        _listeners.append(listener)
+
+    @staticmethod
+    def unsubscribe(listener: Callable[[ConfigSnapshot], None]):
+        _listeners.remove(listener)
+
+    @staticmethod
+    def reload(path: Optional[str] = None) -> bool:
+
+        """
+            Read the configuration again and publish it as a new snapshot.
+            If the new file is not valid the current snapshot is kept
+        """
+
+        global _snapshot
+        with _reload_lock:
+            current = _snapshot
+            try:
+                snapshot = ConfigSnapshot.load(path or current.path, current.version + 1)
+            except Exception:
+                logger.error("Configuration not reloaded, keeping version %s", current.version, exc_info=1)
+                return False
+            if snapshot.sections == current.sections and snapshot.path == current.path:
+                logger.debug("Configuration unchanged, keeping version %s", current.version)
+                return False
+            _snapshot = snapshot
+            logger.info("Configuration reloaded, version %s", snapshot.version)
+            for listener in tuple(_listeners):
+                try:
+                    listener(snapshot)
+                except Exception:
+                    logger.error("Error notifying configuration reload to %s", listener, exc_info=1)
+            return True
+
+    @staticmethod
+    async def watch(interval: float):
+
+        """ Reload the configuration every time the file changes on disk """
+
+        def stat():
+            try:
+                result = os.stat(_snapshot.path)
+                return (result.st_mtime_ns, result.st_size)
+            except OSError:
+                return None
+
+        last_stat = stat()
+        while True:
+            await asyncio.sleep(interval)
+            current_stat = stat()
+            if current_stat is not None and current_stat != last_stat:
+                last_stat = current_stat
+                await asyncio.get_running_loop().run_in_executor(None, Config.reload)
+
+    @staticmethod
+    def settings() -> Settings:
+        return _snapshot.settings
 
     @staticmethod
     def getValue(key, section='automazione'):
-        config = Config()
-        env_value = Config.__check_environ__(key, section=section)
-        if env_value:
-            return env_value
-        return config.configparser[section][key]
+        return _snapshot.get(key, section)
 
     @staticmethod
     def getFloat(key, section='automazione'):
-        config = Config()
-        env_value = Config.__check_environ__(key, section=section)
-        if env_value:
-            return float(env_value)
-        env_value = config.configparser[section][key]
-        if env_value:
-            return config.configparser[section].getfloat(key)
+        value = _snapshot.get(key, section)
+        if value:
+            return float(value)
         return 0
 
     @staticmethod
     def getInt(key, section='automazione'):
-        config = Config()
-        env_value = Config.__check_environ__(key, section=section)
-        if env_value:
-            return int(env_value)
-        env_value = config.configparser[section][key]
-        if env_value:
-            return config.configparser[section].getint(key)
+        value = _snapshot.get(key, section)
+        if value:
+            return int(value)
         return 0
 
-    
     @staticmethod
     def getBoolean(key, section='automazione'):
-        config = Config()
-        env_value = Config.__check_environ__(key, section=section)
-        if env_value is not None:
-            return strtobool(env_value)
-        return config.configparser[section].getboolean(key)
+        try:
+            value = _snapshot.get(key, section)
+        except KeyError:
+            if section not in _snapshot.sections:
+                raise
+            return None
+        return bool(strtobool(value))
 
     @staticmethod
     def __check_environ__(key: str, section='automazione'):
-        env_key = section.upper() + '_' + key.upper()
-        env_value = os.environ.get(env_key)
-        return env_value
-    
+        return ConfigSnapshot.environ_value(key, section)
+
     @staticmethod
     def get_section(section_name: str):
-        config = Config()
-        section = config.configparser[section_name]
-        raw_list = {key: config.getValue(key, section_name) for key in section}
-        return {key: value for key, value in raw_list.items() if value}
+        section = _snapshot.section(section_name)
+        return {key: value for key, value in section.items() if value}
@@ -16,6 +16,7 @@ from crac_server.component.telescope import (
     TELESCOPE, 
     Telescope,
 )
+from crac_server.component.telescope.state import TelescopeState
 
 
 logger = logging.getLogger(__name__)
@@ -26,8 +27,9 @@ class TelescopeMediator:
         self.request = request
         self._action = request.action
         self._button = TELESCOPE
-        self._status = self.button.status
-        self._speed = self.button.speed
+        self._state = TELESCOPE.state
+        self._status = self._state.status
+        self._speed = self._state.speed
         self._connect_is_disabled = False
         self._sync_is_disabled = False
         self._park_is_disabled = False
@@ -42,6 +44,12 @@ class TelescopeMediator:
     def button(self) -> Telescope:
         return self._button
 
+    @property
+    def state(self) -> TelescopeState:
+        """ The telescope sample this request is answered with """
+
+        return self._state
+
     @property
     def status(self) -> TelescopeStatus:
         return self._status
@@ -129,8 +137,8 @@ class TelescopeConverter:
 
         return TelescopeResponse(
             status=mediator.status, 
-            aa_coords=mediator.button.aa_coords, 
-            eq_coords=mediator.button.eq_coords,
+            aa_coords=mediator.state.aa_coords, 
+            eq_coords=mediator.state.eq_coords,
             speed=mediator.speed, 
             buttons_gui=[
                 connection_button_gui,
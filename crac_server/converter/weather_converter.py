@@ -19,142 +19,150 @@ logger = logging.getLogger(__name__)
 
 class WeatherConverter:
     def convert(self, weather: Weather) -> WeatherResponse:
+        thresholds = Config.settings().thresholds
+        wind_speed = thresholds["wind_speed"]
+        wind_gust_speed = thresholds["wind_gust_speed"]
+        temperature = thresholds["temperature"]
+        humidity = thresholds["humidity"]
+        rain_rate = thresholds["rain_rate"]
+        barometer = thresholds["barometer"]
+        barometer_trend = thresholds["barometer_trend"]
         response = WeatherResponse(
             charts=(
                 build_chart(
                     value=weather.wind_speed[0],
                     title="Vento",
                     urn="weather.chart.wind",
-                    min=Config.getInt("lower_bound", "wind_speed"),
-                    max=Config.getInt("upper_bound", "wind_speed"),
+                    min=wind_speed.lower_bound,
+                    max=wind_speed.upper_bound,
                     unit_of_measurement=weather.wind_speed[1],
                     range_normal=({
-                        "upper_bound": Config.getInt("warning", "wind_speed"),
-                        "lower_bound": Config.getInt("lower_bound", "wind_speed"),
+                        "upper_bound": wind_speed.warning,
+                        "lower_bound": wind_speed.lower_bound,
                     },),
                     range_warn=({
-                        "upper_bound": Config.getInt("error", "wind_speed"),
-                        "lower_bound": Config.getInt("warning", "wind_speed"),
+                        "upper_bound": wind_speed.error,
+                        "lower_bound": wind_speed.warning,
                     },),
                     range_danger=({
-                        "upper_bound": Config.getInt("upper_bound", "wind_speed"),
-                        "lower_bound": Config.getInt("error", "wind_speed"),
+                        "upper_bound": wind_speed.upper_bound,
+                        "lower_bound": wind_speed.error,
                     },)
                 ),
                 build_chart(
                     value=weather.wind_gust_speed[0],
                     title="Raffiche vento",
                     urn="weather.chart.wind_gust",
-                    min=Config.getInt("lower_bound", "wind_gust_speed"),
-                    max=Config.getInt("upper_bound", "wind_gust_speed"),
+                    min=wind_gust_speed.lower_bound,
+                    max=wind_gust_speed.upper_bound,
                     unit_of_measurement=weather.wind_gust_speed[1],
                     range_normal=({
-                        "upper_bound": Config.getInt("warning", "wind_gust_speed"),
-                        "lower_bound": Config.getInt("lower_bound", "wind_gust_speed"),
+                        "upper_bound": wind_gust_speed.warning,
+                        "lower_bound": wind_gust_speed.lower_bound,
                     },),
                     range_warn=({
-                        "upper_bound": Config.getInt("error", "wind_gust_speed"),
-                        "lower_bound": Config.getInt("warning", "wind_gust_speed"),
+                        "upper_bound": wind_gust_speed.error,
+                        "lower_bound": wind_gust_speed.warning,
                     },),
                     range_danger=({
-                        "upper_bound": Config.getInt("upper_bound", "wind_gust_speed"),
-                        "lower_bound": Config.getInt("error", "wind_gust_speed"),
+                        "upper_bound": wind_gust_speed.upper_bound,
+                        "lower_bound": wind_gust_speed.error,
                     },)
                 ),
                 build_chart(
                     value=weather.temperature[0],
                     title="Temperatura",
                     urn="weather.chart.temperature",
-                    min=Config.getInt("lower_bound", "temperature"),
-                    max=Config.getInt("upper_bound", "temperature"),
+                    min=temperature.lower_bound,
+                    max=temperature.upper_bound,
                     unit_of_measurement=weather.temperature[1],
                     range_normal=({
-                        "upper_bound": Config.getInt("warning", "temperature"),
-                        "lower_bound": Config.getInt("lower_bound", "temperature"),
+                        "upper_bound": temperature.warning,
+                        "lower_bound": temperature.lower_bound,
                     },),
                     range_warn=({
-                        "upper_bound": Config.getInt("upper_bound", "temperature"),
-                        "lower_bound": Config.getInt("warning", "temperature"),
+                        "upper_bound": temperature.upper_bound,
+                        "lower_bound": temperature.warning,
                     },),
                 ),
                 build_chart(
                     value=weather.humidity[0],
                     title="Umidità",
                     urn="weather.chart.humidity",
-                    min=Config.getInt("lower_bound", "humidity"),
-                    max=Config.getInt("upper_bound", "humidity"),
+                    min=humidity.lower_bound,
+                    max=humidity.upper_bound,
                     unit_of_measurement=weather.humidity[1],
                     range_normal=({
-                        "upper_bound": Config.getInt("warning", "humidity"),
-                        "lower_bound": Config.getInt("lower_bound", "humidity"),
+                        "upper_bound": humidity.warning,
+                        "lower_bound": humidity.lower_bound,
                     },),
                     range_warn=({
-                        "upper_bound": Config.getInt("error", "humidity"),
-                        "lower_bound": Config.getInt("warning", "humidity"),
+                        "upper_bound": humidity.error,
+                        "lower_bound": humidity.warning,
                     },),
                     range_danger=({
-                        "upper_bound": Config.getInt("upper_bound", "humidity"),
-                        "lower_bound": Config.getInt("error", "humidity"),
+                        "upper_bound": humidity.upper_bound,
+                        "lower_bound": humidity.error,
                     },)
                 ),
                 build_chart(
                     value=weather.rain_rate[0],
                     title="Pioggia",
                     urn="weather.chart.rain_rate",
-                    min=Config.getInt("lower_bound", "rain_rate"),
-                    max=Config.getInt("upper_bound", "rain_rate"),
+                    min=rain_rate.lower_bound,
+                    max=rain_rate.upper_bound,
                     unit_of_measurement=weather.rain_rate[1],
                     range_normal=({
-                        "upper_bound": Config.getInt("warning", "rain_rate"),
-                        "lower_bound": Config.getInt("lower_bound", "rain_rate"),
+                        "upper_bound": rain_rate.warning,
+                        "lower_bound": rain_rate.lower_bound,
                     },),
                     range_warn=({
-                        "upper_bound": Config.getInt("error", "rain_rate"),
-                        "lower_bound": Config.getInt("warning", "rain_rate"),
+                        "upper_bound": rain_rate.error,
+                        "lower_bound": rain_rate.warning,
                     },),
                     range_danger=({
-                        "upper_bound": Config.getInt("upper_bound", "rain_rate"),
-                        "lower_bound": Config.getInt("error", "rain_rate"),
+                        "upper_bound": rain_rate.upper_bound,
+                        "lower_bound": rain_rate.error,
                     },)
                 ),
                 build_chart(
                     value=weather.barometer[0],
                     title="Barometro",
                     urn="weather.chart.barometer",
-                    min=Config.getInt("lower_bound", "barometer"),
-                    max=Config.getInt("upper_bound", "barometer"),
+                    min=barometer.lower_bound,
+                    max=barometer.upper_bound,
                     unit_of_measurement=weather.barometer[1],
                     range_normal=({
-                        "upper_bound": Config.getFloat("upper_bound", "barometer"),
-                        "lower_bound": Config.getFloat("warning", "barometer")
+                        "upper_bound": barometer.upper_bound,
+                        "lower_bound": barometer.warning
                     },),
                     range_warn=({
-                        "upper_bound": Config.getInt("warning", "barometer"),
-                        "lower_bound": Config.getInt("error", "barometer"),
+                        "upper_bound": barometer.warning,
+                        "lower_bound": barometer.error,
                     },),
                     range_danger=({
-                        "upper_bound": Config.getInt("error", "barometer"),
-                        "lower_bound": Config.getInt("lower_bound", "barometer"),
+                        "upper_bound": barometer.error,
+                        "lower_bound": barometer.lower_bound,
                     },)
                 ),
                 build_chart(
                     value=weather.barometer_trend[0],
                     title="Tendenza Barometro",
                     urn="weather.chart.barometer_trend",
-                    min=Config.getInt("lower_bound", "barometer_trend"),
-                    max=Config.getInt("upper_bound", "barometer_trend"),
+                    min=barometer_trend.lower_bound,
+                    max=barometer_trend.upper_bound,
                     unit_of_measurement=weather.barometer_trend[1],
                     range_normal=({
-                        "upper_bound": Config.getFloat("upper_bound", "barometer_trend"),
-                        "lower_bound": Config.getFloat("warning", "barometer_trend")
+                        "upper_bound": barometer_trend.upper_bound,
+                        "lower_bound": barometer_trend.warning
                     },),
                     range_warn=({
-                        "upper_bound": Config.getInt("warning", "barometer_trend"),
-                        "lower_bound": Config.getInt("error", "barometer_trend"),
+                        "upper_bound": barometer_trend.warning,
+                        "lower_bound": barometer_trend.error,
                     },),
                     range_danger=({
-                        "upper_bound": Config.getInt("error", "barometer_trend"),
-                        "lower_bound": Config.getInt("lower_bound", "barometer_trend"),
+                        "upper_bound": barometer_trend.error,
+                        "lower_bound": barometer_trend.lower_bound,
                     },)
                 )
             ),
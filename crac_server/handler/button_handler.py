@@ -69,7 +69,7 @@ class ButtonFlatHandler(AbstractButtonHandler):
         if (
             mediator.type == ButtonType.FLAT_LIGHT and
             mediator.action is ButtonAction.TURN_ON and
-            TELESCOPE.status is TelescopeStatus.FLATTER
+            TELESCOPE.state.status is TelescopeStatus.FLATTER
         ):
             logger.debug("Track telescope on when Flat Panel is switched on")
             TELESCOPE.queue_set_speed(TelescopeSpeed.SPEED_TRACKING)
@@ -16,6 +16,7 @@ from crac_protobuf.chart_pb2 import (
 )
 from crac_server.component.roof import ROOF
 from crac_server.component.telescope import TELESCOPE
+from crac_server.component.telescope.state import TelescopeState
 from crac_server.component.weather import WEATHER
 from crac_server.config import Config
 from crac_server.converter.curtains_converter import CurtainsConverter, CurtainsMediator
@@ -24,7 +25,6 @@ from crac_server.handler.handler import AbstractHandler
 
 
 logger = logging.getLogger(__name__)
-block_on_unspecified = Config.getBoolean("block_on_unspecified", "weather")
 
 
 class AbstractCurtainsHandler(AbstractHandler):
@@ -61,7 +61,7 @@ class CurtainsWeatherHandler(AbstractCurtainsHandler):
             logger.info(f"Weather charts: {weather_response.charts}")
             logger.debug(f"In weather status {weather_response.status}")
             if weather_response.status == WeatherStatus.WEATHER_STATUS_DANGER or (
-                block_on_unspecified and 
+                Config.settings().weather.block_on_unspecified and 
                 weather_response.status == WeatherStatus.WEATHER_STATUS_UNSPECIFIED
                 ):
                 logger.info(f"In status danger or unspecified {weather_response.status}")
@@ -72,7 +72,7 @@ class CurtainsWeatherHandler(AbstractCurtainsHandler):
 
 class CurtainsTelescopeHandler(AbstractCurtainsHandler):
     def handle(self, mediator: CurtainsMediator) -> CurtainsResponse:    
-        if not TELESCOPE.polling:
+        if not TELESCOPE.state.polling:
             mediator.button_east.disable()
             mediator.button_west.disable()
             mediator.is_disabled = True
@@ -123,25 +123,33 @@ class CurtainsMoveHandler(AbstractCurtainsHandler):
     def handle(self, mediator: CurtainsMediator) -> CurtainsResponse:
 
         # Non eseguire movimenti se le tende sono disabilitate
-        if not mediator.is_disabled and TELESCOPE.speed in (TelescopeSpeed.SPEED_TRACKING, TelescopeSpeed.SPEED_NOT_TRACKING):
-            steps = self.__calculate_curtains_steps()
+        # curtains are slow: aim at where the telescope is going, even while it slews
+        state = TELESCOPE.predict(TELESCOPE.state, Config.settings().curtains.prediction_horizon)
+        if not mediator.is_disabled and state and state.speed in (
+            TelescopeSpeed.SPEED_TRACKING,
+            TelescopeSpeed.SPEED_NOT_TRACKING,
+            TelescopeSpeed.SPEED_SLEWING,
+        ):
+            steps = self.__calculate_curtains_steps(state)
             mediator.button_east.move(steps["east"])
             mediator.button_west.move(steps["west"])
 
         return super().handle(mediator)
     
-    def __calculate_curtains_steps(self):
+    def __calculate_curtains_steps(self, state: TelescopeState):
 
         """
             Change the height of the curtains
             to based on the given Coordinates
         """
 
-        aa_coords = TELESCOPE.aa_coords
-        status = TELESCOPE.status
+        settings = Config.settings()
+        curtains = settings.curtains
+        aa_coords = state.aa_coords
+        status = state.status
         steps = {}
         logger.debug("Telescope status %s", status)
-        n_step_corsa = Config.getInt('n_step_corsa', "encoder_step")
+        n_step_corsa = settings.encoder_step.n_step_corsa
         # TODO verify tele height:
         # if less than east_min_height e ovest_min_height
         if status in [TelescopeStatus.LOST, TelescopeStatus.ERROR]:
@@ -157,7 +165,7 @@ class CurtainsMoveHandler(AbstractCurtainsHandler):
             steps["east"] = 0
 
             #   else if higher to east_max_height e ovest_max_height
-        elif TELESCOPE.is_above_curtains_area(aa_coords.alt, Config.getInt("max_est", "tende"), Config.getInt("max_west", "tende")) or not TELESCOPE.is_within_curtains_area():
+        elif TELESCOPE.is_above_curtains_area(aa_coords.alt, curtains.max_est, curtains.max_west) or not TELESCOPE.is_within_curtains_area(status):
             #   move both curtains max open
             steps["west"] = n_step_corsa
             steps["east"] = n_step_corsa
@@ -168,8 +176,8 @@ class CurtainsMoveHandler(AbstractCurtainsHandler):
             #   move curtain east max open
             steps["east"] = n_step_corsa
             #   move curtain west to f(Alt telescope - x)
-            increm_w = (Config.getInt("max_west", "tende") - Config.getInt("park_west", "tende")) / n_step_corsa
-            steps["west"] = round((aa_coords.alt - Config.getInt("park_west", "tende"))/increm_w)
+            increm_w = (curtains.max_west - curtains.park_west) / n_step_corsa
+            steps["west"] = round((aa_coords.alt - curtains.park_west)/increm_w)
 
             #   else if higher to ovest_min_height and Az tele to est
         elif status == TelescopeStatus.EAST:
@@ -178,8 +186,8 @@ class CurtainsMoveHandler(AbstractCurtainsHandler):
             steps["west"] = n_step_corsa
             #   if inferior to est_min_height
             #   move curtain east to f(Alt tele - x)
-            increm_e = (Config.getInt("max_est", "tende") - Config.getInt("park_est", "tende")) / n_step_corsa
-            steps["east"] = round((aa_coords.alt - Config.getInt("park_est", "tende")) / increm_e)
+            increm_e = (curtains.max_est - curtains.park_est) / n_step_corsa
+            steps["east"] = round((aa_coords.alt - curtains.park_est) / increm_e)
 
         logger.debug("calculatd curtain steps %s", steps)
 
@@ -28,7 +28,6 @@ from crac_server.config import Config
 
 
 logger = logging.getLogger(__name__)
-block_on_unspecified = Config.getBoolean("block_on_unspecified", "weather")
 
 class AbstractButtonHandler(AbstractHandler):
     def handle(self, mediator: RoofMediator) -> RoofResponse:
@@ -45,7 +44,7 @@ class RoofWeatherHandler(AbstractButtonHandler):
             weather_response = weather_converter.convert(WEATHER)
             logger.debug(f"In weather status {weather_response.status}")
             if weather_response.status == WeatherStatus.WEATHER_STATUS_DANGER or (
-                block_on_unspecified and 
+                Config.settings().weather.block_on_unspecified and 
                 weather_response.status == WeatherStatus.WEATHER_STATUS_UNSPECIFIED
             ):
                 logger.info(f"In status danger or unspecified {weather_response.status}")
@@ -65,9 +64,10 @@ class RoofTelescopeHandler(AbstractButtonHandler):
         return super().handle(mediator)
 
     def __telescope_is_secure(self):
+        state = TELESCOPE.state
         return (
-            TELESCOPE.status <= TelescopeStatus.SECURE and
-            TELESCOPE.polling
+            state.status <= TelescopeStatus.SECURE and
+            state.polling
         )
 
 class RoofCurtainsHandler(AbstractButtonHandler):
@@ -0,0 +1,80 @@
+import grpc
+import json
+import logging
+import math
+from crac_server.component.telescope import TELESCOPE
+from crac_server.component.telescope.history import FIELDS
+from crac_server.config import Config
+
+
+logger = logging.getLogger(__name__)
+
+
+SERVICE_NAME = "crac_server.TelescopeDiagnostics"
+
+
+def _loads(data: bytes) -> dict:
+    return json.loads(data) if data else {}
+
+
+def _dumps(message: dict) -> bytes:
+    return json.dumps(message).encode()
+
+
+def _finite(value: float):
+    """ JSON has no NaN """
+
+    return value if math.isfinite(value) else None
+
+
+class TelescopeDiagnosticsService:
+
+    """
+        Diagnostics of the telescope polling not covered by crac_protobuf.
+        Requests and responses are JSON objects, the method path is
+        /crac_server.TelescopeDiagnostics/<Method>
+    """
+
+    async def History(self, request: dict, context) -> dict:
+        """ request: {"last": samples (all by default), "window": samples for the rates (5)} """
+
+        logger.debug(f"History request {request}")
+        history = TELESCOPE.history
+        samples = history.samples(request.get("last"))
+        kinematics = history.kinematics(request.get("window", 5))
+        response = {
+            "size": history.size,
+            "poll_interval": TELESCOPE.poll_interval,
+            "samples": {field: [_finite(value) for value in samples[index]] for index, field in enumerate(FIELDS)},
+            "velocity": None,
+            "acceleration": None,
+        }
+        if kinematics:
+            velocity, acceleration = kinematics
+            response["velocity"] = {"alt": float(velocity[0, -1]), "az": float(velocity[1, -1])}
+            response["acceleration"] = {"alt": float(acceleration[0, -1]), "az": float(acceleration[1, -1])}
+        return response
+
+    async def Metrics(self, request: dict, context) -> dict:
+        """ Call durations of the telescope driver in milliseconds, with error and timeout counters """
+
+        return {
+            "driver": Config.settings().telescope.driver,
+            "calls": TELESCOPE.metrics.summary(),
+        }
+
+
+def add_TelescopeDiagnosticsServicer_to_server(servicer: TelescopeDiagnosticsService, server):
+    handlers = {
+        "History": grpc.unary_unary_rpc_method_handler(
+            servicer.History,
+            request_deserializer=_loads,
+            response_serializer=_dumps,
+        ),
+        "Metrics": grpc.unary_unary_rpc_method_handler(
+            servicer.Metrics,
+            request_deserializer=_loads,
+            response_serializer=_dumps,
+        ),
+    }
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(SERVICE_NAME, handlers),))
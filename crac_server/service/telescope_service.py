@@ -1,5 +1,7 @@
 import logging
+import re
 from crac_protobuf.telescope_pb2_grpc import TelescopeServicer
+from crac_server.component.telescope import earth_orientation
 from crac_server.converter.telescope_converter import TelescopeMediator
 from crac_server.handler.telescope_handler import (
     TelescopeAutolightHandler, 
@@ -17,6 +19,17 @@ from crac_server.handler.telescope_handler import (
 logger = logging.getLogger(__name__)
 
 
+# gRPC metadata values are printable ASCII
+_NOT_PRINTABLE = re.compile(r"[^\x20-\x7e]")
+
+
+def _metadata_value(value) -> str:
+    """ value as a metadata value, anything else than printable ASCII escaped """
+
+    text = str(value).encode("ascii", "backslashreplace").decode("ascii")
+    return _NOT_PRINTABLE.sub(lambda match: f"\\x{ord(match.group()):02x}", text)
+
+
 class TelescopeService(TelescopeServicer):
     async def SetAction(self, request, context):
         logger.debug("TelescopeRequest TelescopeService" + str(request))
@@ -40,4 +53,14 @@ class TelescopeService(TelescopeServicer):
             .set_next(telescope_flatter_handler) \
             .set_next(telescope_autolight_handler)
         
-        return telescope_switch_handler.handle(telescope_mediator)
+        response = telescope_switch_handler.handle(telescope_mediator)
+        context.set_trailing_metadata(tuple(
+            (f"telescope-connection-{key.replace('_', '-')}", _metadata_value(value))
+            for key, value in telescope_mediator.button.connection_health.items()
+        ) + tuple(
+            (f"telescope-{key.replace('_', '-')}", _metadata_value(value))
+            for key, value in earth_orientation.status().items()
+        ) + (
+            ("telescope-poll-interval", _metadata_value(telescope_mediator.button.poll_interval)),
+        ))
+        return response
@@ -29,7 +29,15 @@ class UpsService(UpsServicer):
             updated_at=self.timestamp_or_none(datetime.now()),
             interval=UPS.time_expired
         )
-        for device in Config.getValue("ups_list", "ups").split(","):            
+        settings = Config.settings()
+        thresholds = settings.thresholds
+        battery_ok = thresholds["battery_ok"]
+        battery_warning = thresholds["battery_warning"]
+        battery_danger = thresholds["battery_danger"]
+        voltage_ok = thresholds["voltage_ok"]
+        voltage_danger_lower = thresholds["voltage_danger_lower"]
+        voltage_danger_upper = thresholds["voltage_danger_upper"]
+        for device in settings.ups.ups_list:
             ups = UPS.status_for(device)
             response.devices.append(device)
             response.charts.append(
@@ -42,16 +50,16 @@ class UpsService(UpsServicer):
                         max=100,
                         unit_of_measurement="%",
                         range_normal=({
-                            "upper_bound": Config.getFloat("upper_bound", "battery_ok"),
-                            "lower_bound": Config.getFloat("lower_bound", "battery_ok"),
+                            "upper_bound": battery_ok.upper_bound,
+                            "lower_bound": battery_ok.lower_bound,
                         },),
                         range_warn=({
-                            "upper_bound": Config.getFloat("upper_bound", "battery_warning"),
-                            "lower_bound": Config.getFloat("lower_bound", "battery_warning"),
+                            "upper_bound": battery_warning.upper_bound,
+                            "lower_bound": battery_warning.lower_bound,
                         },),
                         range_danger=({
-                            "upper_bound": Config.getFloat("upper_bound", "battery_danger"),
-                            "lower_bound": Config.getFloat("lower_bound", "battery_danger"),
+                            "upper_bound": battery_danger.upper_bound,
+                            "lower_bound": battery_danger.lower_bound,
                         },)
                     )
                 )
@@ -62,19 +70,19 @@ class UpsService(UpsServicer):
                         value=float(ups['input_voltage']),
                         title="Batteria",
                         urn=f"ups.{device}.chart.voltage",
-                        min=Config.getFloat("lower_bound", "voltage_danger_lower"),
-                        max=Config.getFloat("upper_bound", "voltage_danger_upper"),
+                        min=voltage_danger_lower.lower_bound,
+                        max=voltage_danger_upper.upper_bound,
                         unit_of_measurement="V",
                         range_normal=({
-                            "upper_bound": Config.getFloat("upper_bound", "voltage_ok"),
-                            "lower_bound": Config.getFloat("lower_bound", "voltage_ok"),
+                            "upper_bound": voltage_ok.upper_bound,
+                            "lower_bound": voltage_ok.lower_bound,
                         },),
                         range_danger=({
-                            "upper_bound": Config.getFloat("upper_bound", "voltage_danger_upper"),
-                            "lower_bound": Config.getFloat("lower_bound", "voltage_danger_upper"),
+                            "upper_bound": voltage_danger_upper.upper_bound,
+                            "lower_bound": voltage_danger_upper.lower_bound,
                         }, {
-                            "upper_bound": Config.getFloat("upper_bound", "voltage_danger_lower"),
-                            "lower_bound": Config.getFloat("lower_bound", "voltage_danger_lower"),
+                            "upper_bound": voltage_danger_lower.upper_bound,
+                            "lower_bound": voltage_danger_lower.lower_bound,
                         },)
                     )
                 )
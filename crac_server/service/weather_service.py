@@ -46,7 +46,7 @@ class WeatherService(WeatherServicer):
 
         if (
             response.status == WeatherStatus.WEATHER_STATUS_DANGER and
-            TELESCOPE.polling and 
+            TELESCOPE.state.polling and 
             self.t == None
         ):
             logger.info("weather in danger status - block crac")
@@ -57,12 +57,19 @@ class WeatherService(WeatherServicer):
     def _emergency_closure(self):
         with self.lock:
             logger.info("weather in danger status - send telescope in park")
-            TELESCOPE.queue_park()
+            park = TELESCOPE.queue_park()
+            try:
+                park.result(timeout=60)
+                logger.info("weather in danger status - park command sent to the telescope")
+            except Exception:
+                logger.error("weather in danger status - park command not sent", exc_info=1)
             
-            while TELESCOPE.status > TelescopeStatus.SECURE:
+            state = TELESCOPE.state
+            while state.status > TelescopeStatus.SECURE:
                 logger.info("weather in danger status - waiting for telescope in park")
                 sleep(1)
-            logger.info(f"weather in danger status - telescope is in status {TELESCOPE.status}")
+                state = TELESCOPE.state
+            logger.info(f"weather in danger status - telescope is in status {state.status}")
             
             while CURTAIN_EAST.get_status() in (CurtainStatus.CURTAIN_OPENING, CurtainStatus.CURTAIN_CLOSING):
                 sleep(1)
@@ -0,0 +1,323 @@
+from distutils.util import strtobool
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+
+class SettingsError(ValueError):
+    pass
+
+
+def _value(section: Mapping[str, str], section_name: str, key: str) -> str:
+    try:
+        return section[key.lower()]
+    except KeyError:
+        raise SettingsError(f"Missing key {key} in section [{section_name}]") from None
+
+
+def _convert(section: Mapping[str, str], section_name: str, key: str, converter):
+    value = _value(section, section_name, key)
+    try:
+        return converter(value.strip())
+    except ValueError:
+        raise SettingsError(f"Invalid value {value!r} for key {key} in section [{section_name}]") from None
+
+
+def _str(section: Mapping[str, str], section_name: str, key: str) -> str:
+    return _value(section, section_name, key).strip()
+
+
+def _int(section: Mapping[str, str], section_name: str, key: str) -> int:
+    return _convert(section, section_name, key, int)
+
+
+def _float(section: Mapping[str, str], section_name: str, key: str) -> float:
+    return _convert(section, section_name, key, float)
+
+
+def _optional_float(section: Mapping[str, str], section_name: str, key: str) -> Optional[float]:
+    if key.lower() not in section:
+        return None
+    return _float(section, section_name, key)
+
+
+def _bool(section: Mapping[str, str], section_name: str, key: str) -> bool:
+    return _convert(section, section_name, key, lambda value: bool(strtobool(value)))
+
+
+def _check(condition: bool, section_name: str, message: str):
+    if not condition:
+        raise SettingsError(f"Invalid section [{section_name}]: {message}")
+
+
+class GeographySettings:
+
+    """ Observatory location, lat and lon are kept as the astropy angle strings of config.ini """
+
+    __slots__ = ("lat", "lon", "height", "equinox")
+
+    def __init__(self, section: Mapping[str, str], name: str = "geography"):
+        self.lat = _str(section, name, "lat")
+        self.lon = _str(section, name, "lon")
+        self.height = _int(section, name, "height")
+        self.equinox = _str(section, name, "equinox")
+
+
+class IersSettings:
+
+    """ Earth orientation tables of astropy: table is an optional pinned finals2000A file """
+
+    __slots__ = ("offline", "table")
+
+    def __init__(self, section: Mapping[str, str], name: str = "iers"):
+        self.offline = _bool(section, name, "offline")
+        self.table = _str(section, name, "table")
+
+
+class TelescopeSettings:
+
+    __slots__ = (
+        "driver",
+        "hostname",
+        "port",
+        "max_secure_alt",
+        "park_alt",
+        "park_az",
+        "flat_alt",
+        "flat_az",
+        "tracking_off",
+        "polling_interval",
+        "polling_interval_min",
+        "polling_interval_max",
+        "polling_mode",
+        "poll_transform",
+        "jobs_per_poll",
+        "reconnect_min_delay",
+        "reconnect_max_delay",
+        "circuit_breaker_failures",
+        "circuit_breaker_timeout",
+        "history_size",
+        "metrics_log_interval",
+    )
+
+    def __init__(self, section: Mapping[str, str], name: str = "telescope"):
+        self.driver = _str(section, name, "driver")
+        self.hostname = _str(section, name, "hostname")
+        self.port = _int(section, name, "port")
+        self.max_secure_alt = _float(section, name, "max_secure_alt")
+        self.park_alt = _float(section, name, "park_alt")
+        self.park_az = _float(section, name, "park_az")
+        self.flat_alt = _float(section, name, "flat_alt")
+        self.flat_az = _float(section, name, "flat_az")
+        self.tracking_off = _bool(section, name, "tracking_off")
+        self.polling_interval = _float(section, name, "polling_interval")
+        self.polling_interval_min = _float(section, name, "polling_interval_min")
+        self.polling_interval_max = _float(section, name, "polling_interval_max")
+        self.polling_mode = _str(section, name, "polling_mode")
+        self.poll_transform = _str(section, name, "poll_transform")
+        self.jobs_per_poll = _int(section, name, "jobs_per_poll")
+        self.reconnect_min_delay = _float(section, name, "reconnect_min_delay")
+        self.reconnect_max_delay = _float(section, name, "reconnect_max_delay")
+        self.circuit_breaker_failures = _int(section, name, "circuit_breaker_failures")
+        self.circuit_breaker_timeout = _float(section, name, "circuit_breaker_timeout")
+        self.history_size = _int(section, name, "history_size")
+        self.metrics_log_interval = _float(section, name, "metrics_log_interval")
+        _check(
+            0 < self.polling_interval_min <= self.polling_interval <= self.polling_interval_max,
+            name,
+            "expected 0 < polling_interval_min <= polling_interval <= polling_interval_max"
+        )
+        _check(self.polling_mode in ("thread", "asyncio"), name, "polling_mode must be thread or asyncio")
+        _check(self.jobs_per_poll > 0, name, "jobs_per_poll must be positive")
+        _check(self.poll_transform in ("astropy", "analytic"), name, "poll_transform must be astropy or analytic")
+        _check(0 < self.reconnect_min_delay <= self.reconnect_max_delay, name, "expected 0 < reconnect_min_delay <= reconnect_max_delay")
+        _check(self.circuit_breaker_failures > 0, name, "circuit_breaker_failures must be positive")
+        _check(self.circuit_breaker_timeout > 0, name, "circuit_breaker_timeout must be positive")
+        _check(self.history_size >= 3, name, "history_size must be at least 3")
+        _check(self.metrics_log_interval >= 0, name, "metrics_log_interval must not be negative")
+        for key in ("max_secure_alt", "park_alt", "flat_alt"):
+            _check(-90 <= getattr(self, key) <= 90, name, f"{key} must be between -90 and 90")
+        for key in ("park_az", "flat_az"):
+            _check(0 <= getattr(self, key) <= 360, name, f"{key} must be between 0 and 360")
+
+
+class IndiSettings:
+
+    __slots__ = ("max_property_age",)
+
+    def __init__(self, section: Mapping[str, str], name: str = "indi"):
+        self.max_property_age = _float(section, name, "max_property_age")
+        _check(self.max_property_age > 0, name, "max_property_age must be positive")
+
+
+class IndigoSettings:
+
+    __slots__ = ("max_property_age",)
+
+    def __init__(self, section: Mapping[str, str], name: str = "indigo"):
+        self.max_property_age = _float(section, name, "max_property_age")
+        _check(self.max_property_age > 0, name, "max_property_age must be positive")
+
+
+class AscomHubSettings:
+
+    __slots__ = ("timeout",)
+
+    def __init__(self, section: Mapping[str, str], name: str = "ascom_hub"):
+        self.timeout = _float(section, name, "timeout")
+        _check(self.timeout > 0, name, "timeout must be positive")
+
+
+class AzimutSettings:
+
+    __slots__ = ("az_ne", "az_se", "az_sw", "az_nw")
+
+    def __init__(self, section: Mapping[str, str], name: str = "azimut"):
+        self.az_ne = _int(section, name, "azNE")
+        self.az_se = _int(section, name, "azSE")
+        self.az_sw = _int(section, name, "azSW")
+        self.az_nw = _int(section, name, "azNW")
+        for key in self.__slots__:
+            _check(0 <= getattr(self, key) <= 360, name, f"{key} must be between 0 and 360")
+        # clockwise order, the sectors may cross 0/360
+        _check(
+            (self.az_se - self.az_ne) % 360 <= (self.az_sw - self.az_ne) % 360 <= (self.az_nw - self.az_ne) % 360,
+            name,
+            "expected azNE, azSE, azSW and azNW in clockwise order"
+        )
+
+
+class CurtainsSettings:
+
+    __slots__ = ("max_est", "max_west", "park_est", "park_west", "alpha_min", "prediction_horizon")
+
+    def __init__(self, section: Mapping[str, str], name: str = "tende"):
+        self.max_est = _int(section, name, "max_est")
+        self.max_west = _int(section, name, "max_west")
+        self.park_est = _int(section, name, "park_est")
+        self.park_west = _int(section, name, "park_west")
+        self.alpha_min = _int(section, name, "alpha_min")
+        self.prediction_horizon = _float(section, name, "prediction_horizon")
+        _check(self.max_est > self.park_est, name, "max_est must be greater than park_est")
+        _check(self.max_west > self.park_west, name, "max_west must be greater than park_west")
+        _check(self.prediction_horizon >= 0, name, "prediction_horizon must not be negative")
+
+
+class EncoderStepSettings:
+
+    __slots__ = ("n_step_sub_min", "n_step_corsa", "n_step_sicurezza", "tolerance_steps")
+
+    def __init__(self, section: Mapping[str, str], name: str = "encoder_step"):
+        self.n_step_sub_min = _int(section, name, "n_step_sub_min")
+        self.n_step_corsa = _int(section, name, "n_step_corsa")
+        self.n_step_sicurezza = _int(section, name, "n_step_sicurezza")
+        self.tolerance_steps = _int(section, name, "tolerance_steps")
+        _check(self.n_step_sub_min <= 0, name, "n_step_sub_min must not be positive")
+        _check(self.n_step_corsa > 0, name, "n_step_corsa must be positive")
+        _check(self.n_step_sicurezza >= self.n_step_corsa, name, "n_step_sicurezza must not be lower than n_step_corsa")
+        _check(self.tolerance_steps >= 0, name, "tolerance_steps must not be negative")
+
+
+class WeatherSettings:
+
+    __slots__ = ("url", "fallback_url", "time_format", "time_expired", "retry_interval", "block_on_unspecified")
+
+    def __init__(self, section: Mapping[str, str], name: str = "weather"):
+        self.url = _str(section, name, "url")
+        self.fallback_url = _str(section, name, "fallback_url")
+        self.time_format = _str(section, name, "time_format")
+        self.time_expired = _int(section, name, "time_expired")
+        self.retry_interval = _int(section, name, "retry_interval")
+        self.block_on_unspecified = _bool(section, name, "block_on_unspecified")
+        _check(self.time_expired > 0, name, "time_expired must be positive")
+        _check(self.retry_interval > 0, name, "retry_interval must be positive")
+
+
+class ThresholdSettings:
+
+    """ Bounds of a chart: warning and error are optional """
+
+    __slots__ = ("lower_bound", "upper_bound", "warning", "error")
+
+    def __init__(self, section: Mapping[str, str], name: str):
+        self.lower_bound = _float(section, name, "lower_bound")
+        self.upper_bound = _float(section, name, "upper_bound")
+        self.warning = _optional_float(section, name, "warning")
+        self.error = _optional_float(section, name, "error")
+        _check(self.lower_bound <= self.upper_bound, name, "lower_bound must not be greater than upper_bound")
+        for key in ("warning", "error"):
+            value = getattr(self, key)
+            _check(
+                value is None or self.lower_bound <= value <= self.upper_bound,
+                name,
+                f"{key} must be between lower_bound and upper_bound"
+            )
+
+
+class UpsSettings:
+
+    __slots__ = ("driver", "hostname", "port", "login", "password", "ups_list", "time_expired")
+
+    def __init__(self, section: Mapping[str, str], name: str = "ups"):
+        self.driver = _str(section, name, "driver")
+        self.hostname = _str(section, name, "hostname")
+        self.port = _int(section, name, "port")
+        self.login = _str(section, name, "login")
+        self.password = _str(section, name, "password")
+        self.ups_list = tuple(device.strip() for device in _str(section, name, "ups_list").split(",") if device.strip())
+        self.time_expired = _int(section, name, "time_expired")
+        _check(len(self.ups_list) > 0, name, "ups_list must contain at least one device")
+        _check(self.time_expired > 0, name, "time_expired must be positive")
+
+
+WEATHER_THRESHOLDS = (
+    "temperature",
+    "wind_speed",
+    "wind_gust_speed",
+    "humidity",
+    "rain_rate",
+    "barometer",
+    "barometer_trend",
+)
+
+UPS_THRESHOLDS = (
+    "voltage_danger_lower",
+    "voltage_ok",
+    "voltage_danger_upper",
+    "battery_ok",
+    "battery_warning",
+    "battery_danger",
+)
+
+
+class Settings:
+
+    """
+        Typed and validated view of the configuration sections
+        used in the hot paths, built once for every configuration snapshot
+    """
+
+    __slots__ = ("geography", "iers", "telescope", "indi", "indigo", "ascom_hub", "azimut", "curtains", "encoder_step", "weather", "thresholds", "ups")
+
+    def __init__(self, sections: Mapping[str, Mapping[str, str]]):
+        self.geography = GeographySettings(Settings.__section(sections, "geography"))
+        self.iers = IersSettings(Settings.__section(sections, "iers"))
+        self.telescope = TelescopeSettings(Settings.__section(sections, "telescope"))
+        self.indi = IndiSettings(Settings.__section(sections, "indi"))
+        self.indigo = IndigoSettings(Settings.__section(sections, "indigo"))
+        self.ascom_hub = AscomHubSettings(Settings.__section(sections, "ascom_hub"))
+        self.azimut = AzimutSettings(Settings.__section(sections, "azimut"))
+        self.curtains = CurtainsSettings(Settings.__section(sections, "tende"))
+        self.encoder_step = EncoderStepSettings(Settings.__section(sections, "encoder_step"))
+        self.weather = WeatherSettings(Settings.__section(sections, "weather"))
+        self.thresholds = MappingProxyType({
+            name: ThresholdSettings(Settings.__section(sections, name), name)
+            for name in WEATHER_THRESHOLDS + UPS_THRESHOLDS
+        })
+        self.ups = UpsSettings(Settings.__section(sections, "ups"))
+
+    @staticmethod
+    def __section(sections: Mapping[str, Mapping[str, str]], name: str) -> Mapping[str, str]:
+        try:
+            return sections[name]
+        except KeyError:
+            raise SettingsError(f"Missing section [{name}]") from None
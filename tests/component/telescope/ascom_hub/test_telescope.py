@@ -1,4 +1,6 @@
 from typing import Any
+import requests
+import time
 import unittest
 from datetime import datetime, timezone
 from unittest.mock import ANY, MagicMock, patch
@@ -18,6 +20,7 @@ class TestTelescope(unittest.TestCase):
         self.telescope._has_tracking_off_capability = True
         self.telescope._flat_coordinate = AltazimutalCoords(alt=0, az=2)
         self.telescope._merge_client_information = self.mocked_merge_client_information
+        self.timeout = self.telescope._settings.ascom_hub.timeout
 
     def mocked_put_request(self):
         response = MagicMock()
@@ -49,58 +52,77 @@ class TestTelescope(unittest.TestCase):
     def mocked_calculate_eq_coords_of_park_position(self, started_at):
         return EquatorialCoords(dec=0, ra=0)
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_sync(self, request):
         request.return_value = self.mocked_put_request()
         self.telescope._calculate_eq_coords_of_park_position = self.mocked_calculate_eq_coords_of_park_position
         self.telescope.sync(datetime.now())
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', data={"Tracking": True, "ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/unpark', data={"ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/synctocoordinates', data={"RightAscension": 0, "Declination": 0, "ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/setpark', data={"ClientId": 1, "ClientTransactionID": 1})
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', data={"Tracking": True, "ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/unpark', data={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/synctocoordinates', data={"RightAscension": 0, "Declination": 0, "ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/setpark', data={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
         request.reset_mock()
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_set_speed(self, request):
         request.return_value = self.mocked_put_request()
         self.telescope.set_speed(TelescopeSpeed.SPEED_TRACKING)
-        request.assert_called_with(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', data={"Tracking": True, "ClientId": 1, "ClientTransactionID": 1})
+        request.assert_called_with(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', data={"Tracking": True, "ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
         request.reset_mock()
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_park(self, request):
         request.return_value = self.mocked_put_request()
         self.telescope.park()
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/park', data={"ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', data={"Tracking": False, "ClientId": 1, "ClientTransactionID": 1})
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/park', data={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', data={"Tracking": False, "ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
         request.reset_mock()
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_flat(self, request):
         request.return_value = self.mocked_put_request()
         eq_coords = self.telescope._altaz2radec(aa_coords=self.telescope._flat_coordinate, obstime=datetime.utcnow(), decimal_places=2)
         self.telescope.flat()
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/slewtocoordinates', data={"RightAscension": eq_coords.ra, "Declination": eq_coords.dec, "ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', data={"Tracking": False, "ClientId": 1, "ClientTransactionID": 1})
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/slewtocoordinates', data={"RightAscension": eq_coords.ra, "Declination": eq_coords.dec, "ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', data={"Tracking": False, "ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
         request.reset_mock()
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_retrieve(self, request):
         request.return_value = self.mocked_get_request()
         self.telescope.retrieve()
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/altitude', params={"ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/azimuth', params={"ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/declination', params={"ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/rightascension', params={"ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', params={"ClientId": 1, "ClientTransactionID": 1})
-        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/slewing', params={"ClientId": 1, "ClientTransactionID": 1})
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/altitude', params={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/azimuth', params={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/declination', params={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/rightascension', params={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/tracking', params={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
+        request.assert_any_call(f'http://{self._host}:{self._port}/api/v1/telescope/0/slewing', params={"ClientId": 1, "ClientTransactionID": 1}, timeout=self.timeout)
     
+    @patch('requests.Session.get')
+    def test_retrieve_reads_concurrently(self, request):
+        def slow_get(url, params, timeout):
+            time.sleep(0.2)
+            return self.mocked_get_request().get.return_value
+
+        request.side_effect = slow_get
+        started_at = time.monotonic()
+        self.telescope.retrieve()
+        self.assertEqual(request.call_count, 6)
+        self.assertLess(time.monotonic() - started_at, 0.6)
+
+    @patch('requests.Session.get')
+    def test_retrieve_timeout(self, request):
+        request.side_effect = requests.Timeout("read timed out")
+        with self.assertRaises(requests.Timeout):
+            self.telescope.retrieve()
+
     def test_retrieve_mocked_get(self):
         az_coords = AltazimutalCoords(alt=0, az=0)
         eq_coords = EquatorialCoords(dec=45, ra=5)
         self.telescope._retrieve_aa_coords = MagicMock(return_value=az_coords)
         self.telescope._retrieve_eq_coords = MagicMock(return_value=eq_coords)
         self.telescope._retrieve_speed = MagicMock(return_value=TelescopeSpeed.SPEED_TRACKING)
+        self.telescope._get_values = MagicMock(return_value={})
         indicators = self.telescope.retrieve()
         self.assertEqual(indicators, (eq_coords, az_coords, TelescopeSpeed.SPEED_TRACKING, ANY))
 
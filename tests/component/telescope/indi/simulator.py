@@ -0,0 +1,251 @@
+"""
+    INDI servers standing in for the mount PC, for the tests and the benchmarks:
+    a simulated mount, and the replay of a scripted session.
+
+        python -m tests.component.telescope.indi.simulator serve [port]
+        python -m tests.component.telescope.indi.simulator replay session.jsonl [port]
+
+    A session is a JSON line per read of the server, {"at": seconds since the
+    subscription, "data": the XML read}. The bundled ones are synthetic,
+    written by hand after the INDI drivers of the mounts (see sessions/README.md):
+    they check the reader against the shape of that traffic, not against a
+    real server
+"""
+import asyncio
+import json
+import logging
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,  # type: ignore
+    EquatorialCoords,  # type: ignore
+)
+from crac_server.component.telescope.indi.properties import item_value
+from crac_server.component.telescope.indi.stream import XmlStreamDecoder
+from crac_server.config import Config
+from tests.component.telescope.simulation import SimulatedMount, StreamServer
+from datetime import datetime
+from typing import Optional
+from xml.sax.saxutils import quoteattr
+
+
+logger = logging.getLogger(__name__)
+
+
+_TIMESTAMP = re.compile(r' timestamp="[^"]*"')
+
+
+def _element(kind: str, vector_type: str, device: str, name: str, state: str, **items) -> str:
+    one = ("def" if kind == "def" else "one") + vector_type
+    attributes = f'device={quoteattr(device)} name={quoteattr(name)} state="{state}" timestamp="{datetime.utcnow().isoformat(timespec="seconds")}"'
+    if kind == "def":
+        attributes += ' perm="rw"'
+    children = []
+    for key, value in items.items():
+        text = ("On" if value else "Off") if vector_type == "Switch" else f"{value:.10g}"
+        children.append(f'  <{one} name="{key}">\n{text}\n  </{one}>\n')
+    return f'<{kind}{vector_type}Vector {attributes}>\n{"".join(children)}</{kind}{vector_type}Vector>\n'
+
+
+class IndiSimulator(StreamServer):
+
+    """
+        asyncio INDI server of one SimulatedMount with the properties of an
+        INDI telescope driver: EQUATORIAL_EOD_COORD, TELESCOPE_TRACK_STATE,
+        TELESCOPE_PARK, ON_COORD_SET and, if horizontal, HORIZONTAL_COORD.
+        The simulated mount makes no difference between J2000 and the epoch
+        of date.
+        A client receives the def of the properties it asks with getProperties,
+        then their updates: the answer to its new*Vector commands and the
+        coordinates every push_interval seconds. As indiserver does, the
+        set*Vector sent by a client are ignored
+    """
+
+    def __init__(
+        self,
+        device: str,
+        mount: SimulatedMount,
+        horizontal: bool = True,
+        latency: float = 0,
+        fragment: int = 0,
+        push_interval: float = 0.5,
+        disconnect_after: Optional[int] = None,
+    ) -> None:
+        super().__init__(latency, fragment, disconnect_after)
+        self.device = device
+        self.mount = mount
+        self.horizontal = horizontal
+        self.push_interval = push_interval
+        self._coordinates_set = {"SLEW": False, "TRACK": True, "SYNC": False}
+        self._alert = False
+        self._subscribed: dict[asyncio.StreamWriter, set] = {}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        port = await super().start(host, port)
+        self._tasks.append(asyncio.create_task(self.__push()))
+        return port
+
+    def vectors(self, kind: str = "def") -> dict:
+        """ Every property as the element of kind def or set, by name """
+
+        mount = self.mount
+        mount.step()
+        eq_coords = mount.equatorial()
+        coordinates_state = "Alert" if self._alert else "Busy" if mount.slewing else "Ok" if mount.tracking else "Idle"
+        vectors = {
+            "EQUATORIAL_EOD_COORD": _element(kind, "Number", self.device, "EQUATORIAL_EOD_COORD", coordinates_state, RA=eq_coords.ra, DEC=eq_coords.dec),
+            "TELESCOPE_TRACK_STATE": _element(kind, "Switch", self.device, "TELESCOPE_TRACK_STATE", "Ok", TRACK_ON=mount.tracking, TRACK_OFF=not mount.tracking),
+            "TELESCOPE_PARK": _element(kind, "Switch", self.device, "TELESCOPE_PARK", "Busy" if mount.parking else "Ok", PARK=mount.parked, UNPARK=not mount.parked),
+            "ON_COORD_SET": _element(kind, "Switch", self.device, "ON_COORD_SET", "Ok", **self._coordinates_set),
+        }
+        if self.horizontal:
+            aa_coords = mount.horizontal()
+            vectors["HORIZONTAL_COORD"] = _element(kind, "Number", self.device, "HORIZONTAL_COORD", coordinates_state, ALT=aa_coords.alt, AZ=aa_coords.az)
+        return vectors
+
+    def _decoder(self) -> XmlStreamDecoder:
+        return XmlStreamDecoder()
+
+    def _disconnected(self, writer: asyncio.StreamWriter):
+        self._subscribed.pop(writer, None)
+
+    async def _handle(self, element: ET.Element, writer: asyncio.StreamWriter):
+        device = element.get("device")
+        if device is not None and device != self.device:
+            return
+        if element.tag == "getProperties":
+            vectors = self.vectors("def")
+            names = {element.get("name")} if element.get("name") else set(vectors)
+            self._subscribed.setdefault(writer, set()).update(names)
+            await self.send(writer, "".join(vectors[name] for name in names if name in vectors).encode("utf-8"))
+        elif element.tag in ("newSwitchVector", "newNumberVector"):
+            name = element.get("name", "")
+            vector_type = element.tag[3:-6]
+            items = {child.get("name"): item_value(vector_type, child.text) for child in element}
+            if self.__apply(name, items):
+                update = self.vectors("set")[name].encode("utf-8")
+                for client in {writer, *self._subscribed}:
+                    if client is writer or name in self._subscribed[client]:
+                        await self.send(client, update)
+        elif element.tag != "enableBLOB":
+            logger.debug(f"INDI simulator ignores {element.tag} {element.get('name')}")
+
+    def __apply(self, name: str, items: dict) -> bool:
+        """ Change the mount as the command asks, False for the properties not simulated """
+
+        mount = self.mount
+        if name == "TELESCOPE_PARK":
+            if items.get("PARK"):
+                mount.park()
+            elif items.get("UNPARK"):
+                mount.unpark()
+        elif name == "TELESCOPE_TRACK_STATE":
+            if "TRACK_ON" in items or "TRACK_OFF" in items:
+                mount.set_tracking(items.get("TRACK_ON", not items.get("TRACK_OFF")))
+        elif name == "ON_COORD_SET":
+            on = [key for key, value in items.items() if key in self._coordinates_set and value]
+            if on:
+                self._coordinates_set = {key: key == on[-1] for key in self._coordinates_set}
+        elif name in ("EQUATORIAL_EOD_COORD", "HORIZONTAL_COORD"):
+            # a parked mount refuses to move, as the INDI drivers do
+            self._alert = mount.parked and not self._coordinates_set["SYNC"]
+            if name == "EQUATORIAL_EOD_COORD":
+                current = mount.equatorial()
+                target = EquatorialCoords(ra=items.get("RA", current.ra), dec=items.get("DEC", current.dec))
+            else:
+                current = mount.horizontal()
+                target = AltazimutalCoords(alt=items.get("ALT", current.alt), az=items.get("AZ", current.az))
+            if self._coordinates_set["SYNC"] and isinstance(target, EquatorialCoords):
+                mount.sync(target)
+            elif not self._alert:
+                mount.goto(target)
+                mount.set_tracking(mount.tracking or self._coordinates_set["TRACK"])
+        else:
+            return False
+        return True
+
+    async def __push(self):
+        """ To the clients subscribed to them, the coordinates and the properties changed since the last push """
+
+        pushed: dict[str, str] = {}
+        while True:
+            await asyncio.sleep(self.push_interval)
+            if not self._subscribed:
+                continue
+            vectors = self.vectors("set")
+            changed = {"EQUATORIAL_EOD_COORD", "HORIZONTAL_COORD"}
+            for name, vector in vectors.items():
+                content = _TIMESTAMP.sub("", vector)
+                if pushed.get(name) != content:
+                    pushed[name] = content
+                    changed.add(name)
+            for client, names in list(self._subscribed.items()):
+                updates = [vector for name, vector in vectors.items() if name in names and name in changed]
+                await self.send(client, "".join(updates).encode("utf-8"))
+
+
+class SessionReplay(StreamServer):
+
+    """
+        INDI server replaying a session to every client, from its first
+        request, at the times of the session divided by speed.
+        The client requests are read and otherwise ignored
+    """
+
+    def __init__(self, records: list, speed: float = 1, latency: float = 0, fragment: int = 0) -> None:
+        super().__init__(latency, fragment)
+        self.records = records
+        self.speed = speed
+        self._replaying: set[asyncio.StreamWriter] = set()
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "SessionReplay":
+        with open(path) as session:
+            return cls([json.loads(line) for line in session if line.strip()], **kwargs)
+
+    def _decoder(self) -> XmlStreamDecoder:
+        return XmlStreamDecoder()
+
+    def _disconnected(self, writer: asyncio.StreamWriter):
+        self._replaying.discard(writer)
+
+    async def _handle(self, element: ET.Element, writer: asyncio.StreamWriter):
+        if writer not in self._replaying:
+            self._replaying.add(writer)
+            self._tasks.append(asyncio.create_task(self.__replay(writer)))
+
+    async def __replay(self, writer: asyncio.StreamWriter):
+        started_at = time.monotonic()
+        for record in self.records:
+            delay = started_at + record["at"] / self.speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if writer not in self._replaying:
+                return
+            await self.send(writer, record["data"].encode("utf-8"))
+
+
+def default_simulator(**kwargs) -> IndiSimulator:
+    """ The mount of config.ini: site, park position and INDI device name """
+
+    settings = Config.settings()
+    park_position = AltazimutalCoords(alt=settings.telescope.park_alt, az=settings.telescope.park_az)
+    mount = SimulatedMount(settings.geography, park_position, kwargs.pop("slew_rate", 4))
+    return IndiSimulator(Config.getValue("name", "indi"), mount, **kwargs)
+
+
+async def serve(server: StreamServer, port: int):
+    bound = await server.start("0.0.0.0", port)
+    logger.info(f"INDI {type(server).__name__} listening on port {bound}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    command, arguments = sys.argv[1], sys.argv[2:]
+    if command == "serve":
+        asyncio.run(serve(default_simulator(), int(arguments[0]) if arguments else 7624))
+    elif command == "replay":
+        asyncio.run(serve(SessionReplay.load(arguments[0]), int(arguments[1]) if len(arguments) > 1 else 7624))
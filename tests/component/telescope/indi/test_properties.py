@@ -0,0 +1,28 @@
+import unittest
+import xml.etree.ElementTree as ET
+from crac_server.component.telescope.indi.properties import element_message, number
+
+
+class TestProperties(unittest.TestCase):
+
+    def test_number(self):
+        self.assertEqual(number(" 5.25\n"), 5.25)
+        self.assertEqual(number("5:30:00"), 5.5)
+        self.assertEqual(number("-22 30"), -22.5)
+        self.assertEqual(number("-0:30"), -0.5)
+
+    def test_element_message(self):
+        element = ET.fromstring(
+            '<setSwitchVector device="Mount" name="TELESCOPE_PARK" state="Busy">'
+            '<oneSwitch name="PARK"> On </oneSwitch><oneSwitch name="UNPARK">Off</oneSwitch>'
+            '</setSwitchVector>'
+        )
+        self.assertEqual(element_message(element), {"setSwitchVector": {
+            "device": "Mount", "name": "TELESCOPE_PARK", "state": "Busy",
+            "items": [{"name": "PARK", "value": True}, {"name": "UNPARK", "value": False}],
+        }})
+        self.assertEqual(element_message(ET.fromstring('<delProperty device="Mount" name="TELESCOPE_PARK"/>')), {
+            "deleteProperty": {"device": "Mount", "name": "TELESCOPE_PARK"},
+        })
+        self.assertIsNone(element_message(ET.fromstring('<message device="Mount" message="hello"/>')))
+        self.assertIsNone(element_message(ET.fromstring('<setNumberVector device="Mount" name="X"><oneNumber name="A">nan?</oneNumber></setNumberVector>')))
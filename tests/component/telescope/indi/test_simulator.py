@@ -0,0 +1,142 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+from crac_protobuf.telescope_pb2 import EquatorialCoords, TelescopeSpeed, TelescopeStatus
+from crac_server.component.telescope.indi.telescope import Telescope
+from crac_server.config import Config
+from tests.component.telescope.indi.simulator import SessionReplay, default_simulator
+from tests.component.telescope.simulation import SimulatorThread
+
+
+SESSIONS = os.path.join(os.path.dirname(__file__), "sessions")
+
+
+class DriverTestCase(unittest.TestCase):
+
+    def connect(self, server, device: str) -> Telescope:
+        self.server = SimulatorThread(server)
+        port = self.server.start()
+        self.addCleanup(self.server.stop)
+        telescope = Telescope(hostname="127.0.0.1", port=port)
+        telescope._name = device
+        telescope._mirror._device = device
+        telescope._polling = True
+        self.addCleanup(telescope._connection.close)
+        return telescope
+
+    def poll_until(self, telescope: Telescope, condition, timeout: float = 5) -> list:
+        """ Poll until condition holds for the published state, return the states seen """
+
+        states = []
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            telescope._poll_once()
+            states.append(telescope.state)
+            if condition(telescope.state):
+                return states
+            time.sleep(0.02)
+        self.fail(f"condition not reached, last state {telescope.state}")
+
+
+class TestIndiSimulator(DriverTestCase):
+
+    """ The indi driver against the simulated INDI server, through the polling of the base class """
+
+    def setUp(self) -> None:
+        settings = Config.settings().telescope
+        self.flat = (settings.flat_alt, settings.flat_az)
+        self.park = (settings.park_alt, settings.park_az)
+
+    def near(self, state, position: tuple) -> bool:
+        # the driver moves to equatorial coordinates rounded to 0.01 hours
+        return abs(state.aa_coords.alt - position[0]) < 0.2 and abs(state.aa_coords.az - position[1]) < 0.2
+
+    def start(self, **kwargs) -> Telescope:
+        # the mount starts parked: the driver unparks it before moving
+        simulator = default_simulator(slew_rate=kwargs.pop("slew_rate", 90), push_interval=0.05, **kwargs)
+        self.simulator = simulator
+        return self.connect(simulator, simulator.device)
+
+    def test_mount_horizontal_coordinates(self):
+        telescope = self.start()
+        telescope._poll_once()
+        settings = Config.settings().telescope
+        self.assertIsNotNone(telescope.mirror.get("HORIZONTAL_COORD"))
+        self.assertEqual(telescope.status, TelescopeStatus.PARKED)
+        self.assertAlmostEqual(telescope.aa_coords.alt, settings.park_alt, places=3)
+        self.assertAlmostEqual(telescope.aa_coords.az, settings.park_az, places=3)
+        self.assertEqual(telescope.metrics.summary().get("transform"), None)
+
+    def test_slew_and_park(self):
+        # flat and park are half a degree apart in config.ini
+        telescope = self.start(slew_rate=1)
+        telescope._poll_once()
+        telescope.queue_flat()
+        states = self.poll_until(telescope, lambda state: self.near(state, self.flat) and state.speed != TelescopeSpeed.SPEED_SLEWING)
+        self.assertIn(TelescopeSpeed.SPEED_SLEWING, [state.speed for state in states])
+        self.assertFalse(self.simulator.mount.parked)
+        telescope.queue_park()
+        self.poll_until(telescope, lambda state: self.near(state, self.park) and state.speed != TelescopeSpeed.SPEED_SLEWING)
+
+    def test_set_speed(self):
+        # a parked mount does not track: unpark it with a flat
+        telescope = self.start()
+        telescope._poll_once()
+        telescope.queue_flat()
+        self.poll_until(telescope, lambda state: self.near(state, self.flat) and state.speed != TelescopeSpeed.SPEED_SLEWING)
+        telescope.queue_set_speed(TelescopeSpeed.SPEED_TRACKING)
+        self.poll_until(telescope, lambda state: state.speed == TelescopeSpeed.SPEED_TRACKING)
+        self.assertTrue(self.simulator.mount.tracking)
+        telescope.queue_set_speed(TelescopeSpeed.SPEED_NOT_TRACKING)
+        self.poll_until(telescope, lambda state: state.speed == TelescopeSpeed.SPEED_NOT_TRACKING)
+        self.assertFalse(self.simulator.mount.tracking)
+
+    def test_latency_and_fragmentation(self):
+        telescope = self.start(latency=0.02, fragment=7, horizontal=False)
+        telescope._poll_once()
+        self.assertEqual(telescope.status, TelescopeStatus.PARKED)
+        telescope.queue_flat()
+        # without HORIZONTAL_COORD the alt/az are converted from the equatorial coordinates
+        self.poll_until(telescope, lambda state: self.near(state, self.flat) and state.speed != TelescopeSpeed.SPEED_SLEWING)
+
+    def test_disconnect_and_reconnect(self):
+        # the subscription takes the first five requests, the goto of the flat is the seventh
+        telescope = self.start(disconnect_after=7)
+        telescope._poll_once()
+        flat = telescope.queue_flat()
+        telescope._poll_once()
+        self.assertIsInstance(flat.exception(0), (ConnectionError, TimeoutError))
+        self.assertEqual(telescope.status, TelescopeStatus.ERROR)
+        self.poll_until(telescope, lambda state: state.status not in (TelescopeStatus.ERROR, TelescopeStatus.LOST))
+        self.assertEqual(telescope._connection.connections, 2)
+
+
+class TestSessionReplay(DriverTestCase):
+
+    """ The indi driver reading the hand-written sessions of the mounts of config.ini, 10 times faster """
+
+    SPEED = 10
+
+    DEVICES = {
+        "synthetic_telescope_simulator.jsonl": "Telescope Simulator",
+        "synthetic_lx200_classic.jsonl": "LX200 Classic",
+        "synthetic_astro_electronic_fs2.jsonl": "Astro-Electronic FS-2",
+    }
+
+    # none of them has HORIZONTAL_COORD: do not wait for it while the replay runs
+    @patch("crac_server.component.telescope.indi.telescope.SUBSCRIPTION_TIMEOUT", 0.05)
+    def test_sessions(self):
+        for session, device in self.DEVICES.items():
+            with self.subTest(session=session):
+                replay = SessionReplay.load(os.path.join(SESSIONS, session), speed=self.SPEED, fragment=64)
+                telescope = self.connect(replay, device)
+                started_at = time.monotonic()
+                target = EquatorialCoords(ra=7.25, dec=35.5)
+                states = self.poll_until(telescope, lambda state: state.eq_coords == target and state.speed == TelescopeSpeed.SPEED_TRACKING)
+                self.assertIn(TelescopeSpeed.SPEED_SLEWING, [state.speed for state in states])
+                self.assertEqual(states[0].eq_coords, EquatorialCoords(ra=5.5, dec=22))
+                # the end of the slew comes at its time in the session, not before
+                slewed = next(record["at"] for record in replay.records if "Slew is complete" in record["data"])
+                self.assertGreaterEqual(time.monotonic() - started_at, slewed / self.SPEED - 0.05)
+                self.doCleanups()
@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import patch
+from crac_server.component.telescope.indi.stream import XmlStreamDecoder
+
+
+STREAM = (
+    '<defNumberVector device="Mount" name="EQUATORIAL_EOD_COORD" state="Ok" perm="rw">\n'
+    '  <defNumber name="RA" format="%10.6m">5.5</defNumber>\n'
+    '  <defNumber name="DEC" format="%10.6m">22</defNumber>\n'
+    '</defNumberVector>\n'
+    '<message device="Mount" message="Slewing -> città"/>\n'
+    '<setNumberVector device="Mount" name="EQUATORIAL_EOD_COORD" state="Busy">\n'
+    '  <oneNumber name="RA">5.6</oneNumber>\n'
+    '</setNumberVector>\n'
+).encode("utf-8")
+
+
+class TestXmlStreamDecoder(unittest.TestCase):
+
+    def summary(self, elements: list) -> list:
+        return [(element.tag, element.get("name"), [child.text for child in element]) for element in elements]
+
+    def test_several_root_elements_in_one_read(self):
+        elements = XmlStreamDecoder().feed(STREAM)
+        self.assertEqual(self.summary(elements), [
+            ("defNumberVector", "EQUATORIAL_EOD_COORD", ["5.5", "22"]),
+            ("message", None, []),
+            ("setNumberVector", "EQUATORIAL_EOD_COORD", ["5.6"]),
+        ])
+        self.assertEqual(elements[1].get("message"), "Slewing -> città")
+
+    def test_byte_by_byte(self):
+        decoder = XmlStreamDecoder()
+        elements = []
+        for byte in STREAM:
+            elements.extend(decoder.feed(bytes([byte])))
+        self.assertEqual(self.summary(elements), self.summary(XmlStreamDecoder().feed(STREAM)))
+
+    def test_elements_complete_as_they_arrive(self):
+        decoder = XmlStreamDecoder()
+        cut = STREAM.index(b"<message")
+        self.assertEqual([element.tag for element in decoder.feed(STREAM[:cut - 10])], [])
+        self.assertEqual([element.tag for element in decoder.feed(STREAM[cut - 10:cut + 5])], ["defNumberVector"])
+        self.assertEqual([element.tag for element in decoder.feed(STREAM[cut + 5:])], ["message", "setNumberVector"])
+
+    def test_complete_elements_are_detached(self):
+        decoder = XmlStreamDecoder()
+        decoder.feed(STREAM * 3)
+        self.assertEqual(len(decoder._root), 0)
+
+    def test_malformed_xml_is_dropped(self):
+        decoder = XmlStreamDecoder()
+        with self.assertLogs("crac_server.component.telescope.indi.stream", "ERROR"):
+            elements = decoder.feed(b'</oneNumber><setNumberVector name="A"><oneNumber>1</oneNumbr></setNumberVector>' + STREAM)
+        self.assertEqual([element.tag for element in elements], ["defNumberVector", "message", "setNumberVector"])
+        self.assertEqual([element.tag for element in decoder.feed(STREAM)], ["defNumberVector", "message", "setNumberVector"])
+
+    def test_other_devices_and_blobs_are_skipped(self):
+        decoder = XmlStreamDecoder("Mount")
+        blob = b'<setBLOBVector device="Mount" name="CCD1"><oneBLOB name="CCD1" size="200000">' + b"QUJD" * 50000 + b'</oneBLOB></setBLOBVector>'
+        other = b'<setNumberVector device="CCD" name="CCD_EXPOSURE"><oneNumber name="EXPOSURE">1</oneNumber></setNumberVector>'
+        data = other + blob + b'<message message="no device"/>' + STREAM
+        elements = []
+        buffered = 0
+        for index in range(0, len(data), 4096):
+            elements.extend(decoder.feed(data[index:index + 4096]))
+            buffered = max(buffered, len(decoder._buffer))
+        self.assertEqual([element.tag for element in elements], ["message", "defNumberVector", "message", "setNumberVector"])
+        self.assertEqual(decoder.skipped, 2)
+        self.assertLess(buffered, 5000)
+
+    def test_oversized_element_is_skipped(self):
+        decoder = XmlStreamDecoder()
+        with patch("crac_server.component.telescope.indi.stream.MAX_ELEMENT_SIZE", 1000):
+            with self.assertLogs("crac_server.component.telescope.indi.stream", "WARNING"):
+                elements = decoder.feed(b'<defTextVector device="Mount" name="BIG"><defText name="T">' + b"x" * 2000 + b'</defText></defTextVector>')
+                elements += decoder.feed(STREAM)
+        self.assertEqual([element.tag for element in elements], ["defNumberVector", "message", "setNumberVector"])
+        self.assertEqual(decoder.skipped, 1)
@@ -0,0 +1,125 @@
+import socket
+import time
+import unittest
+from crac_protobuf.telescope_pb2 import AltazimutalCoords, EquatorialCoords, TelescopeSpeed, TelescopeStatus
+from crac_server.component.telescope.indi.stream import XmlStreamDecoder
+from crac_server.component.telescope.indi.telescope import SUBSCRIPTION_TIMEOUT, Telescope
+from threading import Thread
+
+
+DEVICE = "Telescope Simulator"
+
+
+def vector(kind: str, state: str, device: str = DEVICE, name: str = "EQUATORIAL_EOD_COORD", **items) -> str:
+    one = "def" + kind[3:-6] if kind.startswith("def") else "one" + kind[3:-6]
+    children = "".join(f'<{one} name="{key}">\n  {value}\n</{one}>' for key, value in items.items())
+    return f'<{kind} device="{device}" name="{name}" state="{state}">{children}</{kind}>\n'
+
+
+class SocketPair:
+
+    def __init__(self) -> None:
+        self.sock, self.server = socket.socketpair()
+        self.connections = 1
+
+
+class TestTelescope(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.telescope = Telescope(hostname="localhost", port=7624)
+        self.telescope._name = DEVICE
+        self.pair = SocketPair()
+        self.telescope._connection = self.pair  # type: ignore
+        self.requests = []
+        self.answers = {"EQUATORIAL_EOD_COORD": [vector("defNumberVector", "Ok", RA=5.5, DEC=22)]}
+        self.server = Thread(target=self.serve)
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.pair.server.shutdown(socket.SHUT_RDWR)
+        self.server.join()
+        self.pair.sock.close()
+        self.pair.server.close()
+
+    def serve(self):
+        """ Answer a getProperties with the elements of its property, a command with those of its tag, in small writes """
+
+        decoder = XmlStreamDecoder()
+        while data := self.pair.server.recv(65536):
+            for request in decoder.feed(data):
+                key = request.get("name") if request.tag == "getProperties" else request.tag
+                self.requests.append(key)
+                self.send(*self.answers.get(key, ()))
+
+    def send(self, *elements: str):
+        data = "".join(elements).encode()
+        for index in range(0, len(data), 7):
+            self.pair.server.sendall(data[index:index + 7])
+
+    def wait_until(self, condition):
+        deadline = time.monotonic() + 2
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_subscribes_once(self):
+        eq_coords, aa_coords, speed, _ = self.telescope.retrieve()
+        self.telescope.retrieve()
+        self.assertEqual(eq_coords, EquatorialCoords(ra=5.5, dec=22))
+        self.assertEqual(speed, TelescopeSpeed.SPEED_TRACKING)
+        self.assertIsNotNone(aa_coords)
+        self.assertEqual(self.requests, ["enableBLOB", "EQUATORIAL_EOD_COORD", "HORIZONTAL_COORD", "TELESCOPE_TRACK_STATE", "TELESCOPE_PARK"])
+
+    def test_mount_properties(self):
+        self.answers["HORIZONTAL_COORD"] = [vector("defNumberVector", "Ok", name="HORIZONTAL_COORD", ALT=45, AZ=120)]
+        self.answers["TELESCOPE_TRACK_STATE"] = [vector("defSwitchVector", "Ok", name="TELESCOPE_TRACK_STATE", TRACK_ON="Off", TRACK_OFF="On")]
+        self.answers["TELESCOPE_PARK"] = [vector("defSwitchVector", "Ok", name="TELESCOPE_PARK", PARK="On", UNPARK="Off")]
+        self.telescope._polling = True
+        # the first poll of the connection already reads them all
+        _, aa_coords, speed, status = self.telescope.retrieve()
+        self.assertEqual(aa_coords, AltazimutalCoords(alt=45, az=120))
+        self.assertEqual(speed, TelescopeSpeed.SPEED_NOT_TRACKING)
+        self.assertEqual(status, TelescopeStatus.PARKED)
+
+    def test_properties_not_defined_are_waited_once(self):
+        started_at = time.monotonic()
+        self.telescope.retrieve()
+        self.assertGreaterEqual(time.monotonic() - started_at, SUBSCRIPTION_TIMEOUT)
+        started_at = time.monotonic()
+        self.telescope.retrieve()
+        self.assertLess(time.monotonic() - started_at, SUBSCRIPTION_TIMEOUT)
+
+    def test_pushed_updates(self):
+        self.telescope.retrieve()
+        self.send(vector("setNumberVector", "Busy", RA="6:30:00"))
+        self.wait_until(lambda: self.telescope.mirror.get("EQUATORIAL_EOD_COORD").state == "Busy")
+        eq_coords, _, speed, _ = self.telescope.retrieve()
+        self.assertEqual(eq_coords, EquatorialCoords(ra=6.5, dec=22))
+        self.assertEqual(speed, TelescopeSpeed.SPEED_SLEWING)
+
+    def test_unsolicited_updates_and_reply_in_one_read(self):
+        self.answers["EQUATORIAL_EOD_COORD"] = [
+            vector("setNumberVector", "Busy", device="CCD", RA=1, DEC=1),
+            '<message device="Telescope Simulator" message="Slewing"/>\n',
+            vector("defNumberVector", "Busy", RA=5.5, DEC=22),
+            vector("setNumberVector", "Busy", RA=6.5, DEC=23),
+        ]
+        eq_coords, _, speed, _ = self.telescope.retrieve()
+        self.assertIn(eq_coords, (EquatorialCoords(ra=5.5, dec=22), EquatorialCoords(ra=6.5, dec=23)))
+        self.assertEqual(speed, TelescopeSpeed.SPEED_SLEWING)
+
+    def test_commands_without_reply_do_not_wait(self):
+        self.telescope.set_speed(TelescopeSpeed.SPEED_NOT_TRACKING)
+        self.wait_until(lambda: "newSwitchVector" in self.requests)
+        self.assertEqual(self.requests[-1], "newSwitchVector")
+
+    def test_timeout_without_reply(self):
+        self.answers.clear()
+        with self.assertRaises(TimeoutError):
+            self.telescope.retrieve()
+
+    def test_closed_stream(self):
+        self.telescope.retrieve()
+        self.pair.server.shutdown(socket.SHUT_WR)
+        self.telescope._reader.join(2)
+        with self.assertRaises(ConnectionError):
+            self.telescope.retrieve()
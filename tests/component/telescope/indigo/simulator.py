@@ -0,0 +1,183 @@
+"""
+    INDIGO JSON server simulating a mount, to run the indigo driver without the
+    mount PC: the tests and the benchmarks start it on an ephemeral port.
+
+        python -m tests.component.telescope.indigo.simulator [port]
+
+    It speaks the subset used by the driver: getProperties, newSwitchVector on
+    MOUNT_PARK, MOUNT_TRACKING and MOUNT_ON_COORDINATES_SET, newNumberVector on
+    MOUNT_EQUATORIAL_COORDINATES and MOUNT_HORIZONTAL_COORDINATES
+"""
+import asyncio
+import json
+import logging
+import sys
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,  # type: ignore
+    EquatorialCoords,  # type: ignore
+)
+from crac_server.component.telescope.indigo.stream import JsonStreamDecoder
+from crac_server.config import Config
+from tests.component.telescope.simulation import SimulatedMount, StreamServer
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# the type of each simulated property, a command of another type is ignored
+PROPERTY_TYPES = {
+    "MOUNT_PARK": "Switch",
+    "MOUNT_TRACKING": "Switch",
+    "MOUNT_ON_COORDINATES_SET": "Switch",
+    "MOUNT_EQUATORIAL_COORDINATES": "Number",
+    "MOUNT_HORIZONTAL_COORDINATES": "Number",
+}
+
+
+class IndigoSimulator(StreamServer):
+
+    """
+        asyncio INDIGO server of one SimulatedMount.
+        A client subscribed with getProperties receives the def of every
+        property, then their updates: the answer to a command and the
+        coordinates every push_interval seconds
+    """
+
+    def __init__(
+        self,
+        device: str,
+        mount: SimulatedMount,
+        latency: float = 0,
+        fragment: int = 0,
+        push_interval: float = 0.5,
+        disconnect_after: Optional[int] = None,
+    ) -> None:
+        super().__init__(latency, fragment, disconnect_after)
+        self.device = device
+        self.mount = mount
+        self.push_interval = push_interval
+        self._coordinates_set = {"TRACK": True, "SYNC": False, "SLEW": False}
+        self._subscribed: set[asyncio.StreamWriter] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        port = await super().start(host, port)
+        self._tasks.append(asyncio.create_task(self.__push()))
+        return port
+
+    def vectors(self, kind: str = "def") -> dict:
+        """ Every property as the message of kind def or set, by name """
+
+        mount = self.mount
+        mount.step()
+        eq_coords, aa_coords = mount.equatorial(), mount.horizontal()
+        coordinates_state = "Busy" if mount.slewing else "Ok" if mount.tracking else "Idle"
+        return {
+            "MOUNT_PARK": self.__vector(kind, "MOUNT_PARK", "Busy" if mount.parking else "Ok", PARKED=mount.parked, UNPARKED=not mount.parked),
+            "MOUNT_TRACKING": self.__vector(kind, "MOUNT_TRACKING", "Ok", ON=mount.tracking, OFF=not mount.tracking),
+            "MOUNT_ON_COORDINATES_SET": self.__vector(kind, "MOUNT_ON_COORDINATES_SET", "Ok", **self._coordinates_set),
+            "MOUNT_EQUATORIAL_COORDINATES": self.__vector(kind, "MOUNT_EQUATORIAL_COORDINATES", coordinates_state, RA=eq_coords.ra, DEC=eq_coords.dec),
+            "MOUNT_HORIZONTAL_COORDINATES": self.__vector(kind, "MOUNT_HORIZONTAL_COORDINATES", coordinates_state, ALT=aa_coords.alt, AZ=aa_coords.az),
+        }
+
+    def __vector(self, kind: str, name: str, state: str, **items) -> dict:
+        vector_type = PROPERTY_TYPES[name]
+        body = {"device": self.device, "name": name, "state": state, "items": [{"name": key, "value": value} for key, value in items.items()]}
+        if kind == "def":
+            body["perm"] = "rw"
+        return {f"{kind}{vector_type}Vector": body}
+
+    def _decoder(self) -> JsonStreamDecoder:
+        return JsonStreamDecoder()
+
+    def _disconnected(self, writer: asyncio.StreamWriter):
+        self._subscribed.discard(writer)
+
+    async def _handle(self, message: dict, writer: asyncio.StreamWriter):
+        kind, body = next(iter(message.items()))
+        if kind == "getProperties":
+            if body.get("device", self.device) == self.device:
+                self._subscribed.add(writer)
+                await self.__send(writer, list(self.vectors("def").values()))
+        elif kind in ("newSwitchVector", "newNumberVector") and body.get("device") == self.device:
+            name = body.get("name")
+            if PROPERTY_TYPES.get(name) != kind[3:-6]:
+                # as an INDIGO server does, no answer to a command of the wrong type
+                logger.warning(f"INDIGO simulator ignores {kind} on {name}, a {PROPERTY_TYPES.get(name)} property")
+                return
+            if self.__apply(name, {item["name"]: item["value"] for item in body.get("items", [])}):
+                update = self.vectors("set")[name]
+                for client in {writer, *self._subscribed}:
+                    await self.__send(client, [update])
+
+    def __apply(self, name: str, items: dict) -> bool:
+        """ Change the mount as the command asks, False for the properties not simulated """
+
+        mount = self.mount
+        if name == "MOUNT_PARK":
+            if items.get("PARKED") is True or items.get("UNPARKED") is False:
+                mount.park()
+            elif items.get("UNPARKED") is True or items.get("PARKED") is False:
+                mount.unpark()
+        elif name == "MOUNT_TRACKING":
+            if "ON" in items or "OFF" in items:
+                mount.set_tracking(items.get("ON", not items.get("OFF")))
+        elif name == "MOUNT_ON_COORDINATES_SET":
+            on = [key for key, value in items.items() if key in self._coordinates_set and value is True]
+            if on:
+                self._coordinates_set = {key: key == on[-1] for key in self._coordinates_set}
+        elif name == "MOUNT_EQUATORIAL_COORDINATES":
+            current = mount.equatorial()
+            eq_coords = EquatorialCoords(ra=float(items.get("RA", current.ra)), dec=float(items.get("DEC", current.dec)))
+            if self._coordinates_set["SYNC"]:
+                mount.sync(eq_coords)
+            else:
+                mount.goto(eq_coords)
+                mount.set_tracking(mount.tracking or self._coordinates_set["TRACK"])
+        elif name == "MOUNT_HORIZONTAL_COORDINATES":
+            current = mount.horizontal()
+            aa_coords = AltazimutalCoords(alt=float(items.get("ALT", current.alt)), az=float(items.get("AZ", current.az)))
+            mount.goto(aa_coords)
+        else:
+            return False
+        return True
+
+    async def __push(self):
+        """ Coordinates to the subscribed clients, with the park state while it changes """
+
+        park = None
+        while True:
+            await asyncio.sleep(self.push_interval)
+            if not self._subscribed:
+                continue
+            vectors = self.vectors("set")
+            updates = [vectors["MOUNT_EQUATORIAL_COORDINATES"], vectors["MOUNT_HORIZONTAL_COORDINATES"]]
+            if vectors["MOUNT_PARK"] != park:
+                park = vectors["MOUNT_PARK"]
+                updates.append(park)
+            for client in list(self._subscribed):
+                await self.__send(client, updates)
+
+    async def __send(self, writer: asyncio.StreamWriter, messages: list):
+        await self.send(writer, b"".join(json.dumps(message).encode("utf-8") + b"\n" for message in messages))
+
+
+def default_simulator(**kwargs) -> IndigoSimulator:
+    """ The mount of config.ini: site, park position and INDIGO device name """
+
+    settings = Config.settings()
+    park_position = AltazimutalCoords(alt=settings.telescope.park_alt, az=settings.telescope.park_az)
+    mount = SimulatedMount(settings.geography, park_position, kwargs.pop("slew_rate", 4))
+    return IndigoSimulator(Config.getValue("name", "indigo"), mount, **kwargs)
+
+
+async def main(port: int):
+    simulator = default_simulator()
+    bound = await simulator.start("0.0.0.0", port)
+    logger.info(f"INDIGO simulator of {simulator.device} listening on port {bound}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 7624))
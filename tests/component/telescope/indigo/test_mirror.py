@@ -0,0 +1,87 @@
+import unittest
+from crac_server.component.telescope.indigo.mirror import PropertyMirror
+from crac_server.component.telescope.indigo.properties import MissingProperty
+
+
+def message(kind: str, name: str, state: str = None, device: str = "Mount", **items) -> dict:
+    vector = {"device": device, "name": name, "items": [{"name": key, "value": value} for key, value in items.items()]}
+    if state:
+        vector["state"] = state
+    return {kind: vector}
+
+
+class TestPropertyMirror(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mirror = PropertyMirror("Mount")
+
+    def test_set_updates_the_items_it_carries(self):
+        self.mirror.update(message("defNumberVector", "COORDS", "Ok", RA=1, DEC=2))
+        before = self.mirror.get("COORDS")
+        self.assertEqual(self.mirror.update(message("setNumberVector", "COORDS", RA=3)), "COORDS")
+        vector = self.mirror.get("COORDS")
+        self.assertEqual(vector.items, {"RA": 3, "DEC": 2})
+        self.assertEqual(vector.state, "Ok")
+        self.assertEqual(vector.kind, "defNumberVector")
+        self.assertEqual(before.items, {"RA": 1, "DEC": 2})
+
+    def test_other_devices_and_messages_are_ignored(self):
+        self.assertIsNone(self.mirror.update(message("defNumberVector", "COORDS", device="Other", RA=1)))
+        self.assertIsNone(self.mirror.update({"message": "hello"}))
+        self.assertIsNone(self.mirror.get("COORDS"))
+
+    def test_delete(self):
+        self.mirror.update(message("defNumberVector", "COORDS", RA=1))
+        self.mirror.update(message("defSwitchVector", "PARK", PARKED=True))
+        self.mirror.update({"deleteProperty": {"device": "Mount", "name": "COORDS"}})
+        self.assertIsNone(self.mirror.get("COORDS"))
+        self.mirror.update({"deleteProperty": {"device": "Mount"}})
+        self.assertIsNone(self.mirror.get("PARK"))
+
+    def test_staleness(self):
+        self.assertEqual(self.mirror.stale(["COORDS"], 10), ["COORDS"])
+        self.mirror.update(message("defNumberVector", "COORDS", RA=1))
+        self.assertEqual(self.mirror.stale(["COORDS"], 10), [])
+        self.assertLess(self.mirror.age("COORDS"), 10)
+        self.assertFalse(self.mirror.wait_for(["COORDS"], 0.01, since=self.mirror.get("COORDS").updated_at + 1))
+
+    def test_index(self):
+        self.mirror.update(message("setSwitchVector", "PARK", "Busy", PARKED=True))
+        self.mirror.update(message("defNumberVector", "COORDS", "Ok", RA=1))
+        properties = self.mirror.index(["PARK", "MISSING"])
+        self.assertIn(("Switch", "PARK"), properties)
+        self.assertNotIn(("Number", "COORDS"), properties)
+        self.assertEqual(properties.state("Switch", "PARK"), "Busy")
+        self.assertIs(properties.item("Switch", "PARK", "PARKED"), True)
+        self.assertIn(("Number", "COORDS"), self.mirror.index())
+
+
+class TestPropertyIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        mirror = PropertyMirror("Mount")
+        for update in (
+            message("defNumberVector", "COORDS", "Ok", RA=1, DEC=2),
+            message("defNumberVector", "COORDS", "Busy", RA=3, DEC=2),
+            message("defSwitchVector", "PARK", "Ok", PARKED=False),
+            message("defNumberVector", "COORDS", device="Other", RA=9),
+        ):
+            mirror.update(update)
+        self.properties = mirror.index()
+
+    def test_lookup(self):
+        self.assertEqual(self.properties.item("Number", "COORDS", "RA"), 3)
+        self.assertEqual(self.properties.item("Number", "COORDS", "DEC"), 2)
+        self.assertEqual(self.properties.state("Number", "COORDS"), "Busy")
+        self.assertIs(self.properties.get("Switch", "PARK", "PARKED", True), False)
+
+    def test_missing(self):
+        self.assertEqual(self.properties.get("Switch", "TRACKING", "ON", "default"), "default")
+        self.assertEqual(self.properties.get("Switch", "PARK", "UNPARKED"), None)
+        with self.assertRaisesRegex(MissingProperty, "Mount has no Switch vector TRACKING"):
+            self.properties.state("Switch", "TRACKING")
+        with self.assertRaisesRegex(MissingProperty, "Mount COORDS has no item ALT"):
+            self.properties.item("Number", "COORDS", "ALT")
+        # the same name with another type
+        with self.assertRaises(MissingProperty):
+            self.properties.item("Switch", "COORDS", "RA")
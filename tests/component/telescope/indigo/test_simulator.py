@@ -0,0 +1,92 @@
+import json
+import time
+import unittest
+from crac_protobuf.telescope_pb2 import TelescopeSpeed, TelescopeStatus
+from crac_server.component.telescope.indigo.telescope import Telescope
+from crac_server.config import Config
+from tests.component.telescope.indigo.simulator import default_simulator
+from tests.component.telescope.simulation import SimulatorThread
+
+
+class TestSimulator(unittest.TestCase):
+
+    """ The indigo driver against the simulated INDIGO server, through the polling of the base class """
+
+    def start(self, unparked: bool = False, **kwargs) -> Telescope:
+        simulator = default_simulator(slew_rate=kwargs.pop("slew_rate", 90), push_interval=0.05, **kwargs)
+        if unparked:
+            simulator.mount.unpark()
+        self.simulator = simulator
+        self.server = SimulatorThread(simulator)
+        port = self.server.start()
+        self.addCleanup(self.server.stop)
+        telescope = Telescope(hostname="127.0.0.1", port=port)
+        telescope._polling = True
+        self.addCleanup(telescope._connection.close)
+        return telescope
+
+    def poll_until(self, telescope: Telescope, condition, timeout: float = 5):
+        deadline = time.monotonic() + timeout
+        while not condition(telescope.state) and time.monotonic() < deadline:
+            telescope._poll_once()
+            time.sleep(0.02)
+        self.assertTrue(condition(telescope.state), telescope.state)
+
+    def test_parked_mount(self):
+        telescope = self.start()
+        telescope._poll_once()
+        settings = Config.settings().telescope
+        self.assertEqual(telescope.status, TelescopeStatus.PARKED)
+        self.assertEqual(telescope.speed, TelescopeSpeed.SPEED_NOT_TRACKING)
+        self.assertAlmostEqual(telescope.aa_coords.alt, settings.park_alt, places=3)
+        self.assertAlmostEqual(telescope.aa_coords.az, settings.park_az, places=3)
+
+    def test_slew_and_park(self):
+        telescope = self.start(unparked=True, slew_rate=30)
+        telescope._poll_once()
+        telescope.queue_flat()
+        telescope._poll_once()
+        self.assertEqual(telescope.speed, TelescopeSpeed.SPEED_SLEWING)
+        self.poll_until(telescope, lambda state: state.status == TelescopeStatus.FLATTER and state.speed != TelescopeSpeed.SPEED_SLEWING)
+        telescope.queue_park()
+        self.poll_until(telescope, lambda state: state.status == TelescopeStatus.PARKED and state.speed == TelescopeSpeed.SPEED_NOT_TRACKING)
+
+    def test_set_speed(self):
+        telescope = self.start(unparked=True)
+        telescope._poll_once()
+        speed = telescope.queue_set_speed(TelescopeSpeed.SPEED_TRACKING)
+        telescope._poll_once()
+        self.assertIsNone(speed.exception(0))
+        self.assertTrue(self.simulator.mount.tracking)
+        self.assertTrue(telescope.mirror.get("MOUNT_ON_COORDINATES_SET").items["TRACK"])
+        telescope.set_speed(TelescopeSpeed.SPEED_NOT_TRACKING)
+        self.assertFalse(self.simulator.mount.tracking)
+
+    def test_command_of_the_wrong_type_is_ignored(self):
+        telescope = self.start(unparked=True)
+        telescope._poll_once()
+        tracking = {"device": self.simulator.device, "name": "MOUNT_TRACKING", "items": [{"name": "ON", "value": True}]}
+        sent_at = time.monotonic()
+        telescope.s.sendall(json.dumps({"newNumberVector": tracking}).encode("utf-8") + b"\n")
+        self.assertFalse(telescope.mirror.wait_for(["MOUNT_TRACKING"], 0.5, since=sent_at))
+        self.assertFalse(self.simulator.mount.tracking)
+
+    def test_latency_and_fragmentation(self):
+        telescope = self.start(unparked=True, latency=0.02, fragment=7)
+        telescope._poll_once()
+        self.assertNotEqual(telescope.status, TelescopeStatus.ERROR)
+        park = telescope.queue_park()
+        telescope._poll_once()
+        self.assertIsNone(park.exception(0))
+        self.poll_until(telescope, lambda state: state.status == TelescopeStatus.PARKED)
+
+    def test_disconnect_and_reconnect(self):
+        # the getProperties is the first request, the park command the second
+        telescope = self.start(unparked=True, disconnect_after=2)
+        telescope._poll_once()
+        park = telescope.queue_park()
+        telescope._poll_once()
+        self.assertIsInstance(park.exception(0), (ConnectionError, TimeoutError))
+        self.assertEqual(telescope.status, TelescopeStatus.ERROR)
+        self.poll_until(telescope, lambda state: state.status not in (TelescopeStatus.ERROR, TelescopeStatus.LOST))
+        self.assertEqual(telescope._connection.connections, 2)
@@ -0,0 +1,40 @@
+import json
+import unittest
+from crac_server.component.telescope.indigo.stream import JsonStreamDecoder
+
+
+MESSAGES = [
+    {"defNumberVector": {"device": "Mount", "name": "MOUNT_EQUATORIAL_COORDINATES", "state": "Ok", "items": [{"name": "RA", "value": 1.5}, {"name": "DEC", "value": -2}]}},
+    {"setSwitchVector": {"device": "Mount", "name": "MOUNT_PARK", "message": "braces } { and \"quotes\" and a \\\\ backslash in a string", "items": []}},
+    {"defTextVector": {"device": "Mount", "name": "INFO", "items": [{"name": "DRIVER", "value": "città"}]}},
+]
+
+
+class TestJsonStreamDecoder(unittest.TestCase):
+
+    def stream(self) -> bytes:
+        return "\n".join(json.dumps(message, ensure_ascii=False) for message in MESSAGES).encode("utf-8")
+
+    def test_whole_stream(self):
+        self.assertEqual(JsonStreamDecoder().feed(self.stream()), MESSAGES)
+
+    def test_byte_by_byte(self):
+        decoder = JsonStreamDecoder()
+        messages = []
+        for byte in self.stream():
+            messages.extend(decoder.feed(bytes([byte])))
+        self.assertEqual(messages, MESSAGES)
+
+    def test_messages_complete_as_they_arrive(self):
+        decoder = JsonStreamDecoder()
+        data = self.stream()
+        cut = data.index(b"\n") + 10
+        self.assertEqual(decoder.feed(data[:cut]), MESSAGES[:1])
+        self.assertEqual(decoder.feed(data[cut:]), MESSAGES[1:])
+
+    def test_invalid_object_is_dropped(self):
+        decoder = JsonStreamDecoder()
+        with self.assertLogs("crac_server.component.telescope.indigo.stream"):
+            messages = decoder.feed(b'{"broken": }' + json.dumps(MESSAGES[0]).encode())
+        self.assertEqual(messages, MESSAGES[:1])
+
@@ -0,0 +1,128 @@
+import json
+import socket
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from crac_protobuf.telescope_pb2 import AltazimutalCoords, EquatorialCoords, TelescopeSpeed
+from crac_server.component.telescope.indigo.telescope import Telescope
+from threading import Thread
+
+
+DEVICE = "Mount LX200"
+
+
+def vector(kind: str, name: str, state: str, **items) -> dict:
+    return {kind: {"device": DEVICE, "name": name, "state": state, "items": [{"name": key, "value": value} for key, value in items.items()]}}
+
+
+PROPERTIES = [
+    vector("defNumberVector", "MOUNT_EQUATORIAL_COORDINATES", "Ok", RA=5.5, DEC=22),
+    vector("defSwitchVector", "MOUNT_TRACKING", "Ok", ON=True, OFF=False),
+    vector("defTextVector", "INFO", "Ok", DRIVER="lx200"),
+    vector("defNumberVector", "MOUNT_HORIZONTAL_COORDINATES", "Ok", ALT=45, AZ=120),
+    vector("defSwitchVector", "MOUNT_PARK", "Ok", PARKED=False, UNPARKED=True),
+]
+
+
+class SocketPair:
+
+    def __init__(self) -> None:
+        self.sock, self.server = socket.socketpair()
+        self.connections = 1
+
+
+class TestTelescope(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.telescope = Telescope(hostname="localhost", port=7624)
+        self.telescope._name = DEVICE
+        self.telescope._mirror._device = DEVICE
+        self.pair = SocketPair()
+        self.telescope._connection = self.pair  # type: ignore
+        self.requests = []
+        self.lines = []
+        self.answers = {"getProperties": PROPERTIES}
+        self.server = Thread(target=self.serve)
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.pair.server.shutdown(socket.SHUT_RDWR)
+        self.server.join()
+        self.pair.sock.close()
+        self.pair.server.close()
+
+    def serve(self):
+        """ Answer each request with the messages of its kind, split in small writes """
+
+        stream = self.pair.server.makefile("rb")
+        for line in stream:
+            self.lines.append(line)
+            request = json.loads(line)
+            self.requests.append(request)
+            self.send(*self.answers.get(next(iter(request)), ()))
+
+    def send(self, *messages: dict):
+        data = b"\n".join(json.dumps(message).encode() for message in messages)
+        for index in range(0, len(data), 7):
+            self.pair.server.sendall(data[index:index + 7])
+
+    def test_retrieve_reads_the_mirror(self):
+        eq_coords, aa_coords, speed, _ = self.telescope.retrieve()
+        self.assertEqual(eq_coords, EquatorialCoords(ra=5.5, dec=22))
+        self.assertEqual(aa_coords, AltazimutalCoords(alt=45, az=120))
+        self.assertEqual(speed, TelescopeSpeed.SPEED_TRACKING)
+        self.telescope.retrieve()
+        self.assertEqual(self.requests, [{"getProperties": {"version": 512, "device": DEVICE}}])
+
+    def test_pushed_updates(self):
+        self.telescope.retrieve()
+        self.send(vector("setNumberVector", "MOUNT_HORIZONTAL_COORDINATES", "Busy", ALT=30))
+        deadline = time.monotonic() + 2
+        while self.telescope.mirror.get("MOUNT_HORIZONTAL_COORDINATES").state != "Busy" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        _, aa_coords, _, _ = self.telescope.retrieve()
+        self.assertEqual(aa_coords, AltazimutalCoords(alt=30, az=120))
+
+    def test_command_is_sent_once_and_waits_its_property(self):
+        self.answers["newSwitchVector"] = [
+            vector("setNumberVector", "MOUNT_HORIZONTAL_COORDINATES", "Ok", ALT=45, AZ=120),
+            vector("setSwitchVector", "MOUNT_PARK", "Busy", PARKED=True, UNPARKED=False),
+        ]
+        self.telescope.park(TelescopeSpeed.SPEED_NOT_TRACKING)
+        self.assertEqual([next(iter(request)) for request in self.requests], ["getProperties", "newSwitchVector"])
+        self.assertTrue(self.telescope.mirror.get("MOUNT_PARK").items["PARKED"])
+
+    def test_set_speed_sends_switches(self):
+        self.answers["newSwitchVector"] = [
+            vector("setSwitchVector", "MOUNT_TRACKING", "Ok", ON=True, OFF=False),
+            vector("setSwitchVector", "MOUNT_ON_COORDINATES_SET", "Ok", TRACK=True, SLEW=False, SYNC=False),
+        ]
+        self.telescope.set_speed(TelescopeSpeed.SPEED_TRACKING)
+        commands = [(kind, body.get("name")) for request in self.requests for kind, body in request.items()]
+        self.assertEqual(commands[1:], [("newSwitchVector", "MOUNT_TRACKING"), ("newSwitchVector", "MOUNT_ON_COORDINATES_SET")])
+        items = self.requests[-1]["newSwitchVector"]["items"]
+        self.assertTrue(all(isinstance(item["value"], bool) for item in items))
+
+    def test_sync_sends_json_commands(self):
+        self.answers["newSwitchVector"] = [vector("setSwitchVector", "MOUNT_ON_COORDINATES_SET", "Ok", SLEW=False, TRACK=False, SYNC=True)]
+        self.answers["newNumberVector"] = [vector("setNumberVector", "MOUNT_EQUATORIAL_COORDINATES", "Ok", RA=5.25, DEC=-10.5)]
+        with patch.object(self.telescope, "_calculate_eq_coords_of_park_position", return_value=EquatorialCoords(ra=5.25, dec=-10.5)):
+            self.telescope.sync(datetime.utcnow())
+        self.assertEqual(self.lines[1:], [
+            json.dumps(vector("newSwitchVector", "MOUNT_ON_COORDINATES_SET", "Ok", SLEW=False, TRACK=False, SYNC=True)).encode() + b"\n",
+            json.dumps(vector("newNumberVector", "MOUNT_EQUATORIAL_COORDINATES", "Ok", DEC=-10.5, RA=5.25)).encode() + b"\n",
+            json.dumps(vector("newSwitchVector", "MOUNT_ON_COORDINATES_SET", "Ok", SLEW=False, TRACK=True, SYNC=False)).encode() + b"\n",
+        ])
+
+    def test_timeout_without_reply(self):
+        self.answers["getProperties"] = PROPERTIES[:-1]
+        with self.assertRaises(TimeoutError):
+            self.telescope.park(TelescopeSpeed.SPEED_NOT_TRACKING)
+
+    def test_closed_stream(self):
+        self.telescope.retrieve()
+        self.pair.server.shutdown(socket.SHUT_WR)
+        self.telescope._reader.join(2)
+        with self.assertRaises(ConnectionError):
+            self.telescope.retrieve()
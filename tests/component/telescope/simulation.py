@@ -0,0 +1,259 @@
+"""
+    The pieces of the mount server simulators shared by the indigo and indi
+    ones: the mount, the asyncio server and the thread running it beside the
+    blocking code of the drivers
+"""
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,  # type: ignore
+    EquatorialCoords,  # type: ignore
+)
+from crac_server.component.telescope.analytic import AnalyticTransformer
+from crac_server.settings import GeographySettings
+from datetime import datetime
+from threading import Thread
+from typing import Any, Optional, Union
+
+
+logger = logging.getLogger(__name__)
+
+
+def _towards(position: float, target: float, step: float) -> float:
+    if abs(target - position) <= step:
+        return target
+    return position + step if target > position else position - step
+
+
+class SimulatedMount:
+
+    """
+        A mount moving at slew_rate degrees per second on each axis.
+        It keeps its equatorial position while tracking and its horizontal one
+        otherwise, so the other coordinates drift with the sky as on the real
+        mount. A slew goes to an equatorial target, which moves with the sky,
+        or to a fixed horizontal one as the park position
+    """
+
+    def __init__(self, geography: GeographySettings, park_position: AltazimutalCoords, slew_rate: float = 4) -> None:
+        self._transformer = AnalyticTransformer(geography)
+        self.slew_rate = slew_rate
+        self.park_position = park_position
+        self.parked = True
+        self.tracking = False
+        self._aa_coords = park_position
+        self._eq_coords: Optional[EquatorialCoords] = None
+        self._target: Union[AltazimutalCoords, EquatorialCoords, None] = None
+        self._stepped_at = time.monotonic()
+
+    @property
+    def slewing(self) -> bool:
+        return self._target is not None
+
+    @property
+    def parking(self) -> bool:
+        return self._target is self.park_position
+
+    def horizontal(self) -> AltazimutalCoords:
+        if self._eq_coords is not None:
+            return self._transformer.radec2altaz(self._eq_coords, datetime.utcnow())
+        return self._aa_coords
+
+    def equatorial(self) -> EquatorialCoords:
+        if self._eq_coords is not None:
+            return self._eq_coords
+        return self._transformer.altaz2radec(self._aa_coords, datetime.utcnow())
+
+    def goto(self, target: Union[AltazimutalCoords, EquatorialCoords]):
+        if self.parked:
+            logger.warning("Simulated mount parked, goto ignored")
+            return
+        self.step()
+        self._target = target
+
+    def sync(self, eq_coords: EquatorialCoords):
+        self._target = None
+        if self.tracking:
+            self._eq_coords = eq_coords
+        else:
+            self._aa_coords = self._transformer.radec2altaz(eq_coords, datetime.utcnow())
+
+    def park(self):
+        self.step()
+        self.set_tracking(False)
+        self._target = self.park_position
+
+    def unpark(self):
+        self.parked = False
+        if self.parking:
+            self._target = None
+
+    def set_tracking(self, tracking: bool):
+        if tracking == self.tracking or (tracking and self.parked):
+            return
+        if tracking:
+            self._eq_coords = self.equatorial()
+        else:
+            self._aa_coords = self.horizontal()
+            self._eq_coords = None
+        self.tracking = tracking
+
+    def step(self, now: Optional[float] = None):
+        """ Move the mount for the time elapsed since the last step """
+
+        now = time.monotonic() if now is None else now
+        elapsed, self._stepped_at = now - self._stepped_at, now
+        if self._target is None:
+            return
+        position = self.horizontal()
+        target = self._target
+        if isinstance(target, EquatorialCoords):
+            target = self._transformer.radec2altaz(target, datetime.utcnow())
+        step = self.slew_rate * elapsed
+        # the azimuth goes the short way round
+        az_target = position.az + (target.az - position.az + 180) % 360 - 180
+        reached = AltazimutalCoords(
+            alt=_towards(position.alt, target.alt, step),
+            az=_towards(position.az, az_target, step) % 360,
+        )
+        arrived = reached.alt == target.alt and reached.az == target.az % 360
+        if arrived and isinstance(self._target, EquatorialCoords) and self.tracking:
+            self._eq_coords = self._target
+        elif self.tracking:
+            self._eq_coords = self._transformer.altaz2radec(reached, datetime.utcnow())
+        else:
+            self._aa_coords = reached
+        if arrived:
+            self.parked = self.parked or self.parking
+            self._target = None
+
+
+class StreamServer(ABC):
+
+    """
+        asyncio server of a simulated mount server: a subclass decodes the
+        requests of a client and handles them.
+        To test the drivers against a bad network each write waits latency
+        seconds and is split in fragment bytes, and the server drops the
+        connection of the client sending its disconnect_after-th request
+    """
+
+    def __init__(self, latency: float = 0, fragment: int = 0, disconnect_after: Optional[int] = None) -> None:
+        self.latency = latency
+        self.fragment = fragment
+        self.disconnect_after = disconnect_after
+        self.requests = 0
+        self._clients: dict[asyncio.StreamWriter, asyncio.Lock] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: list[asyncio.Task] = []
+        self._handlers: set[asyncio.Task] = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """ Start serving, the port is the one bound """
+
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self.drop_clients()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        # the loop may be stopped next: let the handlers of the dropped clients end
+        await asyncio.gather(*self._handlers, *self._tasks, return_exceptions=True)
+
+    def drop_clients(self):
+        """ Close every connection, as a restarted server or a network failure does """
+
+        for writer in list(self._clients):
+            writer.close()
+
+    @abstractmethod
+    def _decoder(self) -> Any:
+        """ A decoder of the requests of a new client, its feed returns the complete ones """
+
+    @abstractmethod
+    async def _handle(self, request: Any, writer: asyncio.StreamWriter):
+        """ Answer a complete request of the client of writer """
+
+    def _disconnected(self, writer: asyncio.StreamWriter):
+        """ The client of writer is gone """
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients[writer] = asyncio.Lock()
+        self._handlers.add(asyncio.current_task())  # type: ignore
+        decoder = self._decoder()
+        try:
+            while not writer.is_closing():
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for request in decoder.feed(data):
+                    self.requests += 1
+                    if self.disconnect_after is not None and self.requests >= self.disconnect_after:
+                        logger.info(f"Simulator drops the client at request {self.requests}")
+                        self.disconnect_after = None
+                        writer.close()
+                        break
+                    await self._handle(request, writer)
+        except ConnectionError as e:
+            logger.debug(f"Simulator client lost: {e}")
+        finally:
+            self._handlers.discard(asyncio.current_task())  # type: ignore
+            self._clients.pop(writer, None)
+            self._disconnected(writer)
+            writer.close()
+
+    async def send(self, writer: asyncio.StreamWriter, data: bytes):
+        lock = self._clients.get(writer)
+        if lock is None or writer.is_closing():
+            return
+        size = self.fragment or len(data)
+        # one writer at a time, or the fragments of two messages would mix
+        async with lock:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            try:
+                for index in range(0, len(data), size):
+                    writer.write(data[index:index + size])
+                    await writer.drain()
+            except ConnectionError as e:
+                logger.debug(f"Simulator write failed: {e}")
+
+
+class SimulatorThread:
+
+    """ A StreamServer on its own event loop, for the blocking code of the drivers """
+
+    def __init__(self, simulator: StreamServer) -> None:
+        self.simulator = simulator
+        self.port = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = Thread(target=self._loop.run_forever, name="mount-simulator", daemon=True)
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._thread.start()
+        self.port = self.call(self.simulator.start(host, port))
+        return self.port
+
+    def stop(self):
+        self.call(self.simulator.stop())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def call(self, coroutine, timeout: float = 5):
+        """ Run coroutine on the simulator loop and wait for its result """
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def __enter__(self) -> "SimulatorThread":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
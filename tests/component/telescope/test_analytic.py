@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from astropy import units as u
+from astropy.coordinates import AltAz, EarthLocation, SkyCoord
+from astropy.time import Time
+from crac_protobuf.telescope_pb2 import AltazimutalCoords, EquatorialCoords
+from crac_server.component.telescope.analytic import AnalyticTransformer
+from crac_server.config import Config
+from datetime import datetime
+
+
+# documented bound of AnalyticTransformer against astropy, in degrees
+ERROR_BOUND = 0.02
+
+EPOCHS = (
+    datetime(2000, 1, 1, 12),
+    datetime(2012, 6, 30, 23, 59, 30),
+    datetime(2024, 3, 20, 21, 30),
+    datetime(2026, 12, 21, 3, 15),
+    datetime(2050, 7, 1),
+)
+
+
+class TestAnalyticTransformer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        geography = Config.settings().geography
+        cls.location = EarthLocation(lat=geography.lat, lon=geography.lon, height=geography.height * u.m)
+        cls.transformer = AnalyticTransformer(geography)
+        ra, dec = np.meshgrid(np.arange(0, 24, 1.5), np.arange(-60, 90, 7.5))
+        cls.ra, cls.dec = ra.ravel(), dec.ravel()
+
+    def reference(self, obstime: datetime) -> SkyCoord:
+        frame = AltAz(location=self.location, obstime=Time(obstime, scale="utc"))
+        return SkyCoord(ra=self.ra * u.hourangle, dec=self.dec * u.deg, frame="fk5", equinox="J2000").transform_to(frame)
+
+    def test_sky_grid_against_astropy(self):
+        for obstime in EPOCHS:
+            with self.subTest(obstime=obstime):
+                expected = self.reference(obstime)
+                alt, az = self.transformer.radec2altaz_array(self.ra, self.dec, obstime)
+                separation = SkyCoord(az=az * u.deg, alt=alt * u.deg, frame="altaz").separation(
+                    SkyCoord(az=expected.az, alt=expected.alt, frame="altaz")
+                ).deg
+                self.assertLess(separation.max(), ERROR_BOUND)
+
+    def test_scalar_matches_vectorized(self):
+        obstime = EPOCHS[2]
+        alt, az = self.transformer.radec2altaz_array(self.ra[:20], self.dec[:20], obstime)
+        for i in range(20):
+            aa_coords = self.transformer.radec2altaz(EquatorialCoords(ra=self.ra[i], dec=self.dec[i]), obstime)
+            self.assertAlmostEqual(aa_coords.alt, alt[i], places=9)
+            self.assertAlmostEqual(aa_coords.az, az[i], places=9)
+
+    def test_round_trip(self):
+        for obstime in EPOCHS:
+            aa_coords = AltazimutalCoords(alt=35, az=250)
+            back = self.transformer.radec2altaz(self.transformer.altaz2radec(aa_coords, obstime), obstime)
+            self.assertAlmostEqual(back.alt, 35, places=9)
+            self.assertAlmostEqual(back.az, 250, places=9)
+
+    def test_refraction_raises_the_altitude(self):
+        refracted = AnalyticTransformer(Config.settings().geography, refraction=True)
+        eq_coords = EquatorialCoords(ra=5.5, dec=22)
+        obstime = EPOCHS[2]
+        true_alt = self.transformer.radec2altaz(eq_coords, obstime).alt
+        apparent_alt = refracted.radec2altaz(eq_coords, obstime).alt
+        self.assertGreater(apparent_alt, true_alt)
+        self.assertLess(apparent_alt - true_alt, 0.6)
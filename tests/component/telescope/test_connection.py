@@ -0,0 +1,57 @@
+import socket
+import unittest
+from crac_server.component.telescope.connection import TelescopeConnection
+
+
+class TestTelescopeConnection(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen()
+        hostname, port = self.server.getsockname()
+        self.connection = TelescopeConnection(hostname, port, timeout=1)
+
+    def tearDown(self) -> None:
+        self.connection.close()
+        self.server.close()
+
+    def accept(self) -> socket.socket:
+        peer, _ = self.server.accept()
+        self.addCleanup(peer.close)
+        return peer
+
+    def test_socket_is_reused_across_polls(self):
+        sock = self.connection.ensure()
+        self.accept()
+        self.assertIs(self.connection.ensure(), sock)
+        self.assertEqual(self.connection.connections, 1)
+
+    def test_socket_options(self):
+        sock = self.connection.ensure()
+        self.assertTrue(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+        self.assertTrue(sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE))
+        self.assertEqual(sock.gettimeout(), 1)
+
+    def test_reconnects_when_the_peer_closed_the_connection(self):
+        sock = self.connection.ensure()
+        self.accept().close()
+        new_sock = self.connection.ensure()
+        self.assertIsNot(new_sock, sock)
+        self.assertEqual(self.connection.connections, 2)
+        self.assertEqual(new_sock.gettimeout(), 1)
+
+    def test_stale_bytes_are_dropped(self):
+        sock = self.connection.ensure()
+        peer = self.accept()
+        peer.sendall(b"late answer")
+        self.assertEqual(sock.recv(4, socket.MSG_PEEK), b"late")
+        self.assertIs(self.connection.ensure(), sock)
+        peer.sendall(b"fresh")
+        self.assertEqual(sock.recv(1024), b"fresh")
+
+    def test_close(self):
+        self.connection.ensure()
+        self.connection.close()
+        self.assertFalse(self.connection.connected)
+        self.assertIsNone(self.connection.sock)
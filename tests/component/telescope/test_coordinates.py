@@ -0,0 +1,36 @@
+import unittest
+from astropy import units as u
+from astropy.coordinates import AltAz, EarthLocation, SkyCoord
+from astropy.time import Time
+from crac_protobuf.telescope_pb2 import AltazimutalCoords, EquatorialCoords
+from crac_server.component.telescope.coordinates import CoordinatesTransformer
+from crac_server.config import Config
+from datetime import datetime
+
+
+class TestCoordinatesTransformer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.geography = Config.settings().geography
+        self.transformer = CoordinatesTransformer(self.geography)
+        self.obstime = datetime(2024, 3, 20, 21, 30, 15, 500000)
+
+    def test_frame_is_reused_within_the_same_second(self):
+        frame = self.transformer.horizontal_frame(self.obstime)
+        self.assertIs(self.transformer.horizontal_frame(self.obstime.replace(microsecond=900000)), frame)
+        self.assertIsNot(self.transformer.horizontal_frame(self.obstime.replace(second=16)), frame)
+
+    def test_radec2altaz_matches_astropy(self):
+        location = EarthLocation(lat=self.geography.lat, lon=self.geography.lon, height=self.geography.height * u.m)
+        frame = AltAz(location=location, obstime=Time("2024-03-20 21:30:15"))
+        expected = SkyCoord(ra="5.5h", dec="22d", equinox="J2000", frame="fk5").transform_to(frame)
+        aa_coords = self.transformer.radec2altaz(EquatorialCoords(ra=5.5, dec=22), self.obstime)
+        self.assertAlmostEqual(aa_coords.alt, float(expected.alt / u.deg), places=6)
+        self.assertAlmostEqual(aa_coords.az, float(expected.az / u.deg), places=6)
+
+    def test_round_trip(self):
+        aa_coords = AltazimutalCoords(alt=45, az=120)
+        eq_coords = self.transformer.altaz2radec(aa_coords, self.obstime)
+        back = self.transformer.radec2altaz(eq_coords, self.obstime, decimal_places=4)
+        self.assertAlmostEqual(back.alt, 45, places=3)
+        self.assertAlmostEqual(back.az, 120, places=3)
@@ -0,0 +1,20 @@
+import unittest
+from astropy.utils import iers
+from crac_server.component.telescope import earth_orientation
+from crac_server.config import Config
+
+
+class TestEarthOrientation(unittest.TestCase):
+
+    def test_offline_configuration(self):
+        earth_orientation.configure(Config.settings().iers)
+        self.assertFalse(iers.conf.auto_download)
+        self.assertIsNone(iers.conf.auto_max_age)
+
+    def test_table_age(self):
+        self.assertGreater(earth_orientation.table_age(), 0)
+
+    def test_status(self):
+        status = earth_orientation.status()
+        self.assertEqual(set(status), {"iers_table_age_days", "leap_seconds_expire"})
+        float(status["iers_table_age_days"])
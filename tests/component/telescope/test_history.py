@@ -0,0 +1,87 @@
+import unittest
+import numpy as np
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,
+    EquatorialCoords,
+    TelescopeSpeed,
+    TelescopeStatus,
+)
+from crac_server.component.telescope.history import ALT, AZ, TIME, PoseHistory
+from crac_server.component.telescope.state import TelescopeState
+from datetime import datetime, timedelta, timezone
+
+
+START = datetime(2024, 3, 20, 21, 30, tzinfo=timezone.utc)
+
+
+def state(seconds: float, alt: float, az: float) -> TelescopeState:
+    return TelescopeState(
+        status=TelescopeStatus.EAST,
+        eq_coords=EquatorialCoords(ra=1, dec=2),
+        aa_coords=AltazimutalCoords(alt=alt, az=az),
+        speed=TelescopeSpeed.SPEED_TRACKING,
+        sampled_at=START + timedelta(seconds=seconds),
+        sequence=int(seconds * 10),
+        polling=True,
+    )
+
+
+class TestPoseHistory(unittest.TestCase):
+
+    def test_ring_keeps_the_newest_samples_in_order(self):
+        history = PoseHistory(3)
+        for second in range(5):
+            history.append(state(second, 10 + second, 100))
+        samples = history.samples()
+        self.assertEqual(len(history), 3)
+        np.testing.assert_array_equal(samples[ALT], [12, 13, 14])
+        np.testing.assert_array_equal(history.samples(2)[ALT], [13, 14])
+
+    def test_times_are_unix_epochs(self):
+        history = PoseHistory(3)
+        history.append(state(1, 10, 100))
+        self.assertEqual(history.samples()[TIME][0], 1710970201)
+
+    def test_velocity_and_acceleration(self):
+        history = PoseHistory(10)
+        for second in range(6):
+            history.append(state(second, 20 + 0.5 * second ** 2, 100 + 2 * second))
+        velocity = history.velocity()
+        acceleration = history.acceleration()
+        self.assertAlmostEqual(velocity.az, 2)
+        self.assertAlmostEqual(acceleration.az, 0)
+        self.assertAlmostEqual(acceleration.alt, 1, delta=0.5)
+        self.assertGreater(velocity.alt, 4)
+
+    def test_velocity_across_north(self):
+        history = PoseHistory(10)
+        for second, az in enumerate((358, 359, 0, 1)):
+            history.append(state(second, 30, az))
+        self.assertAlmostEqual(history.velocity().az, 1)
+
+    def test_velocity_of_the_last_speed_only(self):
+        history = PoseHistory(10)
+        for second in range(4):
+            history.append(state(second, 30 + 3 * second, 10)._replace(speed=TelescopeSpeed.SPEED_SLEWING))
+        for second in range(4, 7):
+            history.append(state(second, 40, 10 + 0.001 * second))
+        self.assertAlmostEqual(history.velocity().alt, 0)
+        self.assertAlmostEqual(history.velocity().az, 0.001)
+
+    def test_velocity_needs_three_samples(self):
+        history = PoseHistory(10)
+        history.append(state(0, 30, 10))
+        history.append(state(1, 30, 11))
+        self.assertIsNone(history.velocity())
+
+    def test_resize_keeps_the_newest(self):
+        history = PoseHistory(5)
+        for second in range(5):
+            history.append(state(second, second, 0))
+        history.resize(3)
+        np.testing.assert_array_equal(history.samples()[ALT], [2, 3, 4])
+        history.append(state(5, 5, 0))
+        np.testing.assert_array_equal(history.samples()[TIME] - history.samples()[TIME][0], [0, 1, 2])
+        history.resize(6)
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.samples()[AZ].shape, (3,))
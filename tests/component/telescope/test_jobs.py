@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import MagicMock
+from crac_server.component.telescope.jobs import JobPriority, JobQueue
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.queue = JobQueue()
+        self.action = MagicMock()
+
+    def test_priority_then_arrival_order(self):
+        self.queue.put("set_speed", self.action, JobPriority.SPEED, speed=1)
+        self.queue.put("flat", self.action, JobPriority.MOVE)
+        self.queue.put("sync", self.action, JobPriority.SYNC)
+        self.assertEqual([self.queue.get().key for _ in range(3)], ["sync", "flat", "set_speed"])
+        self.assertIsNone(self.queue.get())
+
+    def test_fail_all(self):
+        park = self.queue.put("park", self.action, JobPriority.SAFETY)
+        self.queue.fail_all(ConnectionError("unreachable"))
+        with self.assertRaises(ConnectionError):
+            park.result(timeout=0)
+        self.assertEqual(len(self.queue), 0)
+        self.assertIsNone(self.queue.get())
+
+    def test_same_key_is_coalesced(self):
+        first = self.queue.put("set_speed", self.action, JobPriority.SPEED, speed=1)
+        second = self.queue.put("set_speed", self.action, JobPriority.SPEED, speed=2)
+        self.assertIs(first, second)
+        self.assertEqual(len(self.queue), 1)
+        self.assertEqual(self.queue.get().kwargs, {"speed": 2})
+
+    def test_park_supersedes_pending_moves(self):
+        flat = self.queue.put("flat", self.action, JobPriority.MOVE)
+        speed = self.queue.put("set_speed", self.action, JobPriority.SPEED, speed=1)
+        self.queue.put("park", self.action, JobPriority.SAFETY, supersedes=("flat", "set_speed"))
+        self.assertTrue(flat.cancelled())
+        self.assertTrue(speed.cancelled())
+        self.assertEqual(self.queue.get().key, "park")
+        self.assertIsNone(self.queue.get())
+
+    def test_one_job_per_command(self):
+        for speed in range(100):
+            self.queue.put("set_speed", self.action, JobPriority.SPEED, speed=speed)
+            self.queue.put("flat", self.action, JobPriority.MOVE)
+        self.assertEqual(len(self.queue), 2)
+
+    def test_cancel_all(self):
+        flat = self.queue.put("flat", self.action, JobPriority.MOVE)
+        park = self.queue.put("park", self.action, JobPriority.SAFETY)
+        self.queue.cancel_all()
+        self.assertTrue(flat.cancelled())
+        self.assertTrue(park.cancelled())
+        self.assertEqual(len(self.queue), 0)
+        self.assertIsNone(self.queue.get())
@@ -0,0 +1,48 @@
+import socket
+import unittest
+from crac_server.component.telescope.latency import DriverMetrics, LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_percentiles_within_precision(self):
+        histogram = LatencyHistogram()
+        for millisecond in range(1, 1001):
+            histogram.record(millisecond / 1000)
+        for percent, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+            self.assertAlmostEqual(histogram.percentile(percent), expected, delta=expected * histogram.PRECISION)
+        self.assertEqual(histogram.percentile(100), 1)
+        self.assertEqual(histogram.max, 1)
+        self.assertEqual(histogram.count, 1000)
+
+    def test_out_of_range(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        histogram.record(0)
+        histogram.record(1000)
+        self.assertEqual(histogram.percentile(50), histogram.LOWEST)
+        self.assertEqual(histogram.percentile(99), 1000)
+
+
+class TestDriverMetrics(unittest.TestCase):
+
+    def test_errors_and_timeouts(self):
+        metrics = DriverMetrics("indigo")
+        metrics.record("retrieve", 0.01)
+        metrics.record("retrieve", 2, socket.timeout())
+        metrics.record("retrieve", 0.02, ValueError())
+        summary = metrics.summary()["retrieve"]
+        self.assertEqual(summary["count"], 3)
+        self.assertEqual(summary["errors"], 2)
+        self.assertEqual(summary["timeouts"], 1)
+        self.assertEqual(summary["max"], 2000)
+
+    def test_log_summary_is_periodic(self):
+        metrics = DriverMetrics("indigo")
+        metrics.record("park", 0.5)
+        with self.assertNoLogs("crac_server.component.telescope.latency"):
+            metrics.log_summary(0)
+            metrics.log_summary(3600)
+        with self.assertLogs("crac_server.component.telescope.latency") as logs:
+            metrics.log_summary(1e-9)
+        self.assertIn("indigo park: 1 calls", logs.output[0])
@@ -0,0 +1,33 @@
+import unittest
+from crac_protobuf.telescope_pb2 import AltazimutalCoords
+from crac_server.component.telescope.history import Rates
+from crac_server.component.telescope.prediction import project, reached
+
+
+class TestProject(unittest.TestCase):
+
+    def test_extrapolates_the_velocity(self):
+        aa_coords = project(AltazimutalCoords(alt=30, az=100), Rates(alt=2, az=-1), 3)
+        self.assertAlmostEqual(aa_coords.alt, 36)
+        self.assertAlmostEqual(aa_coords.az, 97)
+
+    def test_still_without_velocity(self):
+        aa_coords = AltazimutalCoords(alt=30, az=100)
+        self.assertIs(project(aa_coords, None, 3), aa_coords)
+        self.assertIs(project(aa_coords, Rates(alt=2, az=2), 0), aa_coords)
+
+    def test_stops_at_the_target(self):
+        target = AltazimutalCoords(alt=1, az=359)
+        aa_coords = project(AltazimutalCoords(alt=5, az=3), Rates(alt=-3, az=-3), 3, target)
+        self.assertAlmostEqual(aa_coords.alt, 1)
+        self.assertAlmostEqual(aa_coords.az, 359)
+
+    def test_target_on_the_other_side_does_not_stop(self):
+        target = AltazimutalCoords(alt=1, az=359)
+        aa_coords = project(AltazimutalCoords(alt=5, az=3), Rates(alt=1, az=1), 3, target)
+        self.assertAlmostEqual(aa_coords.alt, 8)
+        self.assertAlmostEqual(aa_coords.az, 6)
+
+    def test_reached(self):
+        self.assertTrue(reached(AltazimutalCoords(alt=1.5, az=0.5), AltazimutalCoords(alt=1, az=359)))
+        self.assertFalse(reached(AltazimutalCoords(alt=5, az=359), AltazimutalCoords(alt=1, az=359)))
@@ -0,0 +1,82 @@
+import unittest
+from crac_server.component.telescope.reconnect import BreakerState, ReconnectPolicy
+
+
+class TestReconnectPolicy(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.policy = ReconnectPolicy(
+            min_delay=0.5,
+            max_delay=4,
+            failure_threshold=5,
+            open_timeout=60,
+            clock=lambda: self.now,
+            jitter=lambda low, high: high,
+        )
+
+    def test_backoff_is_exponential_and_capped(self):
+        delays = [self.policy.failure("refused") for _ in range(4)]
+        self.assertEqual(delays, [0.5, 1, 2, 4])
+        self.assertIs(self.policy.state, BreakerState.CLOSED)
+
+    def test_backoff_is_waited_by_an_early_attempt(self):
+        self.policy.failure()
+        self.policy.failure()
+        self.assertEqual(self.policy.wait_time(), 1)
+        self.now = 0.75
+        self.assertEqual(self.policy.wait_time(), 0.25)
+        self.now = 1
+        self.assertEqual(self.policy.wait_time(), 0)
+
+    def test_jitter_stays_between_half_and_full_delay(self):
+        policy = ReconnectPolicy(min_delay=1, max_delay=30, failure_threshold=10, open_timeout=60)
+        for failures in range(1, 6):
+            delay = policy.failure()
+            ceiling = 2 ** (failures - 1)
+            self.assertTrue(ceiling / 2 <= delay <= ceiling)
+
+    def test_circuit_opens_after_threshold(self):
+        for _ in range(4):
+            self.policy.failure()
+        self.assertEqual(self.policy.failure(), 60)
+        self.assertIs(self.policy.state, BreakerState.OPEN)
+        self.now = 20
+        self.assertEqual(self.policy.wait_time(), 40)
+
+    def test_half_open_probe_success_closes_the_circuit(self):
+        for _ in range(5):
+            self.policy.failure()
+        self.now = 60
+        self.assertEqual(self.policy.wait_time(), 0)
+        self.assertIs(self.policy.state, BreakerState.HALF_OPEN)
+        self.policy.success()
+        self.assertIs(self.policy.state, BreakerState.CLOSED)
+        self.assertEqual(self.policy.failure(), 0.5)
+
+    def test_half_open_probe_failure_opens_the_circuit_again(self):
+        for _ in range(5):
+            self.policy.failure()
+        self.now = 60
+        self.policy.wait_time()
+        self.assertEqual(self.policy.failure(), 60)
+        self.assertIs(self.policy.state, BreakerState.OPEN)
+        self.assertEqual(self.policy.wait_time(), 60)
+
+    def test_health(self):
+        self.policy.failure("refused")
+        self.policy.success()
+        health = self.policy.health()
+        self.assertEqual(health["state"], "closed")
+        self.assertEqual(health["failures"], "1")
+        self.assertEqual(health["consecutive_failures"], "0")
+        self.assertEqual(health["last_error"], "refused")
+        self.assertEqual(health["recoveries"], "1")
+
+    def test_polls_without_failures_are_not_recoveries(self):
+        for _ in range(3):
+            self.policy.success()
+        self.policy.failure()
+        self.policy.success()
+        self.policy.success()
+        self.assertEqual(self.policy.health()["recoveries"], "1")
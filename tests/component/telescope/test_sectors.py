@@ -0,0 +1,84 @@
+import unittest
+from crac_protobuf.telescope_pb2 import AltazimutalCoords, TelescopeStatus
+from crac_server.component.telescope.sectors import AzimuthSectors, StatusClassifier, angular_distance
+from crac_server.config import Config
+
+
+class TestAzimuthSectors(unittest.TestCase):
+
+    def test_sectors(self):
+        sectors = AzimuthSectors(20, 160, 200, 340)
+        expected = {
+            0: TelescopeStatus.NORTHEAST,
+            19.9: TelescopeStatus.NORTHEAST,
+            20: TelescopeStatus.EAST,
+            159.9: TelescopeStatus.EAST,
+            160: TelescopeStatus.SOUTHEAST,
+            180: TelescopeStatus.SOUTHWEST,
+            200: TelescopeStatus.WEST,
+            339.9: TelescopeStatus.WEST,
+            340: TelescopeStatus.NORTHWEST,
+            359.9: TelescopeStatus.NORTHWEST,
+            360: TelescopeStatus.NORTHEAST,
+            -5: TelescopeStatus.NORTHWEST,
+        }
+        for az, status in expected.items():
+            with self.subTest(az=az):
+                self.assertEqual(sectors.status(az), status)
+
+    def test_east_sector_across_north(self):
+        sectors = AzimuthSectors(350, 160, 200, 300)
+        self.assertEqual(sectors.status(355), TelescopeStatus.EAST)
+        self.assertEqual(sectors.status(10), TelescopeStatus.EAST)
+        self.assertEqual(sectors.status(320), TelescopeStatus.NORTHWEST)
+        self.assertEqual(sectors.status(170), TelescopeStatus.SOUTHEAST)
+
+    def test_west_sector_across_north(self):
+        sectors = AzimuthSectors(60, 160, 200, 10)
+        self.assertEqual(sectors.status(350), TelescopeStatus.WEST)
+        self.assertEqual(sectors.status(5), TelescopeStatus.WEST)
+        self.assertEqual(sectors.status(30), TelescopeStatus.NORTHEAST)
+
+    def test_south_sector_entirely_east(self):
+        sectors = AzimuthSectors(20, 100, 170, 340)
+        self.assertEqual(sectors.status(120), TelescopeStatus.SOUTHEAST)
+        self.assertEqual(sectors.status(175), TelescopeStatus.WEST)
+
+    def test_angular_distance(self):
+        self.assertEqual(angular_distance(359, 1), 2)
+        self.assertEqual(angular_distance(10, 350), 20)
+        self.assertEqual(angular_distance(90, 270), 180)
+
+
+class TestStatusClassifier(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.settings = Config.settings()
+        self.classifier = StatusClassifier(self.settings)
+
+    def test_parked_across_north(self):
+        park = self.settings.telescope
+        self.assertEqual(
+            self.classifier.classify(AltazimutalCoords(alt=park.park_alt, az=(park.park_az + 1.5) % 360)),
+            TelescopeStatus.PARKED
+        )
+
+    def test_parked_told_by_the_mount(self):
+        park = self.settings.telescope
+        aa_coords = AltazimutalCoords(alt=park.park_alt, az=park.park_az)
+        self.assertNotEqual(self.classifier.classify(aa_coords, parked=False), TelescopeStatus.PARKED)
+        self.assertEqual(self.classifier.classify(AltazimutalCoords(alt=60, az=90), parked=True), TelescopeStatus.PARKED)
+
+    def test_flat(self):
+        telescope = self.settings.telescope
+        aa_coords = AltazimutalCoords(alt=telescope.flat_alt, az=telescope.flat_az)
+        self.assertTrue(self.classifier.is_flat(aa_coords))
+        self.assertEqual(self.classifier.classify(aa_coords, parked=False), TelescopeStatus.FLATTER)
+
+    def test_secure(self):
+        aa_coords = AltazimutalCoords(alt=self.settings.telescope.max_secure_alt, az=90)
+        self.assertEqual(self.classifier.classify(aa_coords), TelescopeStatus.SECURE)
+
+    def test_sector(self):
+        self.assertEqual(self.classifier.classify(AltazimutalCoords(alt=45, az=90)), TelescopeStatus.EAST)
+        self.assertEqual(self.classifier.classify(AltazimutalCoords(alt=45, az=270)), TelescopeStatus.WEST)
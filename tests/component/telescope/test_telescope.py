@@ -0,0 +1,325 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,
+    EquatorialCoords,
+    TelescopeSpeed,
+    TelescopeStatus,
+)
+from crac_server.component.telescope.state import TelescopeState
+from crac_server.component.telescope.telescope import Telescope
+from crac_server.config import CONFIG_PATH, ConfigSnapshot
+from crac_server.settings import Settings
+
+
+def settings_with(**telescope) -> Settings:
+    sections = {name: dict(section) for name, section in ConfigSnapshot.load(CONFIG_PATH).sections.items()}
+    sections["telescope"].update(telescope)
+    return Settings(sections)
+
+
+class FakeTelescope(Telescope):
+
+    def sync(self, started_at: datetime):
+        pass
+
+    def set_speed(self, speed: TelescopeSpeed):
+        pass
+
+    def park(self, speed: TelescopeSpeed):
+        return speed
+
+    def flat(self, speed: TelescopeSpeed):
+        raise ValueError("flat not available")
+
+    def retrieve(self) -> tuple:
+        return (
+            EquatorialCoords(ra=1, dec=2),
+            AltazimutalCoords(alt=45, az=90),
+            TelescopeSpeed.SPEED_TRACKING,
+            TelescopeStatus.EAST,
+        )
+
+
+class TestThreadPolling(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.telescope = FakeTelescope()
+        self.telescope.reconfigure(settings_with(polling_mode="thread", polling_interval="0.01", polling_interval_min="0.01", polling_interval_max="0.01", tracking_off="true"))
+
+    def tearDown(self) -> None:
+        self.telescope.polling_end()
+
+    def test_jobs_complete_their_future(self):
+        self.telescope.polling_start()
+        self.assertEqual(self.telescope.queue_park().result(timeout=2), TelescopeSpeed.SPEED_NOT_TRACKING)
+        with self.assertRaises(ValueError):
+            self.telescope.queue_flat().result(timeout=2)
+        calls = self.telescope.metrics.summary()
+        self.assertEqual(calls["park"]["count"], 1)
+        self.assertEqual(calls["flat"]["errors"], 1)
+        self.assertGreater(calls["retrieve"]["count"], 0)
+
+    def test_park_goes_before_pending_moves(self):
+        flat = self.telescope.queue_flat()
+        speed = self.telescope.queue_set_speed(TelescopeSpeed.SPEED_TRACKING)
+        park = self.telescope.queue_park()
+        self.telescope.polling_start()
+        park.result(timeout=2)
+        self.assertTrue(flat.cancelled())
+        self.assertTrue(speed.cancelled())
+
+    def test_polling_end_resets_the_status(self):
+        self.telescope.polling_start()
+        self.telescope.queue_sync(datetime.utcnow()).result(timeout=2)
+        self.telescope.polling_end()
+        self.assertEqual(self.telescope.status, TelescopeStatus.DISCONNECTED)
+        self.assertIsNone(self.telescope.aa_coords)
+        self.assertFalse(self.telescope.state.polling)
+
+    def test_polls_publish_a_whole_state(self):
+        first = self.telescope.state
+        self.telescope.polling_start()
+        self.telescope.queue_sync(datetime.utcnow()).result(timeout=2)
+        while self.telescope.state.status != TelescopeStatus.EAST:
+            time.sleep(0.01)
+        state = self.telescope.state
+        self.assertGreater(state.sequence, first.sequence)
+        self.assertGreaterEqual(state.sampled_at, first.sampled_at)
+        self.assertEqual(state.sampled_at.tzinfo, timezone.utc)
+        self.assertEqual(state.aa_coords.az, 90)
+        self.assertEqual(state.speed, TelescopeSpeed.SPEED_TRACKING)
+        self.assertEqual(first.status, TelescopeStatus.DISCONNECTED)
+        self.assertFalse(first.polling)
+        self.assertTrue(state.polling)
+
+
+class UnreachableConnection:
+
+    connections = 0
+
+    def __init__(self) -> None:
+        self.attempts = 0
+
+    def ensure(self):
+        self.attempts += 1
+        raise ConnectionRefusedError("refused")
+
+    def close(self):
+        pass
+
+
+class TestUnreachableMount(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.telescope = FakeTelescope()
+        self.telescope.reconfigure(settings_with(reconnect_min_delay="10", reconnect_max_delay="10", circuit_breaker_failures="2"))
+        self.connection = self.telescope._connection = UnreachableConnection()
+
+    def test_commands_wait_for_the_backoff(self):
+        self.telescope._poll_once()
+        park = self.telescope.queue_park()
+        self.assertGreater(self.telescope._poll_once(), 0)
+        self.assertEqual(self.connection.attempts, 1)
+        self.assertFalse(park.done())
+
+    def test_commands_fail_while_the_circuit_is_open(self):
+        self.telescope._poll_once()
+        self.telescope._reconnect._retry_at = 0
+        self.telescope._poll_once()
+        park = self.telescope.queue_park()
+        self.telescope._poll_once()
+        self.assertEqual(self.connection.attempts, 2)
+        with self.assertRaises(ConnectionError):
+            park.result(timeout=0)
+        self.assertEqual(self.telescope.status, TelescopeStatus.LOST)
+
+
+class NestedTelescope(FakeTelescope):
+
+    def park(self, speed: TelescopeSpeed):
+        self.set_speed(speed)
+        return speed
+
+
+class TestDriverTiming(unittest.TestCase):
+
+    def test_nested_calls_are_timed_once(self):
+        telescope = NestedTelescope()
+        telescope.park(TelescopeSpeed.SPEED_TRACKING)
+        telescope.set_speed(TelescopeSpeed.SPEED_TRACKING)
+        calls = telescope.metrics.summary()
+        self.assertEqual(calls["park"]["count"], 1)
+        self.assertEqual(calls["set_speed"]["count"], 1)
+
+    def test_failed_call_times_the_next_one(self):
+        telescope = FakeTelescope()
+        with self.assertRaises(ValueError):
+            telescope.flat(TelescopeSpeed.SPEED_TRACKING)
+        telescope.park(TelescopeSpeed.SPEED_TRACKING)
+        self.assertEqual(telescope.metrics.summary()["park"]["count"], 1)
+
+
+class TestPrediction(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.telescope = FakeTelescope()
+        self.telescope.reconfigure(settings_with(tracking_off="true"))
+
+    def slew(self, alt: float, az: float, alt_rate: float, az_rate: float, polls: int = 5, speed: TelescopeSpeed = TelescopeSpeed.SPEED_SLEWING) -> TelescopeState:
+        start = datetime(2024, 3, 20, 21, 30, tzinfo=timezone.utc)
+        self.telescope.history.clear()
+        for second in range(1 - polls, 1):
+            state = TelescopeState(
+                status=TelescopeStatus.EAST,
+                eq_coords=None,
+                aa_coords=AltazimutalCoords(alt=alt + alt_rate * second, az=(az + az_rate * second) % 360),
+                speed=speed,
+                sampled_at=start + timedelta(seconds=second),
+                sequence=second + 4,
+                polling=True,
+            )
+            self.telescope.history.append(state)
+        return state
+
+    def test_predicts_from_the_velocity(self):
+        predicted = self.telescope.predict(self.slew(40, 90, -2, 1), 3)
+        self.assertAlmostEqual(predicted.aa_coords.alt, 34)
+        self.assertAlmostEqual(predicted.aa_coords.az, 93)
+        self.assertEqual(predicted.status, TelescopeStatus.EAST)
+
+    def test_park_stops_the_prediction(self):
+        self.telescope.queue_park()
+        self.telescope._poll_once()
+        predicted = self.telescope.predict(self.slew(6, 5, -2, -2), 10)
+        self.assertAlmostEqual(predicted.aa_coords.alt, 1)
+        self.assertAlmostEqual(predicted.aa_coords.az, 359)
+        self.assertEqual(predicted.status, TelescopeStatus.PARKED)
+
+    def test_park_is_the_target_before_the_velocity_is_known(self):
+        self.telescope.queue_park()
+        self.telescope._poll_once()
+        predicted = self.telescope.predict(self.slew(30, 90, -2, 0, polls=1), 3)
+        self.assertEqual(predicted.aa_coords, AltazimutalCoords(alt=1, az=359))
+        self.assertEqual(predicted.status, TelescopeStatus.PARKED)
+
+    def test_slew_to_an_unknown_position(self):
+        self.assertIsNone(self.telescope.predict(self.slew(30, 90, -2, 0, polls=1), 3))
+        self.assertIsNone(self.telescope.predict(self.slew(30, 90, -2, 0), 0))
+
+    def test_a_stopped_slew_does_not_push_the_tracking(self):
+        self.slew(30, 90, 3, 0)
+        state = self.telescope.state._replace(
+            status=TelescopeStatus.EAST,
+            aa_coords=AltazimutalCoords(alt=33, az=90),
+            speed=TelescopeSpeed.SPEED_TRACKING,
+            sampled_at=datetime(2024, 3, 20, 21, 30, 1, tzinfo=timezone.utc),
+        )
+        self.telescope.history.append(state)
+        self.assertEqual(self.telescope.predict(state, 3).aa_coords, state.aa_coords)
+
+    def test_states_without_position_are_kept(self):
+        self.assertIs(self.telescope.predict(self.telescope.state, 3), self.telescope.state)
+
+
+class TestAdaptivePolling(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.telescope = FakeTelescope()
+        self.telescope.reconfigure(settings_with(polling_interval="0.2", polling_interval_min="0.1", polling_interval_max="1"))
+
+    def interval(self, status: TelescopeStatus, speed: TelescopeSpeed) -> float:
+        return self.telescope._adapted_interval(self.telescope.state._replace(status=status, speed=speed))
+
+    def test_fast_while_slewing_or_with_jobs(self):
+        self.assertEqual(self.interval(TelescopeStatus.EAST, TelescopeSpeed.SPEED_SLEWING), 0.1)
+        self.telescope.queue_sync(datetime.utcnow())
+        self.assertEqual(self.interval(TelescopeStatus.PARKED, TelescopeSpeed.SPEED_NOT_TRACKING), 0.1)
+
+    def test_slow_while_parked(self):
+        self.assertEqual(self.interval(TelescopeStatus.PARKED, TelescopeSpeed.SPEED_NOT_TRACKING), 1)
+
+    def test_slow_only_while_tracking_steadily(self):
+        # no history yet
+        self.assertEqual(self.interval(TelescopeStatus.EAST, TelescopeSpeed.SPEED_TRACKING), 0.2)
+        self.telescope._poll_once()
+        self.telescope._poll_once()
+        self.telescope._poll_once()
+        self.assertEqual(self.interval(TelescopeStatus.EAST, TelescopeSpeed.SPEED_TRACKING), 1)
+        self.assertEqual(self.telescope._poll_once(), 1)
+
+
+class TestAsyncioPolling(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self) -> None:
+        self.telescope = FakeTelescope()
+        self.telescope.reconfigure(settings_with(polling_mode="asyncio", polling_interval="0.01", polling_interval_min="0.01", polling_interval_max="0.01", tracking_off="false"))
+
+    async def asyncTearDown(self) -> None:
+        self.telescope.polling_end()
+
+    async def test_polling_runs_as_a_task(self):
+        self.telescope.polling_start()
+        self.assertIsNotNone(self.telescope._task)
+        speed = await asyncio.wait_for(asyncio.wrap_future(self.telescope.queue_park()), 2)
+        self.assertEqual(speed, TelescopeSpeed.SPEED_TRACKING)
+        while self.telescope.status != TelescopeStatus.EAST:
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.telescope.aa_coords, AltazimutalCoords(alt=45, az=90))
+
+    async def test_polling_end_cancels_the_task(self):
+        self.telescope.polling_start()
+        task = self.telescope._task
+        await asyncio.wait_for(asyncio.wrap_future(self.telescope.queue_sync(datetime.utcnow())), 2)
+        self.telescope.polling_end()
+        self.assertFalse(self.telescope.polling)
+        # cancelled, or ended by itself if it was already past its wait
+        await asyncio.gather(task, return_exceptions=True)
+        self.assertTrue(task.done())
+        # the shutdown runs after the poll that was in progress
+        await asyncio.wrap_future(self.telescope._executor.submit(lambda: None))
+        self.assertEqual(self.telescope.status, TelescopeStatus.DISCONNECTED)
+        self.assertIsNone(self.telescope.aa_coords)
+
+    async def test_polling_end_cancels_the_pending_jobs(self):
+        self.telescope.polling_start()
+        # queued before the task runs its first poll
+        park = self.telescope.queue_park()
+        self.telescope.polling_end()
+        self.assertTrue(park.cancelled())
+        self.telescope.polling_start()
+        await asyncio.wait_for(asyncio.wrap_future(self.telescope.queue_sync(datetime.utcnow())), 2)
+        self.assertEqual(self.telescope.metrics.summary().get("park"), None)
+
+    async def test_polling_started_again_at_once(self):
+        # one poll for each start, then nothing until the end of the test
+        self.telescope.reconfigure(settings_with(polling_mode="asyncio", polling_interval="5", polling_interval_min="5", polling_interval_max="5"))
+        self.telescope.polling_start()
+        first = self.telescope._task
+        await asyncio.wait_for(asyncio.wrap_future(self.telescope.queue_sync(datetime.utcnow())), 2)
+        self.telescope.polling_end()
+        self.telescope.polling_start()
+        await asyncio.wait_for(asyncio.gather(first, return_exceptions=True), 2)
+        # the late shutdown of the first polling leaves the second alone
+        await asyncio.wrap_future(self.telescope._executor.submit(lambda: None))
+        self.assertTrue(self.telescope.polling)
+        self.assertEqual(self.telescope.status, TelescopeStatus.EAST)
+
+    async def test_crashed_loop_can_start_again(self):
+        def crash():
+            raise RuntimeError("driver bug")
+
+        poll_once = self.telescope._poll_once
+        self.telescope._poll_once = crash
+        self.telescope.polling_start()
+        task = self.telescope._task
+        await asyncio.wait_for(asyncio.gather(task, return_exceptions=True), 2)
+        self.assertFalse(self.telescope.polling)
+        self.assertIsNone(self.telescope._task)
+        self.telescope._poll_once = poll_once
+        self.telescope.polling_start()
+        self.assertIsNotNone(self.telescope._task)
+        while self.telescope.status != TelescopeStatus.EAST:
+            await asyncio.sleep(0.01)
@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from crac_protobuf.telescope_pb2 import (
+    AltazimutalCoords,
+    TelescopeSpeed,
+    TelescopeStatus,
+)
+from crac_server.component.telescope.state import TelescopeState
+from crac_server.handler.curtains_handler import CurtainsMoveHandler
+from tests.component.telescope.test_telescope import FakeTelescope, settings_with
+
+
+START = datetime(2024, 3, 20, 21, 30, tzinfo=timezone.utc)
+
+
+class TestCurtainsMoveHandler(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.telescope = FakeTelescope()
+        self.telescope.reconfigure(settings_with(tracking_off="true"))
+        self.mediator = MagicMock(is_disabled=False)
+        patcher = patch("crac_server.handler.curtains_handler.TELESCOPE", self.telescope)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("crac_server.handler.curtains_handler.CurtainsConverter")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def slew(self, alt_rate: float, polls: int):
+        for second in range(polls):
+            state = TelescopeState(
+                status=TelescopeStatus.EAST,
+                eq_coords=None,
+                aa_coords=AltazimutalCoords(alt=30 + alt_rate * second, az=90),
+                speed=TelescopeSpeed.SPEED_SLEWING,
+                sampled_at=START + timedelta(seconds=second),
+                sequence=second,
+                polling=True,
+            )
+            self.telescope.history.append(state)
+        self.telescope._state = state
+
+    def test_slewing_moves_the_curtains_ahead(self):
+        # at 42 degrees going up 4 a second: 54 in 3 seconds, 70 degrees are 205 steps
+        self.slew(4, polls=4)
+        CurtainsMoveHandler().handle(self.mediator)
+        self.mediator.button_east.move.assert_called_once_with(round(54 * 205 / 70))
+        self.mediator.button_west.move.assert_called_once_with(205)
+
+    def test_slewing_to_park_closes_the_curtains(self):
+        self.telescope.queue_park()
+        self.telescope._poll_once()
+        self.slew(-4, polls=1)
+        CurtainsMoveHandler().handle(self.mediator)
+        self.mediator.button_east.move.assert_called_once_with(0)
+        self.mediator.button_west.move.assert_called_once_with(0)
+
+    def test_slewing_to_an_unknown_position_waits(self):
+        self.slew(4, polls=1)
+        CurtainsMoveHandler().handle(self.mediator)
+        self.mediator.button_east.move.assert_not_called()
+        self.mediator.button_west.move.assert_not_called()
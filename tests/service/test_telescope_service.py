@@ -0,0 +1,17 @@
+import unittest
+from crac_server.service.telescope_service import _metadata_value
+
+
+class TestMetadataValue(unittest.TestCase):
+
+    def test_ascii(self):
+        self.assertEqual(_metadata_value("Connection refused"), "Connection refused")
+
+    def test_not_a_string(self):
+        self.assertEqual(_metadata_value(2.5), "2.5")
+        self.assertEqual(_metadata_value(None), "None")
+
+    def test_escaped(self):
+        value = _metadata_value("[Errno 111] Connessione rifiutata: caffè\n")
+        self.assertEqual(value, "[Errno 111] Connessione rifiutata: caff\\xe8\\x0a")
+        self.assertTrue(value.isascii() and value.isprintable())
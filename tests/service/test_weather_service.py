@@ -63,7 +63,7 @@ class TestWeatherService(unittest.IsolatedAsyncioTestCase):
 
     async def test_status_danger_close_crac(self):
         self.weather_service.weather_converter.convert = MagicMock(return_value=WeatherResponse(status=WeatherStatus.WEATHER_STATUS_DANGER))
-        type(TELESCOPE).polling = True  # type: ignore
+        TELESCOPE._state = TELESCOPE.state._replace(polling=True)
         self.weather_service._emergency_closure = MagicMock()
         await self.weather_service.GetStatus(None, None)
         self.weather_service._emergency_closure.assert_called_once()
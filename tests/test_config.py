@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from crac_server.config import Config, ConfigSnapshot, CONFIG_PATH
+
+
+class TestConfigSnapshot(unittest.TestCase):
+
+    def test_values_are_interpolated_once(self):
+        snapshot = ConfigSnapshot.load(CONFIG_PATH)
+        self.assertEqual(snapshot.get("time_format", "weather"), "%Y-%m-%d %H:%M:%S")
+
+    def test_keys_are_case_insensitive(self):
+        snapshot = ConfigSnapshot.load(CONFIG_PATH)
+        self.assertEqual(snapshot.get("azNE", "azimut"), snapshot.get("azne", "azimut"))
+
+    def test_environment_is_resolved_while_loading(self):
+        with patch.dict(os.environ, {"TELESCOPE_POLLING_INTERVAL": "0.5"}):
+            snapshot = ConfigSnapshot.load(CONFIG_PATH)
+        self.assertEqual(snapshot.get("polling_interval", "telescope"), "0.5")
+
+    def test_snapshot_is_read_only(self):
+        snapshot = ConfigSnapshot.load(CONFIG_PATH, version=7)
+        self.assertEqual(snapshot.version, 7)
+        with self.assertRaises(TypeError):
+            snapshot.section("telescope")["driver"] = "simulator"  # type: ignore
+        with self.assertRaises(AttributeError):
+            snapshot.version = 8  # type: ignore
+
+    def test_missing_key_raises(self):
+        snapshot = ConfigSnapshot.load(CONFIG_PATH)
+        with self.assertRaises(KeyError):
+            snapshot.get("not_a_key", "telescope")
+
+
+class TestConfig(unittest.TestCase):
+
+    def test_lookups_do_not_read_the_file(self):
+        with patch("configparser.ConfigParser.read") as read:
+            Config.getInt("azNE", "azimut")
+            Config.getFloat("polling_interval", "telescope")
+            Config.getBoolean("tracking_off", "telescope")
+            Config.getValue("driver", "telescope")
+            read.assert_not_called()
+
+    def test_typed_getters(self):
+        self.assertEqual(Config.getInt("azNE", "azimut"), 20)
+        self.assertEqual(Config.getFloat("flat_az", "telescope"), 358.5)
+        self.assertIs(Config.getBoolean("tracking_off", "telescope"), True)
+
+    def test_get_section_skips_empty_values(self):
+        section = Config.get_section("geography")
+        self.assertEqual(section["equinox"], "J2000")
+
+
+class TestConfigReload(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "config.ini")
+        shutil.copyfile(CONFIG_PATH, self.path)
+        self.listener = MagicMock()
+        Config.subscribe(self.listener)
+
+    def tearDown(self):
+        Config.unsubscribe(self.listener)
+        Config.reload(CONFIG_PATH)
+        shutil.rmtree(self.directory)
+
+    def __replace(self, old: str, new: str):
+        with open(self.path) as config_file:
+            content = config_file.read()
+        with open(self.path, "w") as config_file:
+            config_file.write(content.replace(old, new, 1))
+
+    def test_reload_publishes_a_new_snapshot(self):
+        old = Config.snapshot()
+        self.__replace("polling_interval = 0.15", "polling_interval = 0.5")
+        self.assertTrue(Config.reload(self.path))
+        new = Config.snapshot()
+        self.assertEqual(new.version, old.version + 1)
+        self.assertEqual(Config.settings().telescope.polling_interval, 0.5)
+        self.assertEqual(old.settings.telescope.polling_interval, 0.15)
+        self.listener.assert_called_once_with(new)
+
+    def test_invalid_file_keeps_the_current_snapshot(self):
+        old = Config.snapshot()
+        self.__replace("polling_interval = 0.15", "polling_interval = fast")
+        self.assertFalse(Config.reload(self.path))
+        self.assertIs(Config.snapshot(), old)
+        self.listener.assert_not_called()
+
+    def test_unchanged_file_is_not_published(self):
+        Config.reload(self.path)
+        self.listener.reset_mock()
+        old = Config.snapshot()
+        self.assertFalse(Config.reload())
+        self.assertIs(Config.snapshot(), old)
+        self.listener.assert_not_called()
+
+    def test_listener_errors_do_not_stop_the_reload(self):
+        failing = MagicMock(side_effect=RuntimeError)
+        Config.subscribe(failing)
+        try:
+            self.__replace("polling_interval = 0.15", "polling_interval = 0.5")
+            self.assertTrue(Config.reload(self.path))
+        finally:
+            Config.unsubscribe(failing)
+        failing.assert_called_once()
+        self.listener.assert_called_once()
@@ -0,0 +1,86 @@
+import unittest
+from crac_server.config import CONFIG_PATH, ConfigSnapshot
+from crac_server.settings import (
+    AscomHubSettings,
+    AzimutSettings,
+    EncoderStepSettings,
+    IndiSettings,
+    IndigoSettings,
+    Settings,
+    SettingsError,
+    TelescopeSettings,
+    ThresholdSettings,
+)
+
+
+class TestSettings(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sections = {name: dict(section) for name, section in ConfigSnapshot.load(CONFIG_PATH).sections.items()}
+
+    def test_values_are_converted(self):
+        settings = Settings(self.sections)
+        self.assertEqual(settings.telescope.polling_interval, 0.15)
+        self.assertIs(settings.telescope.tracking_off, True)
+        self.assertEqual(settings.telescope.circuit_breaker_failures, 5)
+        self.assertEqual(settings.geography.height, 465)
+        self.assertIs(settings.iers.offline, True)
+        self.assertEqual(settings.azimut.az_ne, 20)
+        self.assertEqual(settings.encoder_step.n_step_corsa, 205)
+        self.assertEqual(settings.curtains.max_est, 70)
+        self.assertEqual(settings.weather.time_format, "%Y-%m-%d %H:%M:%S")
+        self.assertEqual(settings.ups.ups_list, ("apc-3000", "cyberpower"))
+
+    def test_optional_thresholds(self):
+        settings = Settings(self.sections)
+        self.assertIsNone(settings.thresholds["temperature"].error)
+        self.assertEqual(settings.thresholds["wind_speed"].error, 36)
+
+    def test_slots(self):
+        settings = TelescopeSettings(self.sections["telescope"])
+        with self.assertRaises(AttributeError):
+            settings.unknown = 1  # type: ignore
+
+    def test_invalid_number(self):
+        self.sections["telescope"]["polling_interval"] = "fast"
+        with self.assertRaises(SettingsError):
+            TelescopeSettings(self.sections["telescope"])
+
+    def test_missing_key(self):
+        del self.sections["azimut"]["azne"]
+        with self.assertRaises(SettingsError):
+            AzimutSettings(self.sections["azimut"])
+
+    def test_azimut_sectors_may_cross_north(self):
+        self.sections["azimut"].update({"azne": "350", "azse": "160", "azsw": "200", "aznw": "300"})
+        self.assertEqual(AzimutSettings(self.sections["azimut"]).az_ne, 350)
+        self.sections["azimut"].update({"azne": "20", "azse": "250", "azsw": "200", "aznw": "340"})
+        with self.assertRaises(SettingsError):
+            AzimutSettings(self.sections["azimut"])
+
+    def test_inconsistent_values(self):
+        self.sections["encoder_step"]["n_step_sicurezza"] = "100"
+        with self.assertRaises(SettingsError):
+            EncoderStepSettings(self.sections["encoder_step"])
+        self.sections["wind_speed"]["error"] = "100"
+        with self.assertRaises(SettingsError):
+            ThresholdSettings(self.sections["wind_speed"], "wind_speed")
+
+    def test_driver_sections(self):
+        self.assertEqual(Settings(self.sections).indi.max_property_age, 10)
+        self.assertEqual(Settings(self.sections).indigo.max_property_age, 10)
+        self.assertEqual(Settings(self.sections).ascom_hub.timeout, 2)
+        self.sections["indi"]["max_property_age"] = "-1"
+        with self.assertRaises(SettingsError):
+            IndiSettings(self.sections["indi"])
+        self.sections["indigo"]["max_property_age"] = "0"
+        with self.assertRaises(SettingsError):
+            IndigoSettings(self.sections["indigo"])
+        self.sections["ascom_hub"]["timeout"] = "0"
+        with self.assertRaises(SettingsError):
+            AscomHubSettings(self.sections["ascom_hub"])
+
+    def test_missing_section(self):
+        del self.sections["ups"]
+        with self.assertRaises(SettingsError):
+            Settings(self.sections)